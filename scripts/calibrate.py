@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Calibrate throughput before a large sweep.
+
+Sends a short probe workload built from data/test_cases.csv for each
+technique at several concurrency levels, prints the throughput/latency
+curves, and writes a profile with the recommended concurrency, read
+timeout and per-technique latency. run_experiment reads the profile
+(CALIBRATION_PROFILE) for its time estimates.
+
+Usage:
+    python scripts/calibrate.py --levels 1,2,4,8 --cases 4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from src.calibration import calibrate
+from src.config import Config
+from src.host_pool import create_ollama_client
+from src.prompts import (
+    BaselinePromptGenerator,
+    ChainOfThoughtPromptGenerator,
+    FewShotPromptGenerator,
+    ImprovedPromptGenerator,
+    RoleBasedPromptGenerator,
+)
+
+TECHNIQUES = {
+    "baseline": BaselinePromptGenerator,
+    "improved": ImprovedPromptGenerator,
+    "few_shot": FewShotPromptGenerator,
+    "cot": ChainOfThoughtPromptGenerator,
+    "role_based": RoleBasedPromptGenerator,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and write a calibration profile."
+    )
+    parser.add_argument("--levels", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--cases", type=int, default=4, help="probe prompts per technique")
+    parser.add_argument(
+        "--techniques", default=",".join(TECHNIQUES),
+        help="comma-separated techniques to calibrate",
+    )
+    parser.add_argument("--data", default="data/test_cases.csv", help="test case CSV")
+    parser.add_argument(
+        "--output", default=None, help="profile path (default: CALIBRATION_PROFILE)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the calibration sweep and save the profile."""
+    args = parse_args()
+    config = Config.from_env()
+    levels = [int(level) for level in args.levels.split(",")]
+    techniques = {name: TECHNIQUES[name] for name in args.techniques.split(",")}
+    config.pool_maxsize = max(config.pool_maxsize, max(levels))
+    output = args.output or config.calibration_profile
+
+    print("=" * 60)
+    print(f"Calibrating {config.model_name} at {config.ollama_host}")
+    print("=" * 60)
+    client = create_ollama_client(config)
+    warmup = client.warm_up()
+    if not warmup.success:
+        print(f"WARNING: Model warm-up failed: {warmup.error}")
+
+    profile = calibrate(
+        client, config, pd.read_csv(args.data), techniques, levels, args.cases
+    )
+    client.close()
+
+    for name, curve in profile.curves.items():
+        print(f"\n{name}")
+        print(f"  {'conc':>4}  {'calls/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'errors':>6}")
+        for level in curve:
+            print(f"  {level['concurrency']:>4}  {level['throughput_rps']:>8.2f}  "
+                  f"{level['p50_ms']:>8.0f}  {level['p95_ms']:>8.0f}  {level['errors']:>6}")
+
+    profile.save(output)
+    print(f"\nRecommended concurrency: {profile.recommended_concurrency}")
+    print(f"Recommended READ_TIMEOUT: {profile.recommended_read_timeout:.0f}s")
+    print(f"Profile saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
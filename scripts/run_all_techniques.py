@@ -2,28 +2,55 @@
 """
 Run all prompt engineering technique experiments.
 
-This master script runs all 4 prompt techniques sequentially:
+This master script runs all 4 prompt techniques as one session:
 1. Improved Prompt
 2. Few-Shot Learning
 3. Chain-of-Thought
 4. Role-Based Prompting
 
 Each technique runs 100 test cases x 2 runs = 200 API calls.
-Total: 800 API calls across all techniques.
+Total: 800 API calls across all techniques, sharing one client and one
+work queue. --ordering picks how the calls are interleaved (round_robin by
+default, stratified, or sequential); with an interleaved order a stopped
+session still leaves comparable partial results for every technique.
+--race stops calling techniques whose accuracy is clearly below the
+leader's (results/stats/race_report.json says when and why).
+--time-budget MINUTES fits the session into a fixed window: cases run in
+category x difficulty stratified order and the stats are marked partial
+with per-stratum coverage.
+--lpt starts the calls with the longest latency predicted from earlier
+results first, so several workers finish together; the makespan saved
+against the plain ordering is stored under "schedule" in
+results/session_stats.json, with the session's throughput and client
+telemetry.
+--group-prefixes runs calls sharing a prompt prefix (few-shot examples,
+personas) back to back so Ollama reuses its prompt cache; the estimated
+prompt evaluation saving is stored under "prefix_cache".
+
+Use --keep-loaded to keep the model resident in Ollama across all
+techniques (it is unloaded once the last technique finishes).
+
+Results are checkpointed call by call. Ctrl-C (or SIGTERM) lets in-flight
+calls finish and stops; --resume then continues where the run stopped.
 """
 
+import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.cli_runner import run_experiment
+from src.checkpoint import RunInterrupted
+from src.cli_runner import run_session
+from src.config import Config
+from src.host_pool import create_ollama_client
 from src.comparison_utils import generate_comparison_stats, print_final_summary
 from src.prompts.improved import ImprovedPromptGenerator
 from src.prompts.few_shot import FewShotPromptGenerator
 from src.prompts.chain_of_thought import ChainOfThoughtPromptGenerator
 from src.prompts.role_based import RoleBasedPromptGenerator
+from src.session_scheduler import ORDERINGS
 
 
 TECHNIQUES = [
@@ -34,8 +61,63 @@ TECHNIQUES = [
 ]
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run all prompt technique experiments.")
+    parser.add_argument(
+        "--keep-loaded",
+        action="store_true",
+        help="keep the model loaded in Ollama between techniques (keep_alive=-1)",
+    )
+    parser.add_argument(
+        "--ordering",
+        choices=sorted(ORDERINGS),
+        default=None,
+        help="order of calls across techniques (default: SESSION_ORDERING or round_robin)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="calls sent to Ollama at once (match OLLAMA_NUM_PARALLEL)",
+    )
+    parser.add_argument(
+        "--race",
+        action="store_true",
+        default=None,
+        help="stop calling techniques that are statistically out of contention (see RACING_*)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="wall-clock budget for the whole session; results are partial but stratified",
+    )
+    parser.add_argument(
+        "--lpt",
+        action="store_true",
+        default=None,
+        help="dispatch the longest predicted calls first (see LPT_SCHEDULING)",
+    )
+    parser.add_argument(
+        "--group-prefixes",
+        action="store_true",
+        default=None,
+        help="run calls sharing a prompt prefix back to back (see PREFIX_GROUPING)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip calls already recorded in results/checkpoints by an interrupted run",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
     """Run all prompt engineering experiments."""
+    args = parse_args()
+    keep_alive = -1 if args.keep_loaded else None
     start_time = datetime.now()
 
     print("=" * 70)
@@ -45,20 +127,24 @@ def main() -> None:
     print("\nThis will run 4 techniques x 100 cases x 2 runs = 800 API calls")
     print("Estimated total time: ~67-135 minutes\n")
 
-    results = {}
-
-    for i, (name, generator_class, display, time_factor) in enumerate(TECHNIQUES, 1):
-        print(f"\n{'='*70}")
-        print(f"TECHNIQUE {i}/4: {display}")
-        print(f"{'='*70}\n")
-
-        try:
-            stats = run_experiment(name, generator_class, display, time_factor)
-            results[name] = stats
-            print(f"\n[OK] {display} completed successfully")
-        except Exception as e:
-            print(f"\n[ERROR] {display} failed: {e}")
-            results[name] = {"error": str(e)}
+    config = Config.from_env()
+    stopped = None
+    try:
+        run_session(
+            TECHNIQUES, ordering=args.ordering, max_workers=args.workers,
+            keep_alive=keep_alive, resume=args.resume, race=args.race, lpt=args.lpt,
+            prefix_grouping=args.group_prefixes,
+            time_budget=args.time_budget * 60 if args.time_budget else None,
+        )
+        print("\n[OK] All techniques completed successfully")
+    except RunInterrupted as e:
+        stopped = e
+        print(f"\n[STOPPED] {e}")
+
+    if args.keep_loaded:
+        with create_ollama_client(config) as client:
+            if client.unload():
+                print(f"\nUnloaded {config.model_name} from Ollama")
 
     print("\n" + "=" * 70)
     print("GENERATING COMPARISON STATISTICS")
@@ -66,6 +152,11 @@ def main() -> None:
     generate_comparison_stats()
     print_final_summary()
 
+    if stopped is not None:
+        print("\nThese statistics cover the calls finished before the stop.")
+        print("Run again with --resume to continue where it stopped.")
+        sys.exit(130)
+
     end_time = datetime.now()
     duration = end_time - start_time
 
@@ -81,6 +172,7 @@ def main() -> None:
     print("  - results/cot_results.csv")
     print("  - results/role_based_results.csv")
     print("  - results/comparison_stats.json")
+    print("  - results/session_stats.json")
     print("\nNext steps:")
     print("  1. Review results and add overrides to data/manual_overrides.csv")
     print("  2. Run: python scripts/apply_overrides.py <technique_name>")
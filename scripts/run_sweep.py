@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Run prompt techniques across several models.
+
+Every model runs all selected techniques as one session before the next
+model is loaded, so each model is loaded once; it is kept resident while
+its calls run and unloaded right after. Results are partitioned by model:
+
+    results/sweep/<model>/<technique>_results.csv, _stats.json, ...
+    results/sweep/sweep_summary.json     (load time, accuracy, latency)
+    results/sweep/sweep_comparison.csv   (one row per model x technique)
+
+Model load time is taken from the warm-up call and reported apart from the
+per-call latency; calls that hit a reload anyway are counted, and median
+latency is also given without load time.
+
+Example:
+    python scripts/run_sweep.py --models llama3.2:1b llama3.2:3b mistral:7b
+
+Ctrl-C (or SIGTERM) lets in-flight calls finish, saves the partial results
+and unloads the current model; --resume then continues where it stopped.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.checkpoint import RunInterrupted
+from src.prompts.base import BaselinePromptGenerator
+from src.prompts.chain_of_thought import ChainOfThoughtPromptGenerator
+from src.prompts.few_shot import FewShotPromptGenerator
+from src.prompts.improved import ImprovedPromptGenerator
+from src.prompts.role_based import RoleBasedPromptGenerator
+from src.session_scheduler import ORDERINGS
+from src.sweep import run_sweep
+
+
+TECHNIQUES = [
+    ("baseline", BaselinePromptGenerator, "Baseline", 5),
+    ("improved", ImprovedPromptGenerator, "Improved", 5),
+    ("few_shot", FewShotPromptGenerator, "Few-Shot", 5),
+    ("cot", ChainOfThoughtPromptGenerator, "Chain-of-Thought", 7),
+    ("role_based", RoleBasedPromptGenerator, "Role-Based", 5),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run prompt techniques across several models.")
+    parser.add_argument(
+        "--models", nargs="+", required=True, help="Ollama model tags, run in order"
+    )
+    parser.add_argument(
+        "--techniques",
+        nargs="+",
+        choices=[name for name, *_ in TECHNIQUES],
+        default=[name for name, *_ in TECHNIQUES],
+        help="techniques to run on every model (default: all)",
+    )
+    parser.add_argument(
+        "--ordering",
+        choices=sorted(ORDERINGS),
+        default=None,
+        help="order of calls across techniques (default: SESSION_ORDERING or round_robin)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="calls sent to Ollama at once (match OLLAMA_NUM_PARALLEL)",
+    )
+    parser.add_argument(
+        "--results-dir",
+        default="results/sweep",
+        help="root of the per-model result directories",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip calls already recorded in each model's checkpoints",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the sweep and print a model x technique summary."""
+    args = parse_args()
+    techniques = [technique for technique in TECHNIQUES if technique[0] in args.techniques]
+    try:
+        summary = run_sweep(
+            args.models, techniques, results_dir=args.results_dir,
+            ordering=args.ordering, max_workers=args.workers, resume=args.resume,
+        )
+    except RunInterrupted as e:
+        print(f"\n[STOPPED] {e}")
+        print("Run again with --resume to continue where it stopped.")
+        sys.exit(130)
+
+    print("\n" + "=" * 70)
+    print("SWEEP SUMMARY")
+    print("=" * 70)
+    for model, entry in summary.items():
+        load_ms = entry["model_load_ms"]
+        load = f"{load_ms / 1000:.1f}s" if load_ms is not None else "n/a"
+        print(f"\n{model} (load {load}, total {entry['wall_s'] / 60:.1f} min)")
+        for name, technique in entry["techniques"].items():
+            latency = technique.get("median_latency_excl_load_ms")
+            latency_text = f"{latency:.0f}ms" if latency is not None else "n/a"
+            reloads = f", {technique['reloads']} reloads" if technique.get("reloads") else ""
+            print(f"  {name:<12} accuracy {technique['accuracy']:.1%}  "
+                  f"median latency {latency_text}{reloads}")
+    print(f"\nSaved: {Path(args.results_dir) / 'sweep_summary.json'}")
+    print(f"Saved: {Path(args.results_dir) / 'sweep_comparison.csv'}")
+
+
+if __name__ == "__main__":
+    main()
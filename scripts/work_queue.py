@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Manage the shared work queue used by scripts/worker.py.
+
+    python scripts/work_queue.py enqueue --models llama3.2:1b llama3.2:3b
+    python scripts/work_queue.py status
+    python scripts/work_queue.py export
+
+enqueue adds every model x technique x case x run item that is not queued
+yet, so it is safe to re-run (e.g. nightly). Workers on any machine that
+can open the queue file then lease the items; see scripts/worker.py.
+export writes the committed rows to results/queue/<model>/<technique>_results.csv.
+
+The queue file is WORK_QUEUE (results/work_queue.db by default).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.prompts import GENERATORS
+from src.work_queue import WorkQueue
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Manage the shared work queue.")
+    parser.add_argument("--queue", default=None, help="queue file (default: WORK_QUEUE)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add model x technique x case x run items")
+    enqueue.add_argument(
+        "--models", nargs="+", default=None, help="model tags (default: MODEL_NAME)"
+    )
+    enqueue.add_argument(
+        "--techniques",
+        nargs="+",
+        choices=sorted(GENERATORS),
+        default=list(GENERATORS),
+        help="techniques to queue (default: all)",
+    )
+    enqueue.add_argument(
+        "--runs", type=int, default=None, help="runs per case (default: RUNS_PER_CASE)"
+    )
+    enqueue.add_argument("--data", default="data/test_cases.csv", help="test cases CSV")
+
+    commands.add_parser("status", help="print item counts per model")
+
+    export = commands.add_parser("export", help="write committed rows as results CSVs")
+    export.add_argument("--results-dir", default="results/queue", help="output directory")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the chosen queue command."""
+    args = parse_args()
+    config = Config.from_env()
+    if args.queue:
+        config.queue_path = args.queue
+    queue = WorkQueue.from_config(config)
+
+    if args.command == "enqueue":
+        models = args.models or [config.model_name]
+        runs = args.runs or config.runs_per_case
+        added = queue.enqueue(models, args.techniques, pd.read_csv(args.data), runs)
+        print(f"Enqueued {added} new items ({len(models)} models x "
+              f"{len(args.techniques)} techniques x {runs} runs) in {queue.path}")
+    elif args.command == "status":
+        for model in queue.models():
+            counts = queue.counts(model)
+            print(f"{model}: {counts['done']} done, {counts['failed']} failed, "
+                  f"{counts['leased']} leased, {counts['expired']} lease expired, "
+                  f"{counts['pending']} pending")
+    else:
+        for path in queue.export(args.results_dir):
+            print(f"Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Work on the shared queue until every item of the model has a result.
+
+Start any number of workers, on this machine or others that can open the
+queue file, after filling it with scripts/work_queue.py enqueue:
+
+    python scripts/worker.py --model llama3.2:3b --threads 4
+    OLLAMA_HOST=http://node-b:11434 python scripts/worker.py --threads 4
+
+Each worker leases items of its model, calls its Ollama host(s) and
+commits every result row exactly once. A worker that dies loses only its
+leases, which other workers pick up after WORK_QUEUE_LEASE_S seconds.
+Ctrl-C (or SIGTERM) finishes the calls in flight and exits.
+"""
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.checkpoint import stop_on_signals
+from src.cli_runner import load_config
+from src.client_stack import connect
+from src.queue_worker import QueueWorker
+from src.work_queue import WorkQueue
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Process items from the shared work queue.")
+    parser.add_argument("--queue", default=None, help="queue file (default: WORK_QUEUE)")
+    parser.add_argument(
+        "--model", default=None, help="model whose items to run (default: MODEL_NAME)"
+    )
+    parser.add_argument("--threads", type=int, default=1, help="calls in flight at once")
+    parser.add_argument("--id", default=None, help="worker name (default: host:pid)")
+    parser.add_argument("--poll", type=float, default=5.0, help="seconds between polls when idle")
+    parser.add_argument("--no-warm-up", action="store_true", help="skip loading the model first")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Connect to Ollama and work until the model's items are done."""
+    args = parse_args()
+    print("Loading configuration...")
+    config, threads, limiter = load_config(None, args.threads, None, model=args.model)
+    if args.queue:
+        config.queue_path = args.queue
+    queue = WorkQueue.from_config(config)
+    left = queue.remaining(config.model_name)
+    print(f"  Queue: {queue.path} ({left} items of {config.model_name} left)")
+    print("Connecting to Ollama...")
+    stack = connect(config, not args.no_warm_up, limiter)
+    worker = QueueWorker(
+        queue, config, stack.client, worker_id=args.id, threads=threads, poll_s=args.poll
+    )
+    print(f"Worker {worker.worker_id} running...")
+
+    stop = threading.Event()
+    with stop_on_signals(stop):
+        report = worker.run(stop)
+    counts = report["queue"]
+    print(f"\nCommitted {report['committed']} rows ({report['retried']} retries, "
+          f"{report['failed']} items failed, "
+          f"{report['lost']} results discarded after a lost lease)")
+    print(f"Queue for {config.model_name}: {counts['done']} done, {counts['failed']} failed, "
+          f"{counts['leased'] + counts['expired'] + counts['pending']} left")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ __version__ = "0.1.0"
 
 from .config import Config
 from .ollama_client import OllamaClient
+from .async_ollama_client import AsyncOllamaClient
 from .answer_evaluator import AnswerEvaluator
 from .metrics import MetricsCalculator
 from .experiment_runner import ExperimentRunner
@@ -16,6 +17,7 @@ from .experiment_runner import ExperimentRunner
 __all__ = [
     "Config",
     "OllamaClient",
+    "AsyncOllamaClient",
     "AnswerEvaluator",
     "MetricsCalculator",
     "ExperimentRunner",
@@ -0,0 +1,212 @@
+"""Adaptive (AIMD) limit on the number of LLM calls in flight."""
+
+import asyncio
+import logging
+import statistics
+import threading
+import time
+
+from .client_utils import aquery_client, current_technique
+from .config import Config
+from .ollama_client import APIResponse
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that grows additively and shrinks multiplicatively.
+
+    Latencies are judged in windows of at least ``min_samples`` calls of
+    one technique. After each window the limit is cut by ``decrease`` if
+    any call failed or timed out, or if the window's p50 latency exceeded
+    ``tolerance`` times the technique's baseline (the lowest window p50
+    seen for it). Otherwise it grows by ``increase`` if the window actually
+    used the whole limit. One limiter can be shared by threads, coroutines
+    and techniques, interleaved or consecutive; call :meth:`reset_baseline`
+    when the expected latency changes otherwise.
+
+    Parameters
+    ----------
+    initial : int
+        Starting limit.
+    min_limit, max_limit : int
+        Bounds of the limit.
+    increase : int
+        Additive step after a healthy, saturated window.
+    decrease : float
+        Multiplicative factor applied on congestion.
+    tolerance : float
+        Allowed ratio of window p50 to baseline p50.
+    min_samples : int
+        Minimum number of calls per decision window.
+    """
+
+    def __init__(
+        self,
+        initial: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: int = 1,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        min_samples: int = 5,
+    ) -> None:
+        """Initialize the limiter with no calls in flight."""
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.min_samples = min_samples
+        self.in_flight = 0
+        self.baselines_ms: dict[str, float] = {}
+        self.history: list[tuple[float, int]] = [(time.time(), self.limit)]
+        self._windows: dict[str, list[float]] = {}
+        self._window_failed = False
+        self._saturated = False
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config: Config) -> "AIMDLimiter":
+        """Build a limiter from the adaptive concurrency settings."""
+        return cls(
+            max_limit=config.adaptive_max_concurrency, tolerance=config.adaptive_latency_tolerance
+        )
+
+    def _try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+            return True
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+
+    async def aacquire(self, poll_interval: float = 0.01) -> None:
+        """Wait without blocking the event loop until a call may start."""
+        while not self._try_acquire():
+            await asyncio.sleep(poll_interval)
+
+    def release(self, response: APIResponse, technique: str = "default") -> None:
+        """Record a finished call of ``technique`` and adjust the limit at the end of a window."""
+        with self._cond:
+            self.in_flight -= 1
+            window = self._windows.setdefault(technique, [])
+            if response.success:
+                window.append(response.latency_ms)
+            else:
+                self._window_failed = True
+            if self._window_failed or len(window) >= max(self.min_samples, self.limit):
+                self._adjust(technique)
+            self._cond.notify_all()
+
+    def _adjust(self, technique: str) -> None:
+        """Apply the AIMD rule to the technique's finished window (lock held)."""
+        window = self._windows.pop(technique, [])
+        p50 = statistics.median(window) if window else None
+        baseline_ms = self.baselines_ms.get(technique)
+        if p50 is not None and (baseline_ms is None or p50 < baseline_ms):
+            baseline_ms = self.baselines_ms[technique] = p50
+        congested = self._window_failed or (
+            p50 is not None and p50 > self.tolerance * baseline_ms
+        )
+        old = self.limit
+        if congested:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease))
+        elif self._saturated:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+        if self.limit != old:
+            self.history.append((time.time(), self.limit))
+            reason = "errors" if self._window_failed else f"p50 {p50:.0f}ms"
+            logger.info(
+                f"Concurrency limit {old} -> {self.limit} "
+                f"({reason}, {technique} baseline {baseline_ms or 0:.0f}ms)"
+            )
+        self._window_failed = False
+        self._saturated = self.in_flight >= self.limit
+
+    def reset_baseline(self) -> None:
+        """Forget the latency baselines, e.g. when the model changes."""
+        with self._cond:
+            self.baselines_ms = {}
+            self._windows = {}
+            self._window_failed = False
+
+    def telemetry(self) -> dict:
+        """Current limit, calls in flight, baselines per technique and limit history."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "baselines_ms": dict(self.baselines_ms),
+                "peak_limit": max(limit for _, limit in self.history),
+                "history": list(self.history),
+            }
+
+
+class AdaptiveConcurrencyClient:
+    """
+    ``LLMClient`` wrapper that admits calls through an :class:`AIMDLimiter`.
+
+    Latencies are judged against the baseline of the call's technique: the
+    one it is tagged with (see :func:`~src.client_utils.technique_scope`),
+    otherwise the one named by :meth:`begin_technique`.
+
+    Parameters
+    ----------
+    client : LLMClient
+        The client to call.
+    limiter : AIMDLimiter
+        Limiter shared by everything that calls the same server.
+    """
+
+    def __init__(self, client, limiter: AIMDLimiter) -> None:
+        """Wrap ``client``."""
+        self.client = client
+        self.limiter = limiter
+        self.technique = "default"
+
+    def __getattr__(self, name: str):
+        """Delegate unknown attributes to the wrapped client."""
+        return getattr(self.client, name)
+
+    def begin_technique(self, name: str) -> None:
+        """Reset the latency baselines for a new technique and pass the call on."""
+        self.technique = name
+        self.limiter.reset_baseline()
+        begin = getattr(self.client, "begin_technique", None)
+        if begin is not None:
+            begin(name)
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        """Wait for a slot, then query the wrapped client."""
+        technique = current_technique() or self.technique
+        self.limiter.acquire()
+        response = APIResponse(text="", latency_ms=0.0, success=False)
+        try:
+            response = self.client.query(prompt, **kwargs)
+            return response
+        finally:
+            self.limiter.release(response, technique)
+
+    async def aquery(self, prompt: str, **kwargs) -> APIResponse:
+        """Async variant of :meth:`query`."""
+        technique = current_technique() or self.technique
+        await self.limiter.aacquire()
+        response = APIResponse(text="", latency_ms=0.0, success=False)
+        try:
+            response = await aquery_client(self.client, prompt, **kwargs)
+            return response
+        finally:
+            self.limiter.release(response, technique)
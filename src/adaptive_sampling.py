@@ -0,0 +1,204 @@
+"""Adaptive runs per case: extra samples only for inconsistent or borderline cases."""
+
+import logging
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable
+
+import pandas as pd
+
+from .answer_evaluator import AnswerType
+from .checkpoint import checkpoint_key
+from .config import Config
+from .stratification import stratified_indices
+
+if TYPE_CHECKING:
+    from .experiment_runner import ExperimentRunner
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveSampler:
+    """
+    Decide which cases get another run after each sampling round.
+
+    Every case starts with ``initial_runs`` runs. After each round, a case
+    gets one more run (up to ``max_runs``) if its majority answer holds for
+    less than ``agreement`` of its runs, or if it has a semantic answer and
+    most of its runs scored within ``margin`` of the evaluator's similarity
+    threshold, where the verdict could have gone either way. Fuzzy exact,
+    numeric and contains matches score below 1.0 without being uncertain,
+    so they never count as borderline, and one borderline run among
+    agreeing ones does not reopen a case. When ``call_budget`` is set,
+    extra runs go to the least consistent cases first until the technique
+    has used that many calls.
+
+    Parameters
+    ----------
+    initial_runs : int
+        Runs every case gets.
+    max_runs : int
+        Maximum runs of any case.
+    agreement : float
+        Share of runs the majority answer needs for a case to be settled.
+    call_budget : int, optional
+        Maximum calls for the technique, including the initial runs.
+    semantic_threshold : float
+        Similarity the evaluator requires for a semantic answer to be correct.
+    margin : float
+        Distance from ``semantic_threshold`` within which a score is borderline.
+    """
+
+    def __init__(
+        self,
+        initial_runs: int = 2,
+        max_runs: int = 6,
+        agreement: float = 0.8,
+        call_budget: int | None = None,
+        semantic_threshold: float = 0.8,
+        margin: float = 0.05,
+    ) -> None:
+        """Store the sampling rules."""
+        self.initial_runs = max(1, initial_runs)
+        self.max_runs = max(self.initial_runs, max_runs)
+        self.agreement = agreement
+        self.call_budget = call_budget
+        self.semantic_threshold = semantic_threshold
+        self.margin = margin
+
+    @classmethod
+    def from_config(cls, config: Config, semantic_threshold: float = 0.8) -> "AdaptiveSampler":
+        """Build a sampler from the adaptive runs settings and the evaluator's threshold."""
+        return cls(
+            initial_runs=config.adaptive_initial_runs,
+            max_runs=config.adaptive_max_runs,
+            agreement=config.adaptive_agreement,
+            call_budget=config.adaptive_call_budget,
+            semantic_threshold=semantic_threshold,
+        )
+
+    def agreement_of(self, rows: list[dict]) -> float:
+        """Share of a case's successful runs that agree with its majority verdict."""
+        rows = [row for row in rows if row["success"]]
+        if not rows:
+            return 0.0
+        correct = sum(row["correct"] for row in rows)
+        return max(correct, len(rows) - correct) / len(rows)
+
+    def borderline_share(self, rows: list[dict]) -> float:
+        """Share of a case's successful runs scored near the semantic threshold."""
+        rows = [row for row in rows if row["success"]]
+        if not rows:
+            return 0.0
+        near = sum(abs(row["confidence"] - self.semantic_threshold) < self.margin for row in rows)
+        return near / len(rows)
+
+    def needs_more(self, rows: list[dict], answer_type: str | None = None) -> bool:
+        """Return True if a case with these runs (and answer type) should be sampled again."""
+        if len(rows) >= self.max_runs:
+            return False
+        if self.agreement_of(rows) < self.agreement:
+            return True
+        return answer_type == AnswerType.SEMANTIC.value and self.borderline_share(rows) > 0.5
+
+    def plan_round(
+        self, rows_by_case: dict, calls_used: int, answer_types: dict | None = None
+    ) -> list:
+        """
+        Pick the cases that get one more run in the next round.
+
+        Parameters
+        ----------
+        rows_by_case : dict
+            Case key to the result rows recorded so far (failed calls
+            count as runs but not toward agreement).
+        calls_used : int
+            Calls the technique has made so far.
+        answer_types : dict, optional
+            Case key to its ``AnswerEvaluator`` answer type; only semantic
+            cases can be borderline.
+
+        Returns
+        -------
+        list
+            Keys of the cases to run again, least consistent first.
+        """
+        answer_types = answer_types or {}
+        candidates = [
+            key for key, rows in rows_by_case.items()
+            if self.needs_more(rows, answer_types.get(key))
+        ]
+        candidates.sort(key=lambda key: self.agreement_of(rows_by_case[key]))
+        if self.call_budget is not None:
+            candidates = candidates[:max(0, self.call_budget - calls_used)]
+        return candidates
+
+
+def run_adaptive(
+    runner: "ExperimentRunner",
+    technique_name: str,
+    prompt_generator: Callable[[dict], str],
+    test_cases: pd.DataFrame,
+    resume: bool,
+) -> pd.DataFrame:
+    """
+    Run a technique in sampling rounds chosen by an :class:`AdaptiveSampler`.
+
+    The first round gives every case its initial runs; each later round
+    gives one more run to the cases the sampler picks, until none
+    qualifies, the call budget is spent or the runner's time budget runs
+    out. Rounds go through ``runner.dispatch``, so workers and retries
+    apply within each round. Rows come back in (case, run) order.
+    """
+    sampler = AdaptiveSampler.from_config(runner.config, runner.evaluator.semantic_threshold)
+    templates = runner.case_templates(test_cases, prompt_generator)
+    answer_types = {case: template.case["answer_type"] for case, template in enumerate(templates)}
+    logger.info(
+        f"Adaptive plan: {len(templates)} cases x {sampler.initial_runs}-{sampler.max_runs} runs"
+    )
+    store, done = runner.checkpoint_store(technique_name, resume)
+    rows_by_case: dict[int, list[dict]] = {case: [] for case in range(len(templates))}
+    wanted = [(case, run) for case in rows_by_case for run in range(1, sampler.initial_runs + 1)]
+    progress = runner.start_progress(technique_name, [None] * len(wanted))
+    runner.start_budget()
+    round_number = 0
+
+    def record(index: int, result: dict) -> None:
+        rows_by_case[wanted[index][0]].append(result)
+        store.append(result)
+        progress.record(result["correct"], result["success"], result["latency_ms"])
+
+    try:
+        with runner.graceful_stop():
+            while wanted and not runner.stop_requested and not runner.budget_exhausted:
+                round_number += 1
+                work = [replace(templates[case], run=run) for case, run in wanted]
+                pending = []
+                for index, (case, run) in enumerate(wanted):
+                    row = done.get(checkpoint_key(templates[case].case["id"], run))
+                    if row is None:
+                        pending.append(index)
+                    else:
+                        rows_by_case[case].append(row)
+                        progress.preload(correct=row["correct"], errors=0, count=1)
+                if runner.budget.running:
+                    pending = stratified_indices(work, pending)
+                runner.dispatch(work, record, pending)
+                calls_used = sum(len(rows) for rows in rows_by_case.values())
+                extra = sampler.plan_round(rows_by_case, calls_used, answer_types)
+                wanted = [(case, len(rows_by_case[case]) + 1) for case in extra]
+                progress.extend(len(wanted))
+                if wanted:
+                    logger.info(
+                        f"Adaptive round {round_number + 1}: {len(wanted)} cases get another run"
+                    )
+    finally:
+        store.close()
+        runner.finish_progress(progress)
+    runner.raise_if_stopped(technique_name, progress.completed, progress.total)
+    results = [
+        row
+        for case in rows_by_case
+        for row in sorted(rows_by_case[case], key=lambda row: row["run"])
+    ]
+    return runner.save_results(technique_name, results)
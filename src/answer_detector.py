@@ -0,0 +1,63 @@
+"""Detection of a complete final answer in a partially streamed response."""
+
+import re
+
+from .answer_evaluator import AnswerType
+
+# A number or word is complete only once a character follows that cannot
+# continue it: whitespace, or punctuation such as ")" or "*". Characters
+# like "." and "/" may still be followed by more digits or letters, so a
+# streamed prefix ("3." of "3.14", "1/" of "1/2", "3" of "36") is not
+# mistaken for the whole answer.
+_ANSWER_END = r"(?:[^\w\s'.,/:-]|[^\w\s]*\s)"
+
+# What a complete answer looks like after the marker, per answer type
+_ANSWER_PATTERNS = {
+    AnswerType.NUMERIC.value: r"[^\d\n-]*-?\d[\d,]*(?:[./]\d+)?" + _ANSWER_END,
+    AnswerType.EXACT.value: r"\W*\w[\w'-]*(?:[.,/:]\w+)*" + _ANSWER_END,
+}
+
+# Answers of other types may span several words; wait for the end of the line
+_LINE_PATTERN = r"[ \t]*\S[^\n]*\n"
+
+
+class AnswerDetector:
+    """
+    Decide from a growing response text whether the final answer is complete.
+
+    Parameters
+    ----------
+    terminator : str
+        Regular expression that matches once a complete final answer has
+        been emitted. Matching is case-insensitive.
+    """
+
+    def __init__(self, terminator: str) -> None:
+        """Compile the terminator pattern."""
+        self.pattern = re.compile(terminator, re.IGNORECASE)
+
+    def __call__(self, text: str) -> bool:
+        """Return True once ``text`` contains a complete final answer."""
+        return self.pattern.search(text) is not None
+
+    @classmethod
+    def for_answer_type(cls, answer_type: str, marker: str) -> "AnswerDetector":
+        """
+        Build a detector for answers introduced by ``marker``.
+
+        Parameters
+        ----------
+        answer_type : str
+            ``AnswerEvaluator`` answer type of the test case. Numeric and
+            exact answers are complete after one number or word; other types
+            after the end of the marker's line.
+        marker : str
+            Text that introduces the final answer, e.g. ``"Final Answer:"``.
+
+        Returns
+        -------
+        AnswerDetector
+            Detector for the given answer type.
+        """
+        answer = _ANSWER_PATTERNS.get(answer_type, _LINE_PATTERN)
+        return cls(re.escape(marker) + answer)
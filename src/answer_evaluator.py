@@ -1,5 +1,6 @@
 """Answer evaluation module for comparing model responses to expected answers."""
 
+import threading
 from enum import Enum
 
 from .answer_utils import (
@@ -17,12 +18,19 @@ class AnswerType(Enum):
 
 
 class AnswerEvaluator:
-    """Evaluator for comparing model responses to expected answers."""
+    """
+    Evaluator for comparing model responses to expected answers.
+
+    Safe to share between worker threads: the lazily created sentence
+    embedder is built and used under a lock, since its tokenizer cannot
+    be called from several threads at once.
+    """
 
     def __init__(self, semantic_threshold: float = 0.8) -> None:
         """Initialize evaluator with semantic similarity threshold (0-1)."""
         self.semantic_threshold = semantic_threshold
         self._embedder = None
+        self._embedder_lock = threading.Lock()
 
     def evaluate(
         self, response: str, expected: str, answer_type: str
@@ -123,13 +131,14 @@ class AnswerEvaluator:
 
     def _evaluate_semantic(self, response: str, expected: str) -> tuple[bool, float]:
         """Semantic similarity using sentence embeddings."""
-        if self._embedder is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-                self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
-            except ImportError:
-                return self._evaluate_contains(response, expected)
-
-        embeddings = self._embedder.encode([response, expected])
+        with self._embedder_lock:
+            if self._embedder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+                except ImportError:
+                    return self._evaluate_contains(response, expected)
+
+            embeddings = self._embedder.encode([response, expected])
         similarity = cosine_similarity(embeddings[0], embeddings[1])
         return similarity >= self.semantic_threshold, float(similarity)
@@ -0,0 +1,229 @@
+"""Asyncio-native Ollama client with bounded request concurrency."""
+
+import asyncio
+import json
+import logging
+import time
+
+from .config import Config
+from .ollama_client import (
+    APIResponse,
+    StopCondition,
+    StreamAccumulator,
+    build_generate_payload,
+    server_timings,
+)
+from .rate_limiter import THROTTLE_STATUSES, TokenBucketLimiter, parse_retry_after
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """
+    Asyncio client for the Ollama API.
+
+    Keeps at most ``concurrency`` requests in flight at once so that an Ollama
+    server started with ``OLLAMA_NUM_PARALLEL > 1`` stays busy. Requires the
+    optional ``aiohttp`` dependency.
+
+    Parameters
+    ----------
+    config : Config
+        Configuration instance with settings.
+    host : str, optional
+        Ollama host URL. Defaults to the local server.
+    concurrency : int, optional
+        Maximum in-flight requests. Defaults to ``config.max_concurrency``.
+    limiter : TokenBucketLimiter, optional
+        Rate limiter to share with other clients. Defaults to one built
+        from ``config``.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        host: str | None = None,
+        concurrency: int | None = None,
+        limiter: TokenBucketLimiter | None = None,
+    ) -> None:
+        """Initialize the async client with configuration."""
+        self.config = config
+        self.host = host or "http://localhost:11434"
+        self.model = config.model_name
+        self.concurrency = max(1, concurrency or config.max_concurrency)
+        self.limiter = limiter or TokenBucketLimiter.from_config(config)
+        self._session = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        logger.info(
+            f"AsyncOllamaClient initialized: host={self.host}, model={self.model}, "
+            f"concurrency={self.concurrency}"
+        )
+
+    async def _ensure_session(self):
+        """Create the HTTP session and semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._loop is not loop:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=max(self.concurrency, self.config.pool_maxsize),
+                limit_per_host=max(self.concurrency, self.config.pool_maxsize),
+            )
+            timeout = aiohttp.ClientTimeout(
+                connect=self.config.connect_timeout,
+                sock_read=self.config.read_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def aquery(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+    ) -> APIResponse:
+        """
+        Send a prompt to Ollama without blocking the event loop.
+
+        Latency is measured around the HTTP call only, so time spent waiting
+        for a concurrency slot is not counted in ``latency_ms``.
+
+        Parameters
+        ----------
+        prompt : str
+            The prompt to send to the model.
+        options : dict, optional
+            Generation options passed through to Ollama. Defaults to the
+            options configured in ``Config``.
+        run : int
+            Run index of the call; not sent to Ollama.
+        stop_when : StopCondition, optional
+            Stream the generation and close it as soon as this returns True
+            for the text received so far.
+
+        Returns
+        -------
+        APIResponse
+            Response containing text, latency, and success status.
+        """
+        import aiohttp
+
+        session = await self._ensure_session()
+        if options is None:
+            options = self.config.generation_options()
+        stream = self.config.stream or stop_when is not None
+        last_error = None
+        attempts = self.config.client_attempts()
+        status_code = retry_after = None
+
+        for attempt in range(attempts):
+            throttled = False
+            try:
+                async with self._semaphore:
+                    await self.limiter.aacquire()
+                    start_time = time.perf_counter()
+                    async with session.post(
+                        f"{self.host}/api/generate",
+                        json=build_generate_payload(
+                            self.model, prompt, stream=stream, options=options,
+                            keep_alive=self.config.keep_alive,
+                        ),
+                    ) as response:
+                        if response.status == 200 and stream:
+                            accumulator = StreamAccumulator(
+                                start_time, stop_when, options.get("num_predict")
+                            )
+                            api_response = await self._read_stream(response, accumulator)
+                            api_response.host = self.host
+                            if api_response.success:
+                                self.limiter.reward()
+                                return api_response
+                            last_error = api_response.error
+                            logger.warning(f"API stream failed: {last_error}")
+                        elif response.status == 200:
+                            result = await response.json(content_type=None)
+                            latency_ms = (time.perf_counter() - start_time) * 1000
+                            self.limiter.reward()
+                            return APIResponse(
+                                text=result.get("response", "").strip(),
+                                latency_ms=latency_ms,
+                                success=True,
+                                host=self.host,
+                                **server_timings(result),
+                            )
+                        else:
+                            last_error = f"HTTP {response.status}: {await response.text()}"
+                            status_code = response.status
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            logger.warning(f"API call failed: {last_error}")
+                            if status_code in THROTTLE_STATUSES:
+                                self.limiter.penalize(retry_after)
+                                throttled = True
+
+            except aiohttp.ClientConnectionError as e:
+                last_error = f"Connection error: {str(e)}"
+                logger.error(f"Connection error to {self.host}: {e}")
+
+            except asyncio.TimeoutError:
+                last_error = "Request timed out"
+                logger.error(f"Request timeout on attempt {attempt + 1}")
+
+            except Exception as e:
+                last_error = str(e)
+                logger.error(f"Unexpected error: {e}")
+
+            if attempt < attempts - 1 and not throttled:
+                wait_time = self.config.retry_delay * (attempt + 1)
+                logger.info(f"Retrying in {wait_time:.0f}s after error: {str(last_error)[:50]}")
+                await asyncio.sleep(wait_time)
+
+        logger.error(f"All {attempts} attempts failed: {last_error}")
+        return APIResponse(
+            text="",
+            latency_ms=0.0,
+            success=False,
+            error=last_error,
+            host=self.host,
+            status_code=status_code,
+            retry_after=retry_after,
+        )
+
+    @staticmethod
+    async def _read_stream(response, accumulator: StreamAccumulator) -> APIResponse:
+        """Consume an NDJSON chunk stream, timing each token as it arrives."""
+        async for line in response.content:
+            line = line.strip()
+            if line and accumulator.feed(json.loads(line), time.perf_counter()):
+                break
+        return accumulator.to_response(time.perf_counter())
+
+    def query(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+    ) -> APIResponse:
+        """Blocking wrapper around :meth:`aquery` for the ``LLMClient`` protocol."""
+
+        async def _run() -> APIResponse:
+            try:
+                return await self.aquery(prompt, options=options, run=run, stop_when=stop_when)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
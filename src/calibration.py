@@ -0,0 +1,265 @@
+"""Throughput calibration: probe concurrency levels and save a sizing profile."""
+
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .experiment_runner import resolve_generation_options
+from .prompts.base import BasePromptGenerator
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Share of the best throughput a concurrency level must reach to be recommended
+KNEE_EFFICIENCY = 0.9
+# Read timeout as a multiple of the slowest technique's p95 latency
+TIMEOUT_FACTOR = 3.0
+MIN_READ_TIMEOUT = 10.0
+
+
+@dataclass
+class LevelResult:
+    """
+    Measurements of one technique at one concurrency level.
+
+    Attributes
+    ----------
+    concurrency : int
+        Calls kept in flight.
+    calls : int
+        Calls sent.
+    errors : int
+        Calls that failed.
+    wall_s : float
+        Wall time for all calls.
+    throughput_rps : float
+        Successful calls per second.
+    p50_ms, p95_ms : float
+        Latency quantiles of successful calls.
+    """
+
+    concurrency: int
+    calls: int
+    errors: int
+    wall_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+
+
+@dataclass
+class CalibrationProfile:
+    """
+    Recommended settings and measured curves for one model and host.
+
+    Attributes
+    ----------
+    model : str
+        Model the profile was measured with.
+    host : str
+        Ollama host(s) probed.
+    created : str
+        ISO timestamp of the calibration.
+    recommended_concurrency : int
+        Smallest level reaching ``KNEE_EFFICIENCY`` of the best throughput.
+    recommended_read_timeout : float
+        Suggested ``READ_TIMEOUT`` in seconds.
+    techniques : dict
+        Per technique: ``p50_ms``, ``p95_ms`` and ``throughput_rps`` at the
+        recommended concurrency.
+    curves : dict
+        Per technique: the ``LevelResult`` of every level, as dicts.
+    """
+
+    model: str
+    host: str
+    created: str
+    recommended_concurrency: int
+    recommended_read_timeout: float
+    techniques: dict[str, dict] = field(default_factory=dict)
+    curves: dict[str, list[dict]] = field(default_factory=dict)
+
+    def save(self, path: str) -> None:
+        """Write the profile as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "CalibrationProfile | None":
+        """Read a profile, or return None if the file does not exist."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def estimate_seconds(self, technique: str, calls: int, concurrency: int) -> float | None:
+        """
+        Estimate the wall time of ``calls`` calls of a technique.
+
+        Uses the measured throughput of the highest calibrated level not
+        above ``concurrency``.
+
+        Returns
+        -------
+        float or None
+            Seconds, or None if the technique was not calibrated.
+        """
+        curve = self.curves.get(technique)
+        if not curve:
+            return None
+        usable = [level for level in curve if level["concurrency"] <= concurrency] or curve[:1]
+        throughput = max(usable, key=lambda level: level["concurrency"])["throughput_rps"]
+        return calls / throughput if throughput > 0 else None
+
+
+def probe_cases(test_cases: pd.DataFrame, count: int, seed: int = 0) -> pd.DataFrame:
+    """Pick a small probe set, covering as many categories as possible."""
+    per_category = test_cases.groupby("category", sort=False).head(1)
+    if len(per_category) >= count:
+        return per_category.sample(n=count, random_state=seed)
+    rest = test_cases.drop(per_category.index)
+    extra = rest.sample(n=min(count - len(per_category), len(rest)), random_state=seed)
+    return pd.concat([per_category, extra])
+
+
+def measure_level(client, calls: list[dict], concurrency: int) -> LevelResult:
+    """
+    Send ``calls`` with ``concurrency`` in flight and measure throughput.
+
+    Parameters
+    ----------
+    client : LLMClient
+        Client to probe.
+    calls : list of dict
+        Keyword arguments of each ``client.query`` call.
+    concurrency : int
+        Number of worker threads.
+
+    Returns
+    -------
+    LevelResult
+        Throughput and latency of the level.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        responses = list(pool.map(lambda kwargs: client.query(**kwargs), calls))
+    wall_s = time.perf_counter() - start
+    latencies = [r.latency_ms for r in responses if r.success]
+    return LevelResult(
+        concurrency=concurrency,
+        calls=len(calls),
+        errors=len(calls) - len(latencies),
+        wall_s=wall_s,
+        throughput_rps=len(latencies) / wall_s if wall_s > 0 else 0.0,
+        p50_ms=float(np.percentile(latencies, 50)) if latencies else math.nan,
+        p95_ms=float(np.percentile(latencies, 95)) if latencies else math.nan,
+    )
+
+
+def recommend_concurrency(curves: dict[str, list[LevelResult]]) -> int:
+    """Smallest level whose mean normalized throughput reaches the knee."""
+    levels = sorted({result.concurrency for curve in curves.values() for result in curve})
+    if not levels:
+        return 1
+    scores = {level: [] for level in levels}
+    for curve in curves.values():
+        best = max(result.throughput_rps for result in curve)
+        for result in curve:
+            scores[result.concurrency].append(result.throughput_rps / best if best else 0.0)
+    for level in levels:
+        if np.mean(scores[level]) >= KNEE_EFFICIENCY:
+            return level
+    return levels[-1]
+
+
+def calibrate(
+    client,
+    config: Config,
+    test_cases: pd.DataFrame,
+    techniques: dict[str, type[BasePromptGenerator]],
+    levels: list[int],
+    cases_per_technique: int = 4,
+) -> CalibrationProfile:
+    """
+    Sweep concurrency levels for each technique and build a profile.
+
+    Each level sends at least two calls per worker, cycling through the
+    probe prompts, with the same generation options and early stopping as
+    a real run.
+
+    Parameters
+    ----------
+    client : LLMClient
+        Client bound to the configured host(s).
+    config : Config
+        Configuration of the run being sized.
+    test_cases : pd.DataFrame
+        Test cases to draw probe prompts from.
+    techniques : dict
+        Technique name to prompt generator class.
+    levels : list of int
+        Concurrency levels to measure.
+    cases_per_technique : int
+        Number of distinct probe prompts per technique.
+
+    Returns
+    -------
+    CalibrationProfile
+        Curves and recommended settings.
+    """
+    probes = probe_cases(test_cases, cases_per_technique)
+    curves: dict[str, list[LevelResult]] = {}
+    for name, generator_class in techniques.items():
+        generator = generator_class()
+        options = resolve_generation_options(config, generator.generate)
+        prompts = []
+        for _, case in probes.iterrows():
+            case_dict = case.to_dict()
+            stop_when = generator.answer_detector(case_dict) if config.early_stop else None
+            prompts.append({
+                "prompt": generator.generate(case_dict),
+                "options": options,
+                "stop_when": stop_when,
+            })
+        curves[name] = []
+        for level in sorted(levels):
+            count = max(len(prompts), 2 * level)
+            calls = [prompts[i % len(prompts)] for i in range(count)]
+            result = measure_level(client, calls, level)
+            logger.info(
+                f"Calibrated {name} @ {level}: {result.throughput_rps:.2f} calls/s, "
+                f"p50={result.p50_ms:.0f}ms, errors={result.errors}"
+            )
+            curves[name].append(result)
+
+    recommended = recommend_concurrency(curves)
+    at_level = {
+        name: next(r for r in curve if r.concurrency == recommended)
+        for name, curve in curves.items()
+    }
+    p95s = [r.p95_ms for r in at_level.values() if not math.isnan(r.p95_ms)]
+    read_timeout = max(MIN_READ_TIMEOUT, math.ceil(TIMEOUT_FACTOR * max(p95s, default=0) / 1000))
+    return CalibrationProfile(
+        model=config.model_name,
+        host=config.ollama_host,
+        created=datetime.now().isoformat(timespec="seconds"),
+        recommended_concurrency=recommended,
+        recommended_read_timeout=float(read_timeout),
+        techniques={
+            name: {"p50_ms": r.p50_ms, "p95_ms": r.p95_ms, "throughput_rps": r.throughput_rps}
+            for name, r in at_level.items()
+        },
+        curves={name: [asdict(r) for r in curve] for name, curve in curves.items()},
+    )
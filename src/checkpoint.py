@@ -0,0 +1,158 @@
+"""Append-only checkpoints of result rows and graceful shutdown on signals."""
+
+import json
+import logging
+import signal
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class RunInterrupted(Exception):
+    """Raised once a run has drained its in-flight calls after a stop request."""
+
+
+def checkpoint_key(case_id, run: int) -> tuple[str, int]:
+    """Identify a (case, run) work item within a technique and model's checkpoint."""
+    return str(case_id), int(run)
+
+
+def _json_value(value):
+    """Encode values ``json`` cannot: numpy scalars as Python numbers, others as text."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class CheckpointStore:
+    """
+    JSONL file holding one finished result row per line.
+
+    Every row is flushed as soon as it is recorded, so a crash or
+    pre-emption loses at most the calls that were still in flight. Each
+    line stores the technique and model with the row, keying it by
+    (technique, model, id, run).
+
+    Parameters
+    ----------
+    path : str
+        Path of the technique's JSONL file.
+    technique : str
+        Technique whose rows the file holds.
+    model : str
+        Model that produced the rows being recorded.
+    """
+
+    def __init__(self, path: str, technique: str, model: str) -> None:
+        """Open the checkpoint for appending."""
+        self.path = Path(path)
+        self.technique = technique
+        self.model = model
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def reset(self) -> None:
+        """
+        Discard this technique and model's earlier rows, for a fresh run.
+
+        Rows of other models stay, so their interrupted runs can still be
+        resumed.
+        """
+        with self._lock:
+            kept = [line for line in self._lines() if not self._owns(line)]
+            self.path.write_text("".join(kept))
+
+    def _lines(self) -> list[str]:
+        """Return the file's lines, or none if it does not exist yet."""
+        if not self.path.exists():
+            return []
+        with open(self.path) as f:
+            return f.readlines()
+
+    def _owns(self, line: str) -> bool:
+        """Return True if ``line`` is a (possibly corrupt) row of this technique and model."""
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return True
+        return record["technique"] == self.technique and record["model"] == self.model
+
+    def completed(self) -> dict[tuple[str, int], dict]:
+        """
+        Load the successful rows recorded for this technique and model.
+
+        Failed calls are not returned, so a resumed run retries them. A
+        truncated last line (from a crash mid-write) is ignored.
+
+        Returns
+        -------
+        dict
+            Result rows keyed by :func:`checkpoint_key`.
+        """
+        rows = {}
+        for line in self._lines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt checkpoint line in {self.path}")
+                continue
+            row = record["row"]
+            owned = record["technique"] == self.technique and record["model"] == self.model
+            if owned and row["success"]:
+                rows[checkpoint_key(row["id"], row["run"])] = row
+        return rows
+
+    def append(self, row: dict) -> None:
+        """Append and flush one result row."""
+        record = {"technique": self.technique, "model": self.model, "row": row}
+        line = json.dumps(record, default=_json_value)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+@contextmanager
+def stop_on_signals(stop: threading.Event):
+    """
+    Turn the first SIGINT/SIGTERM into a stop request instead of an abort.
+
+    The handler only sets ``stop``; the runner then starts no new calls,
+    waits for the ones in flight and records them. A second signal gets the
+    previous handler (a plain Ctrl-C aborts immediately). Outside the main
+    thread, where handlers cannot be installed, this does nothing.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    signals = [signal.SIGINT, signal.SIGTERM]
+    previous = {sig: signal.getsignal(sig) for sig in signals}
+
+    def handle(signum, frame) -> None:
+        logger.warning(f"Received {signal.Signals(signum).name}; draining in-flight calls")
+        print("\n  Stopping: waiting for in-flight calls (signal again to abort)...")
+        stop.set()
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    for sig in signals:
+        signal.signal(sig, handle)
+    try:
+        yield
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
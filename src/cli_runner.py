@@ -5,11 +5,18 @@ from datetime import datetime
 from pathlib import Path
 from typing import Type
 
+from .adaptive_concurrency import AIMDLimiter
+from .calibration import CalibrationProfile
+from .checkpoint import RunInterrupted
+from .client_stack import (
+    ClientStack, client_stats, connect, print_client_report, print_hedging,
+)
 from .config import Config
 from .experiment_runner import ExperimentRunner
 from .metrics import MetricsCalculator
-from .ollama_client import OllamaClient
 from .prompts.base import BasePromptGenerator
+from .racing import Race
+from .session_scheduler import SessionScheduler
 
 
 def run_experiment(
@@ -17,53 +24,310 @@ def run_experiment(
     prompt_generator_class: Type[BasePromptGenerator],
     display_name: str | None = None,
     time_factor: int = 5,
+    max_workers: int = 1,
+    warm_up: bool = True,
+    keep_alive: str | int | None = None,
+    concurrency_limiter: AIMDLimiter | None = None,
+    resume: bool = False,
+    time_budget: float | None = None,
 ) -> dict:
-    """Run a prompt engineering experiment with the specified technique."""
+    """
+    Run a prompt engineering experiment with the specified technique.
+
+    ``max_workers`` > 1 sends that many calls to Ollama at once from a
+    thread pool; set it to the server's ``OLLAMA_NUM_PARALLEL``. With
+    ``warm_up`` the model is loaded before the first timed call and the load
+    time is reported separately; ``keep_alive`` overrides ``KEEP_ALIVE``.
+    With ``ADAPTIVE_CONCURRENCY`` (or a ``concurrency_limiter`` shared across
+    techniques) an AIMD controller decides how many of the workers may call
+    Ollama at once. Rows are checkpointed as they arrive; ``resume`` skips
+    the calls an interrupted run already finished. Ctrl-C or SIGTERM drains
+    the calls in flight and raises ``RunInterrupted``. ``time_budget``
+    (seconds, overriding ``TIME_BUDGET``) runs cases in stratified order
+    and stops starting calls before it runs out; the stats are then marked
+    ``partial`` with per-stratum coverage and a stratified accuracy estimate.
+    """
     display_name = display_name or technique_name.replace("_", " ").title()
     print("=" * 60)
     print(f"{display_name} Experiment (Ollama)")
     print("=" * 60)
     print("\n[1/5] Loading configuration...")
-    config = Config.from_env()
-    config.runs_per_case, config.max_retries, config.retry_delay = 2, 3, 2.0
-    print(f"  Model: {config.model_name}")
-    print(f"  Runs per case: {config.runs_per_case}")
-    print(f"  Ollama host: {config.ollama_host}")
+    config, max_workers, concurrency_limiter = load_config(
+        keep_alive, max_workers, concurrency_limiter, time_budget
+    )
     print("\n[2/5] Initializing Ollama client...")
-    client = OllamaClient(config, host=config.ollama_host)
-    models = client.list_models()
-    if models:
-        print(f"  Connected! Available models: {', '.join(models[:5])}")
-        if not any(config.model_name in m for m in models):
-            print(f"  WARNING: {config.model_name} not found. Available: {models}")
-    else:
-        print(f"  WARNING: Could not list models at {config.ollama_host}")
-    runner = ExperimentRunner(config, client=client)
+    stack = connect(config, warm_up, concurrency_limiter)
+    runner = ExperimentRunner(config, client=stack.client, max_workers=max_workers)
     prompt_generator = prompt_generator_class()
-    metrics_calc = MetricsCalculator()
     test_cases = runner.load_test_cases()
     total_cases, total_calls = len(test_cases), len(test_cases) * config.runs_per_case
+    if config.adaptive_runs:
+        total_calls = total_cases * config.adaptive_initial_runs
+        budget = config.adaptive_call_budget
+        print(f"  Adaptive runs: {config.adaptive_initial_runs}-{config.adaptive_max_runs} per case"
+              + (f", budget {budget} calls" if budget else ""))
     print(f"  Test cases: {total_cases}")
-    print(f"  Total API calls: {total_calls}")
-    est_minutes = (total_calls * time_factor) / 60
-    print(f"  Estimated time: ~{est_minutes:.0f}-{est_minutes*2:.0f} minutes")
+    print(f"  Total API calls: {total_calls}{' at least' if config.adaptive_runs else ''}")
+    _print_estimate(config, {technique_name: time_factor}, total_calls, max_workers)
     print(f"\n[3/5] Running {display_name.lower()} experiment...")
-    results_df = runner.run_technique(technique_name, prompt_generator.generate)
+    results_df = runner.run_technique(technique_name, prompt_generator.generate, resume=resume)
     print(f"\n  Completed: {len(results_df)} responses collected")
+    if results_df.empty:
+        print("  No call finished within the time budget; no statistics to compute")
+        return {"partial": True}
+    hedging = print_client_report(stack, runner.progress.snapshot(), technique_name)
+    _warn_api_errors(results_df)
+    print("\n[4/5] Calculating statistics...")
+    stats, overall, by_category, by_difficulty = _technique_stats(
+        technique_name, results_df, runner, test_cases
+    )
+    stats.update(_run_stats(stack, runner, hedging))
+    print("\n[5/5] Saving results...")
+    _save_results(technique_name, results_df, stats)
+    _print_summary(display_name, overall, by_category, by_difficulty)
+    return stats
+
+
+def run_session(
+    techniques: list[tuple[str, Type[BasePromptGenerator], str, int]],
+    ordering: str | None = None,
+    max_workers: int = 1,
+    warm_up: bool = True,
+    keep_alive: str | int | None = None,
+    resume: bool = False,
+    race: bool | None = None,
+    time_budget: float | None = None,
+    lpt: bool | None = None,
+    prefix_grouping: bool | None = None,
+    model: str | None = None,
+    results_dir: str | Path = "results",
+) -> dict[str, dict]:
+    """
+    Run several techniques as one session over a shared client.
+
+    Configuration, client, health checks and test cases are set up once;
+    the calls of all ``techniques`` (name, generator class, display name,
+    time factor) then share one work queue in ``ordering`` (default
+    ``SESSION_ORDERING``). If the session is stopped, the statistics of the
+    rows finished so far are saved (marked ``partial``) for every
+    technique before ``RunInterrupted`` propagates, so they can still be
+    compared. With ``race`` (default ``RACING``) techniques that fall out
+    of contention stop getting calls; each technique's stats then carry
+    its entry of the race report. ``time_budget`` (seconds, overriding
+    ``TIME_BUDGET``) bounds the whole session; results are then partial as
+    in :func:`run_experiment`. ``lpt`` (default ``LPT_SCHEDULING``) starts
+    the calls predicted to take longest first. ``prefix_grouping``
+    (default ``PREFIX_GROUPING``) runs calls sharing a prompt prefix back
+    to back; each technique's estimated prompt evaluation saving is stored
+    under ``prefix_cache`` in its stats. Figures of the session as a whole
+    (throughput, warm-up, the makespan against the plain ordering under
+    ``schedule`` and adaptive concurrency) go to ``session_stats.json``;
+    each technique's hedging report goes under ``hedging`` in its stats.
+    ``model`` overrides ``MODEL_NAME`` and ``results_dir`` is where
+    results, stats and checkpoints go.
+    """
+    print("=" * 60)
+    print(f"Session: {', '.join(display for _, _, display, _ in techniques)}")
+    print("=" * 60)
+    print("\n[1/5] Loading configuration...")
+    config, max_workers, concurrency_limiter = load_config(
+        keep_alive, max_workers, None, time_budget, model
+    )
+    # A time-boxed session needs every prefix to be representative
+    ordering = ordering or ("stratified" if config.time_budget else config.session_ordering)
+    if lpt is not None:
+        config.lpt_scheduling = lpt
+    if prefix_grouping is not None:
+        config.prefix_grouping = prefix_grouping
+    dispatch = [
+        label for label, enabled in (
+            ("longest predicted first", config.lpt_scheduling),
+            ("grouped by prompt prefix", config.prefix_grouping),
+        ) if enabled and not config.time_budget
+    ]
+    print(f"  Ordering: {', '.join([ordering, *dispatch])}")
+    racing = config.racing if race is None else race
+    if racing:
+        print(f"  Racing: {config.racing_method} bounds "
+              f"at {config.racing_confidence:.0%} confidence")
+    print("\n[2/5] Initializing Ollama client...")
+    stack = connect(config, warm_up, concurrency_limiter)
+    runner = ExperimentRunner(
+        config, client=stack.client, results_dir=str(results_dir), max_workers=max_workers
+    )
+    names = [name for name, _, _, _ in techniques]
+    race_state = Race.from_config(config, names) if racing else None
+    scheduler = SessionScheduler(runner, ordering, race_state)
+    test_cases = runner.load_test_cases()
+    calls_per_technique = len(test_cases) * config.runs_per_case
+    print(f"  Test cases: {len(test_cases)}")
+    print(f"  Total API calls: {calls_per_technique * len(techniques)}")
+    _print_estimate(
+        config, {name: factor for name, _, _, factor in techniques}, calls_per_technique,
+        max_workers,
+    )
+    print("\n[3/5] Running session...")
+    generators = {name: generator_class().generate for name, generator_class, _, _ in techniques}
+    interrupted = None
+    try:
+        all_results = scheduler.run(generators, test_cases, resume=resume)
+    except RunInterrupted as e:
+        interrupted = e
+        all_results = scheduler.results
+    print(f"\n  Completed: {sum(len(df) for df in all_results.values())} responses collected")
+    print_client_report(stack, runner.progress.snapshot(), None)
+    hedging = {name: print_hedging(stack, name, f"{name}: ") for name in all_results}
+    if race_state is not None:
+        _print_race(race_state)
+    print("\n[4/5] Calculating statistics...")
+    partial = interrupted is not None or runner.budget_exhausted
+    computed = {}
+    for name, results_df in all_results.items():
+        _warn_api_errors(results_df)
+        computed[name] = _technique_stats(name, results_df, runner, test_cases)
+        computed[name][0]["partial"] = partial
+        if hedging[name] is not None:
+            computed[name][0]["hedging"] = hedging[name]
+        if race_state is not None:
+            computed[name][0]["race"] = race_state.report()["techniques"][name]
+    session_stats = {
+        "techniques": list(all_results),
+        "ordering": ordering,
+        "partial": partial,
+        **_run_stats(stack, runner, None),
+    }
+    print("\n[5/5] Saving results...")
+    _save_stats(Path(results_dir) / "session_stats.json", session_stats)
+    displays = {name: display for name, _, display, _ in techniques}
+    all_stats = {}
+    for name, (stats, overall, by_category, by_difficulty) in computed.items():
+        _save_results(name, all_results[name], stats, results_dir)
+        _print_summary(displays[name], overall, by_category, by_difficulty)
+        all_stats[name] = stats
+    if interrupted is not None:
+        raise interrupted
+    return all_stats
+
+
+def _print_race(race: Race) -> None:
+    """Print each technique's accuracy bounds and when and why it was retired."""
+    print(f"  Race leader: {race.leader() or 'undecided'}")
+    for entry in race.entries.values():
+        status = (
+            f"retired after {entry.retired_after} answers: {entry.reason}"
+            if entry.retired else "ran to the end"
+        )
+        print(f"  {entry.technique}: {entry.accuracy:.1%} in [{entry.low:.1%}, {entry.high:.1%}] "
+              f"over {entry.calls} calls, {status}")
+
+
+def load_config(
+    keep_alive: str | int | None,
+    max_workers: int,
+    concurrency_limiter: AIMDLimiter | None,
+    time_budget: float | None = None,
+    model: str | None = None,
+) -> tuple[Config, int, AIMDLimiter | None]:
+    """
+    Load the configuration with the command line overrides applied.
+
+    Returns the configuration, the number of worker threads (raised to
+    the adaptive concurrency ceiling when a limiter is used) and the
+    limiter, if any.
+    """
+    config = Config.from_env()
+    # Runs started from the CLI have always made at most 3 attempts per call
+    config.max_retries = 3
+    if model is not None:
+        config.model_name = model
+    if keep_alive is not None:
+        config.keep_alive = keep_alive
+    if time_budget is not None:
+        config.time_budget = time_budget
+    print(f"  Model: {config.model_name}")
+    print(f"  Runs per case: {config.runs_per_case}")
+    print(f"  Ollama host: {config.ollama_host}")
+    if config.adaptive_concurrency and concurrency_limiter is None:
+        concurrency_limiter = AIMDLimiter.from_config(config)
+    if concurrency_limiter is not None:
+        # Enough workers for the controller's ceiling; it decides how many call at once
+        max_workers = max(max_workers, concurrency_limiter.max_limit)
+    if max_workers > 1:
+        # Give every worker thread its own keep-alive connection
+        config.pool_maxsize = max(config.pool_maxsize, max_workers)
+        print(f"  Worker threads: {max_workers}")
+    if config.time_budget:
+        print(f"  Time budget: {config.time_budget / 60:.1f} minutes (stratified case order)")
+    return config, max_workers, concurrency_limiter
+
+
+def _warn_api_errors(results_df) -> None:
+    """Print a warning if any call failed."""
     api_errors = results_df[~results_df["success"]]
     if len(api_errors) > 0:
         print(f"  WARNING: {len(api_errors)} API errors occurred")
-    print("\n[4/5] Calculating statistics...")
-    overall = metrics_calc.calculate_metrics(results_df["correct"].tolist())
+
+
+def _technique_stats(name: str, results_df, runner: ExperimentRunner, test_cases) -> tuple:
+    """Compute a technique's statistics; return them with the metrics to print."""
+    metrics_calc = MetricsCalculator()
+    overall = metrics_calc.calculate_case_metrics(results_df)
     by_category = metrics_calc.aggregate_by_category(results_df)
     by_difficulty = metrics_calc.aggregate_by_difficulty(results_df)
     stats = _build_stats_dict(overall, by_category, by_difficulty)
-    print("\n[5/5] Saving results...")
-    _save_results(technique_name, results_df, stats)
-    _print_summary(display_name, overall, by_category, by_difficulty)
+    stats["consistency"] = metrics_calc.calculate_consistency(results_df)
+    if name in runner.prefix_report:
+        stats["prefix_cache"] = runner.prefix_report[name]
+    if runner.config.time_budget:
+        stats["partial"] = runner.budget_exhausted
+        stats["coverage"] = metrics_calc.stratum_coverage(results_df, test_cases)
+        stats["stratified"] = metrics_calc.calculate_stratified_metrics(results_df, test_cases)
+        if runner.budget_exhausted:
+            estimate = stats["stratified"]
+            print(f"  Partial run: {results_df['id'].nunique()}/{len(test_cases)} cases in "
+                  f"{estimate['strata_covered']}/{estimate['strata_total']} strata; "
+                  f"stratified accuracy {estimate['accuracy']:.1%} "
+                  f"+/- {1.96 * estimate['std_error']:.1%}")
+    return stats, overall, by_category, by_difficulty
+
+
+def _run_stats(stack: ClientStack, runner: ExperimentRunner, hedging: dict | None) -> dict:
+    """Statistics of the run as a whole: throughput, dispatch schedule and client telemetry."""
+    stats = {"throughput_rps": runner.progress.snapshot().throughput_rps}
+    if runner.schedule_report is not None:
+        stats["schedule"] = runner.schedule_report
+    stats.update(client_stats(stack, hedging))
     return stats
 
 
+def _print_estimate(
+    config: Config, techniques: dict[str, int], calls_per_technique: int, max_workers: int
+) -> None:
+    """
+    Print the expected run time, from the calibration profile when available.
+
+    ``techniques`` maps each technique to its rough seconds per call, used
+    when the profile does not cover it.
+    """
+    profile = CalibrationProfile.load(config.calibration_profile)
+    if profile is not None and profile.model != config.model_name:
+        print(f"  Calibration profile is for {profile.model}; ignoring it")
+        profile = None
+    estimates = [
+        profile.estimate_seconds(name, calls_per_technique, max_workers) if profile else None
+        for name in techniques
+    ]
+    if None in estimates:
+        total_s = sum(calls_per_technique * factor for factor in techniques.values())
+        est_minutes = total_s / 60 / max_workers
+        print(f"  Estimated time: ~{est_minutes:.0f}-{est_minutes*2:.0f} minutes")
+        return
+    print(f"  Estimated time: ~{sum(estimates) / 60:.0f} minutes (calibrated {profile.created})")
+    if max_workers < profile.recommended_concurrency:
+        print(f"  Calibration recommends {profile.recommended_concurrency} workers "
+              f"and READ_TIMEOUT={profile.recommended_read_timeout:.0f}")
+
+
 def _build_stats_dict(overall, by_category: dict, by_difficulty: dict) -> dict:
     """Build statistics dictionary from metrics."""
     return {
@@ -97,15 +361,14 @@ def _build_stats_dict(overall, by_category: dict, by_difficulty: dict) -> dict:
     }
 
 
-def _save_results(technique_name: str, results_df, stats: dict) -> None:
+def _save_results(
+    technique_name: str, results_df, stats: dict, results_dir: str | Path = "results"
+) -> None:
     """Save results CSV and stats JSON."""
-    results_dir = Path("results")
-    results_dir.mkdir(exist_ok=True)
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
 
-    stats_path = results_dir / f"{technique_name}_stats.json"
-    with open(stats_path, "w") as f:
-        json.dump(stats, f, indent=2)
-    print(f"  Saved: {stats_path}")
+    _save_stats(results_dir / f"{technique_name}_stats.json", stats)
 
     raw_path = results_dir / f"{technique_name}_results.csv"
     try:
@@ -119,6 +382,14 @@ def _save_results(technique_name: str, results_df, stats: dict) -> None:
         print(f"  Saved to: {alt_path}")
 
 
+def _save_stats(stats_path: Path, stats: dict) -> None:
+    """Write a stats JSON file."""
+    stats_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(stats_path, "w") as f:
+        json.dump(stats, f, indent=2)
+    print(f"  Saved: {stats_path}")
+
+
 def _print_summary(display_name: str, overall, by_category: dict, by_difficulty: dict) -> None:
     """Print experiment summary."""
     print("\n" + "=" * 60)
@@ -0,0 +1,156 @@
+"""The client stack a run calls through: Ollama client(s) and the optional wrappers."""
+
+from dataclasses import dataclass
+
+from .adaptive_concurrency import AdaptiveConcurrencyClient, AIMDLimiter
+from .config import Config
+from .hedging import HedgingClient
+from .host_pool import OllamaPoolClient, create_ollama_client
+from .ollama_client import APIResponse, OllamaClient
+from .progress import ProgressEvent
+from .request_coalescer import CoalescingClient
+from .response_cache import CachedLLMClient, ResponseCache
+
+
+@dataclass
+class ClientStack:
+    """
+    The client a run calls through and the wrappers kept for their telemetry.
+
+    Attributes
+    ----------
+    client : LLMClient
+        Outermost wrapper, passed to the runner.
+    base_client : OllamaClient or OllamaPoolClient
+        Unwrapped client talking to Ollama.
+    warmup : APIResponse, optional
+        Response of the warm-up call, if one was made.
+    limiter : AIMDLimiter, optional
+        Adaptive concurrency controller.
+    hedger, coalescer, cache : optional
+        Wrappers enabled by the configuration.
+    """
+
+    client: object
+    base_client: OllamaClient | OllamaPoolClient
+    warmup: APIResponse | None = None
+    limiter: AIMDLimiter | None = None
+    hedger: HedgingClient | None = None
+    coalescer: CoalescingClient | None = None
+    cache: ResponseCache | None = None
+
+
+def connect(
+    config: Config, warm_up: bool, concurrency_limiter: AIMDLimiter | None
+) -> ClientStack:
+    """
+    Create the client, check the server(s) and wrap it as configured.
+
+    With ``warm_up`` the model is loaded first; ``concurrency_limiter``
+    adds adaptive concurrency. Returns the client to run through together
+    with the wrappers kept for their telemetry.
+    """
+    client = create_ollama_client(config)
+    if isinstance(client, OllamaPoolClient):
+        health = client.check_health()
+        healthy = sum(health.values())
+        print(f"  Host pool: {healthy}/{len(health)} healthy ({config.load_balancing} balancing)")
+    models = client.list_models()
+    if models:
+        print(f"  Connected! Available models: {', '.join(models[:5])}")
+        if not any(config.model_name in m for m in models):
+            print(f"  WARNING: {config.model_name} not found. Available: {models}")
+    else:
+        print(f"  WARNING: Could not list models at {config.ollama_host}")
+    warmup = client.warm_up() if warm_up else None
+    if warmup is not None and warmup.success:
+        load_s = (warmup.load_duration or 0) / 1e9
+        print(f"  Model warm-up: {warmup.latency_ms / 1000:.1f}s (model load {load_s:.1f}s)")
+    elif warmup is not None:
+        print(f"  WARNING: Model warm-up failed: {warmup.error}")
+    stack = ClientStack(
+        client=client, base_client=client, warmup=warmup, limiter=concurrency_limiter
+    )
+    if concurrency_limiter is not None:
+        client = AdaptiveConcurrencyClient(client, concurrency_limiter)
+        print(f"  Adaptive concurrency: limit {concurrency_limiter.limit}, "
+              f"max {concurrency_limiter.max_limit}")
+    if config.hedge:
+        secondary = OllamaClient(config, host=config.hedge_host) if config.hedge_host else None
+        client = stack.hedger = HedgingClient(client, config, secondary)
+        print(f"  Hedging calls slower than p{config.hedge_quantile * 100:.0f} "
+              f"(at most {config.hedge_max_extra:.0%} extra load)")
+    if config.coalesce_deterministic:
+        client = stack.coalescer = CoalescingClient(client, fan_out=True)
+        print("  Coalescing identical deterministic requests")
+    if config.cache_path:
+        stack.cache = ResponseCache(
+            config.cache_path,
+            max_bytes=int(config.cache_max_mb * 1024 * 1024),
+            read_only=config.cache_replay,
+        )
+        client = CachedLLMClient(client, stack.cache)
+        mode = "replay" if config.cache_replay else "read/write"
+        print(f"  Response cache: {config.cache_path} ({mode})")
+    stack.client = client
+    return stack
+
+
+def print_client_report(
+    stack: ClientStack, progress: ProgressEvent, technique_name: str | None
+) -> dict | None:
+    """
+    Print throughput and client telemetry; return the hedging report, if any.
+
+    The hedging report is the one of ``technique_name``; pass None to
+    leave it out and print each technique's with :func:`print_hedging`.
+    """
+    print(f"  Throughput: {progress.throughput_rps:.2f} calls/s over {progress.elapsed_s:.0f}s")
+    conn = stack.client.connection_stats()
+    print(f"  Connections: {conn.connections_opened} opened, {conn.connections_reused} reused "
+          f"({conn.reuse_ratio:.0%} of {conn.requests} requests)")
+    if stack.cache is not None:
+        cache_stats = stack.cache.stats
+        print(f"  Cache: {cache_stats.hits} hits, {cache_stats.misses} misses "
+              f"({cache_stats.hit_rate:.0%} hit rate), {cache_stats.evictions} evictions")
+    if stack.coalescer is not None:
+        print(f"  Coalesced: {stack.coalescer.stats.coalesced} calls shared "
+              f"{stack.coalescer.stats.upstream_calls} upstream requests")
+    if isinstance(stack.base_client, OllamaPoolClient):
+        for host, host_stats in stack.base_client.host_stats().items():
+            state = " (ejected)" if host_stats["ejected"] else ""
+            print(f"  {host}: {host_stats['served']} calls served{state}")
+    if stack.limiter is not None:
+        telemetry = stack.limiter.telemetry()
+        print(f"  Concurrency limit: {telemetry['limit']} (peak {telemetry['peak_limit']})")
+    return print_hedging(stack, technique_name) if technique_name is not None else None
+
+
+def print_hedging(stack: ClientStack, technique_name: str, label: str = "") -> dict | None:
+    """Print a technique's hedging figures, prefixed with ``label``; return its report."""
+    if stack.hedger is None or technique_name not in stack.hedger.stats:
+        return None
+    hedging = stack.hedger.report(technique_name)
+    print(f"  {label}Hedging: {hedging['hedges']} duplicates "
+          f"({hedging['extra_load_pct']:.1f}% extra load), "
+          f"{hedging['hedge_wins']} answered first")
+    if "p99_ms" in hedging:
+        unhedged = f"{hedging['unhedged_p95_ms']:.0f}/{hedging['unhedged_p99_ms']:.0f}ms"
+        print(f"  {label}p95/p99 latency: {hedging['p95_ms']:.0f}/{hedging['p99_ms']:.0f}ms, "
+              f"at least {unhedged} unhedged")
+    return hedging
+
+
+def client_stats(stack: ClientStack, hedging: dict | None) -> dict:
+    """Warm-up, adaptive concurrency and hedging figures of a run, for its stats file."""
+    stats = {}
+    if stack.warmup is not None and stack.warmup.success:
+        stats["warmup"] = {
+            "latency_ms": stack.warmup.latency_ms,
+            "load_duration_ms": (stack.warmup.load_duration or 0) / 1e6,
+        }
+    if stack.limiter is not None:
+        stats["concurrency"] = stack.limiter.telemetry()
+    if hedging is not None:
+        stats["hedging"] = hedging
+    return stats
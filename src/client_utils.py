@@ -0,0 +1,55 @@
+"""Helpers shared by LLM client wrappers."""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# Technique of the call being made, for wrappers keeping per-technique state
+_technique: ContextVar[str | None] = ContextVar("technique", default=None)
+
+
+@contextmanager
+def technique_scope(name: str | None) -> Iterator[None]:
+    """
+    Tag the calls made in this block (thread or task) with technique ``name``.
+
+    Wrappers keeping per-technique state (hedging windows, concurrency
+    baselines) read it through :func:`current_technique`, so calls of
+    interleaved techniques are told apart even when they run concurrently.
+    ``None`` leaves the calls untagged.
+    """
+    token = _technique.set(name)
+    try:
+        yield
+    finally:
+        _technique.reset(token)
+
+
+def current_technique() -> str | None:
+    """Return the technique the current call was tagged with, if any."""
+    return _technique.get()
+
+
+async def aquery_client(client, prompt: str, **kwargs):
+    """
+    Await a query on any LLM client.
+
+    Parameters
+    ----------
+    client : LLMClient
+        Client to query. Its ``aquery`` is awaited when present; otherwise the
+        blocking ``query`` runs in a worker thread.
+    prompt : str
+        The prompt to send.
+    **kwargs
+        Keyword arguments forwarded to the client (``options``, ``run``).
+
+    Returns
+    -------
+    APIResponse
+        The client's response.
+    """
+    if hasattr(client, "aquery"):
+        return await client.aquery(prompt, **kwargs)
+    return await asyncio.to_thread(client.query, prompt, **kwargs)
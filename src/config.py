@@ -1,10 +1,48 @@
 """Configuration module for loading environment variables and settings."""
 
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as ``true``/``1``/``yes`` from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_optional(name: str, cast: type):
+    """Read an optional typed value; unset or empty variables give None."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return None
+    return cast(value)
+
+
+def _env_keep_alive(name: str) -> str | int | None:
+    """Read an Ollama keep_alive value: a duration like "10m" or seconds like -1."""
+    value = os.getenv(name)
+    if not value:
+        return None
+    value = value.strip()
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _env_stop(name: str) -> list[str] | None:
+    """Read stop sequences as a JSON list, or a single literal sequence."""
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return [value]
+    return parsed if isinstance(parsed, list) else [str(parsed)]
+
+
 @dataclass
 class Config:
     """
@@ -15,7 +53,15 @@ class Config:
     model_name : str
         Name of the Ollama model to use.
     ollama_host : str
-        URL of the Ollama server.
+        URL of the Ollama server, or a comma-separated list of URLs to
+        balance calls over several servers.
+    load_balancing : str
+        How calls are spread over several hosts: ``"least_outstanding"``
+        or ``"latency"`` (latency-weighted).
+    breaker_failures : int
+        Consecutive failures after which a host is ejected from the pool.
+    breaker_cooldown : float
+        Seconds an ejected host waits before its health check.
     max_retries : int
         Maximum number of retry attempts for API calls.
     retry_delay : float
@@ -23,21 +69,226 @@ class Config:
     runs_per_case : int
         Number of times to run each test case for consistency measurement.
     request_delay : float
-        Delay between each API request to avoid rate limits.
+        Minimum delay between API request starts, for servers that enforce
+        a rate limit. Sets the rate of the shared token-bucket limiter; the
+        default 0 disables pacing so concurrency settings decide throughput
+        until the server throttles (HTTP 429/503). Calls are then paced at
+        half the rate they were starting at, until successes recover it.
     rate_limit_backoff : float
-        Initial wait time on rate limit error.
+        Initial wait time on rate limit error (HTTP 429/503).
     max_backoff : float
         Maximum wait time for rate limit backoff.
+    rate_limit_burst : int
+        Number of requests that may start back to back before pacing applies.
+    pool_connections : int
+        Number of per-host connection pools kept by the HTTP session.
+    pool_maxsize : int
+        Maximum number of keep-alive connections kept open per host.
+    pool_block : bool
+        Whether callers wait for a free connection once a host's pool is full.
+    connect_timeout : float
+        Seconds to wait while establishing a connection to Ollama.
+    read_timeout : float
+        Seconds to wait for Ollama to send a response.
+    max_concurrency : int
+        Maximum number of requests kept in flight by the async client.
+    stream : bool
+        Whether to stream generations to measure time-to-first-token.
+    cache_path : str, optional
+        SQLite file for the persistent response cache. None disables caching.
+    cache_max_mb : float
+        Size cap of the response cache before LRU eviction, in megabytes.
+    cache_replay : bool
+        Serve responses only from the cache and never call the model.
+    coalesce_deterministic : bool
+        Share one upstream call among identical in-flight requests whose
+        sampling is deterministic (temperature 0).
+    keep_alive : str or int, optional
+        How long Ollama keeps the model loaded after a call, e.g. ``"10m"``,
+        or ``-1`` to keep it resident. None uses the server default.
+    early_stop : bool
+        Stream techniques that declare a final-answer marker and close the
+        stream once the answer is complete.
+    retry_in_runner : bool
+        Retry failed calls from the runner's deferred queue with jittered
+        backoff; clients then make a single attempt per call instead of
+        sleeping between their own retries. When off, the client retries
+        and the runner makes a single attempt per call.
+    calibration_profile : str
+        Path of the profile written by ``scripts/calibrate.py``; used for
+        time estimates when it exists.
+    session_ordering : str
+        Order in which a multi-technique session runs its calls:
+        ``"round_robin"`` across techniques, ``"stratified"`` across
+        techniques and categories, or ``"sequential"``.
+    time_budget : float, optional
+        Wall-clock seconds a technique (or a whole session) may take. Cases
+        then run in stratified order and no call starts once the budget is
+        nearly spent, leaving partial but representative results.
+    lpt_scheduling : bool
+        Dispatch the calls with the longest latency predicted from earlier
+        results first, so worker slots drain evenly at the end of a run
+        (ignored under a ``time_budget``, which runs stratified).
+    prefix_grouping : bool
+        Dispatch calls whose prompts share a long prefix (few-shot
+        examples, a persona) back to back, and route them to the host that
+        last saw the prefix, so the server reuses its prompt cache
+        (ignored under a ``time_budget``). With several workers a group's
+        first call runs on its own before the rest fan out.
+    queue_path : str
+        SQLite file of the shared work queue used by ``scripts/worker.py``.
+    queue_lease_s : float
+        Seconds a worker may hold a queued item before another worker may
+        take it over; should exceed the slowest call.
+    queue_journal_mode : str
+        ``"wal"`` (workers on one host) or ``"delete"`` (queue file on a
+        network filesystem shared by several hosts).
+    queue_max_attempts : int
+        Leases of a queued item before its last failure is committed as
+        its row. Separate from ``max_retries``, which still bounds each
+        lease's client attempts when ``retry_in_runner`` is off.
+    adaptive_runs : bool
+        Choose the number of runs per case while running: every case gets
+        ``adaptive_initial_runs`` and only inconsistent cases (or semantic
+        answers scored near the similarity threshold) get more (replaces
+        ``runs_per_case`` in ``run_technique``).
+    adaptive_initial_runs : int
+        Runs every case gets in adaptive mode.
+    adaptive_max_runs : int
+        Maximum runs of any case in adaptive mode.
+    adaptive_agreement : float
+        Share of runs the majority verdict needs for a case to be settled.
+    adaptive_call_budget : int, optional
+        Maximum calls per technique in adaptive mode; extra runs go to the
+        least consistent cases first. None means no limit but
+        ``adaptive_max_runs``.
+    racing : bool
+        Stop issuing a session's calls for techniques whose accuracy is
+        out of contention or settled (see ``src.racing.Race``).
+    racing_method : str
+        Confidence bounds used by the race: ``"hoeffding"`` or ``"beta"``.
+    racing_confidence : float
+        Joint confidence that no technique is retired wrongly.
+    racing_min_calls : int
+        Scored answers a technique needs before it can be retired.
+    racing_precision : float
+        Interval half-width at which a technique counts as settled; 0
+        only retires techniques that are out of contention.
+    progress_events : str, optional
+        JSONL file receiving a structured progress event every few seconds
+        of a run (for dashboards or log shippers). None disables it.
+    adaptive_concurrency : bool
+        Let an AIMD controller pick how many calls are in flight instead of
+        using a fixed worker count.
+    adaptive_max_concurrency : int
+        Upper bound of the adaptive concurrency limit.
+    adaptive_latency_tolerance : float
+        Ratio of p50 latency to its baseline at which the limit is cut.
+    hedge : bool
+        Send a duplicate of any call that is slower than the technique's
+        recent ``hedge_quantile`` latency and keep the first answer.
+    hedge_quantile : float
+        Latency quantile after which a call is hedged.
+    hedge_max_extra : float
+        Maximum fraction of calls that may be duplicated.
+    hedge_min_samples : int
+        Calls to observe per technique before hedging starts.
+    hedge_host : str, optional
+        Ollama host that receives the duplicates. None uses ``ollama_host``.
+    num_predict, num_ctx, temperature, seed, stop, top_k, top_p : optional
+        Ollama generation options. None leaves the technique default (or the
+        server default) in place; a value overrides it for every technique.
     """
 
     model_name: str = "llama3.2:3b"
     ollama_host: str = "http://localhost:11434"
+    load_balancing: str = "least_outstanding"
+    breaker_failures: int = 3
+    breaker_cooldown: float = 30.0
     max_retries: int = 5
     retry_delay: float = 2.0
     runs_per_case: int = 2
-    request_delay: float = 1.5
+    request_delay: float = 0.0
     rate_limit_backoff: float = 15.0
     max_backoff: float = 120.0
+    rate_limit_burst: int = 1
+    pool_connections: int = 4
+    pool_maxsize: int = 8
+    pool_block: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 120.0
+    max_concurrency: int = 1
+    stream: bool = False
+    cache_path: str | None = None
+    cache_max_mb: float = 512.0
+    cache_replay: bool = False
+    coalesce_deterministic: bool = False
+    keep_alive: str | int | None = None
+    early_stop: bool = True
+    retry_in_runner: bool = True
+    calibration_profile: str = "results/calibration_profile.json"
+    session_ordering: str = "round_robin"
+    time_budget: float | None = None
+    lpt_scheduling: bool = False
+    prefix_grouping: bool = False
+    queue_path: str = "results/work_queue.db"
+    queue_lease_s: float = 600.0
+    queue_journal_mode: str = "wal"
+    queue_max_attempts: int = 5
+    adaptive_runs: bool = False
+    adaptive_initial_runs: int = 2
+    adaptive_max_runs: int = 6
+    adaptive_agreement: float = 0.8
+    adaptive_call_budget: int | None = None
+    racing: bool = False
+    racing_method: str = "hoeffding"
+    racing_confidence: float = 0.95
+    racing_min_calls: int = 20
+    racing_precision: float = 0.0
+    progress_events: str | None = None
+    adaptive_concurrency: bool = False
+    adaptive_max_concurrency: int = 16
+    adaptive_latency_tolerance: float = 2.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_max_extra: float = 0.05
+    hedge_min_samples: int = 20
+    hedge_host: str | None = None
+    num_predict: int | None = None
+    num_ctx: int | None = None
+    temperature: float | None = None
+    seed: int | None = None
+    stop: list[str] | None = field(default=None)
+    top_k: int | None = None
+    top_p: float | None = None
+
+    def generation_options(self) -> dict:
+        """
+        Return the generation options that are explicitly configured.
+
+        Returns
+        -------
+        dict
+            Ollama ``options`` entries whose value is not None.
+        """
+        options = {
+            "num_predict": self.num_predict,
+            "num_ctx": self.num_ctx,
+            "temperature": self.temperature,
+            "seed": self.seed,
+            "stop": self.stop,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+        }
+        return {name: value for name, value in options.items() if value is not None}
+
+    def hosts(self) -> list[str]:
+        """Return the Ollama host URLs listed in ``ollama_host``."""
+        return [host.strip() for host in self.ollama_host.split(",") if host.strip()]
+
+    def client_attempts(self) -> int:
+        """Return how many attempts a client makes per call before giving up."""
+        return 1 if self.retry_in_runner else self.max_retries
 
     @classmethod
     def from_env(cls, env_path: str | None = None) -> "Config":
@@ -59,10 +310,65 @@ class Config:
         return cls(
             model_name=os.getenv("MODEL_NAME", "llama3.2:3b"),
             ollama_host=os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+            load_balancing=os.getenv("LOAD_BALANCING", "least_outstanding"),
+            breaker_failures=int(os.getenv("BREAKER_FAILURES", "3")),
+            breaker_cooldown=float(os.getenv("BREAKER_COOLDOWN", "30.0")),
             max_retries=int(os.getenv("MAX_RETRIES", "5")),
             retry_delay=float(os.getenv("RETRY_DELAY", "2.0")),
             runs_per_case=int(os.getenv("RUNS_PER_CASE", "2")),
-            request_delay=float(os.getenv("REQUEST_DELAY", "1.5")),
+            request_delay=float(os.getenv("REQUEST_DELAY", "0")),
             rate_limit_backoff=float(os.getenv("RATE_LIMIT_BACKOFF", "15.0")),
             max_backoff=float(os.getenv("MAX_BACKOFF", "120.0")),
+            rate_limit_burst=int(os.getenv("RATE_LIMIT_BURST", "1")),
+            pool_connections=int(os.getenv("POOL_CONNECTIONS", "4")),
+            pool_maxsize=int(os.getenv("POOL_MAXSIZE", "8")),
+            pool_block=_env_bool("POOL_BLOCK", True),
+            connect_timeout=float(os.getenv("CONNECT_TIMEOUT", "5.0")),
+            read_timeout=float(os.getenv("READ_TIMEOUT", "120.0")),
+            max_concurrency=int(os.getenv("MAX_CONCURRENCY", "1")),
+            stream=_env_bool("STREAM", False),
+            cache_path=os.getenv("RESPONSE_CACHE") or None,
+            cache_max_mb=float(os.getenv("RESPONSE_CACHE_MAX_MB", "512")),
+            cache_replay=_env_bool("RESPONSE_CACHE_REPLAY", False),
+            coalesce_deterministic=_env_bool("COALESCE_DETERMINISTIC", False),
+            keep_alive=_env_keep_alive("KEEP_ALIVE"),
+            early_stop=_env_bool("EARLY_STOP", True),
+            retry_in_runner=_env_bool("RETRY_IN_RUNNER", True),
+            calibration_profile=os.getenv(
+                "CALIBRATION_PROFILE", "results/calibration_profile.json"
+            ),
+            session_ordering=os.getenv("SESSION_ORDERING", "round_robin"),
+            time_budget=_env_optional("TIME_BUDGET", float),
+            lpt_scheduling=_env_bool("LPT_SCHEDULING", False),
+            prefix_grouping=_env_bool("PREFIX_GROUPING", False),
+            queue_path=os.getenv("WORK_QUEUE", "results/work_queue.db"),
+            queue_lease_s=float(os.getenv("WORK_QUEUE_LEASE_S", "600")),
+            queue_journal_mode=os.getenv("WORK_QUEUE_JOURNAL", "wal"),
+            queue_max_attempts=int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "5")),
+            adaptive_runs=_env_bool("ADAPTIVE_RUNS", False),
+            adaptive_initial_runs=int(os.getenv("ADAPTIVE_INITIAL_RUNS", "2")),
+            adaptive_max_runs=int(os.getenv("ADAPTIVE_MAX_RUNS", "6")),
+            adaptive_agreement=float(os.getenv("ADAPTIVE_AGREEMENT", "0.8")),
+            adaptive_call_budget=_env_optional("ADAPTIVE_CALL_BUDGET", int),
+            racing=_env_bool("RACING", False),
+            racing_method=os.getenv("RACING_METHOD", "hoeffding"),
+            racing_confidence=float(os.getenv("RACING_CONFIDENCE", "0.95")),
+            racing_min_calls=int(os.getenv("RACING_MIN_CALLS", "20")),
+            racing_precision=float(os.getenv("RACING_PRECISION", "0.0")),
+            progress_events=os.getenv("PROGRESS_EVENTS") or None,
+            adaptive_concurrency=_env_bool("ADAPTIVE_CONCURRENCY", False),
+            adaptive_max_concurrency=int(os.getenv("ADAPTIVE_MAX_CONCURRENCY", "16")),
+            adaptive_latency_tolerance=float(os.getenv("ADAPTIVE_LATENCY_TOLERANCE", "2.0")),
+            hedge=_env_bool("HEDGE", False),
+            hedge_quantile=float(os.getenv("HEDGE_QUANTILE", "0.95")),
+            hedge_max_extra=float(os.getenv("HEDGE_MAX_EXTRA", "0.05")),
+            hedge_min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20")),
+            hedge_host=os.getenv("HEDGE_HOST") or None,
+            num_predict=_env_optional("NUM_PREDICT", int),
+            num_ctx=_env_optional("NUM_CTX", int),
+            temperature=_env_optional("TEMPERATURE", float),
+            seed=_env_optional("SEED", int),
+            stop=_env_stop("STOP"),
+            top_k=_env_optional("TOP_K", int),
+            top_p=_env_optional("TOP_P", float),
         )
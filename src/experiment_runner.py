@@ -1,15 +1,35 @@
 """Experiment runner module for orchestrating prompt technique experiments."""
 
+import asyncio
 import json
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
 from pathlib import Path
+from collections.abc import Hashable
 from typing import Callable, Protocol
 
 import pandas as pd
 
+from .adaptive_sampling import run_adaptive
 from .answer_evaluator import AnswerEvaluator
+from .checkpoint import CheckpointStore, RunInterrupted, checkpoint_key, stop_on_signals
 from .config import Config
+from .client_utils import aquery_client, technique_scope
+from .latency_model import LatencyModel, LongestFirstPlan
 from .metrics import MetricsCalculator
+from .ollama_client import APIResponse, StopCondition
+from .prefix_groups import PrefixGate, group_order, report_prefix_cache
+from .progress import JsonlEventWriter, LineDisplay, ProgressListener, ProgressTracker
+from .prompts.base import BasePromptGenerator
+from .retry_scheduler import RetryScheduler
+from .session_scheduler import SessionScheduler
+from .stratification import stratified_indices
+from .time_budget import TimeBudget
+from .work_item import WorkItem
 
 # Configure module logger
 logger = logging.getLogger(__name__)
@@ -18,10 +38,68 @@ logger = logging.getLogger(__name__)
 class LLMClient(Protocol):
     """Protocol for LLM clients (Gemini, Ollama, etc.)."""
 
+    def query(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+    ) -> APIResponse:
+        """Send a prompt with generation options and return the response for a run."""
+        ...
+
+
+class AsyncLLMClient(LLMClient, Protocol):
+    """Protocol for LLM clients that can also be awaited."""
+
+    async def aquery(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+    ) -> APIResponse:
+        """Send a prompt without blocking the event loop."""
+        ...
+
+
+def resolve_generation_options(config: Config, prompt_generator: Callable[[dict], str]) -> dict:
+    """Merge a technique's ``GENERATION_OPTIONS`` with the options set in ``config``."""
+    generator = getattr(prompt_generator, "__self__", prompt_generator)
+    defaults = (
+        generator.generation_options()
+        if isinstance(generator, BasePromptGenerator) else {}
+    )
+    return {**defaults, **config.generation_options()}
 
 
 class ExperimentRunner:
-    """Runner for executing prompt engineering experiments."""
+    """
+    Runner for executing prompt engineering experiments.
+
+    With ``max_workers > 1`` the (case, run) calls of a technique are fanned
+    out over a thread pool; the client and evaluator must then be safe to
+    share between threads, which ``OllamaClient`` and ``AnswerEvaluator`` are.
+
+    Failed calls are re-queued with jittered exponential backoff (honouring
+    ``Retry-After``) while other calls keep running, up to
+    ``config.max_retries`` attempts per call (one when the client retries
+    instead, see ``config.retry_in_runner``). Each row records its
+    ``attempts`` and the ``backoff_s`` it spent waiting.
+
+    Progress (accuracy, error rate, latency and an ETA from the measured
+    throughput) goes to ``progress_listeners``: by default a live line on
+    stdout, plus a JSONL event file when ``config.progress_events`` is set.
+
+    With ``config.lpt_scheduling`` calls are dispatched longest predicted
+    latency first (see :class:`~src.latency_model.LatencyModel`), and
+    :attr:`schedule_report` compares the run's makespan with FIFO order.
+    With ``config.prefix_grouping`` calls whose prompts share a prefix run
+    back to back and :attr:`prefix_report` estimates the prompt evaluation
+    time this saved, per technique.
+    """
 
     def __init__(
         self,
@@ -29,12 +107,18 @@ class ExperimentRunner:
         client: LLMClient | None = None,
         data_path: str = "data/test_cases.csv",
         results_dir: str = "results",
+        max_workers: int = 1,
+        progress_listeners: list[ProgressListener] | None = None,
     ) -> None:
         """Initialize the experiment runner."""
         logger.info("Initializing ExperimentRunner")
-        logger.debug(f"Config: model={config.model_name}, runs_per_case={config.runs_per_case}")
+        logger.debug(
+            f"Config: model={config.model_name}, runs_per_case={config.runs_per_case}, "
+            f"max_workers={max_workers}"
+        )
 
         self.config = config
+        self.max_workers = max(1, max_workers)
         self.data_path = Path(data_path)
         self.results_dir = Path(results_dir)
 
@@ -43,10 +127,26 @@ class ExperimentRunner:
             self.client = client
             logger.debug("Using provided LLM client")
         else:
-            from .ollama_client import OllamaClient
-            self.client = OllamaClient(config, host=config.ollama_host)
-            logger.debug(f"Created OllamaClient with host={config.ollama_host}")
-
+            from .host_pool import create_ollama_client
+            self.client = create_ollama_client(config)
+            logger.debug(f"Created Ollama client for host(s) {config.ollama_host}")
+
+        if progress_listeners is None:
+            progress_listeners = [LineDisplay()]
+            if config.progress_events:
+                progress_listeners.append(JsonlEventWriter(config.progress_events))
+        self.progress_listeners = progress_listeners
+        self.progress: ProgressTracker | None = None
+        self.budget = TimeBudget()
+        self.schedule_report: dict | None = None
+        self._latency_model: LatencyModel | None = None
+        self._lpt_plan: LongestFirstPlan | None = None
+        self._prefix_groups: list[list] | None = None
+        # Prompt to its prefix group, for groups of two or more calls
+        self._prefix_group_of: dict[str, int] = {}
+        self.prefix_report: dict[str, dict] = {}
+
+        self._stop = threading.Event()
         self.evaluator = AnswerEvaluator()
         self.metrics_calc = MetricsCalculator()
         self._setup_directories()
@@ -58,17 +158,32 @@ class ExperimentRunner:
         (self.results_dir / "raw").mkdir(exist_ok=True)
         (self.results_dir / "stats").mkdir(exist_ok=True)
         (self.results_dir / "figures").mkdir(exist_ok=True)
+        (self.results_dir / "checkpoints").mkdir(exist_ok=True)
 
     def load_test_cases(self) -> pd.DataFrame:
         """Load test cases from CSV file."""
         return pd.read_csv(self.data_path)
 
-    def _run_single_case(
-        self, case: dict, prompt: str, run: int
-    ) -> dict:
-        """Run a single test case and return result dict."""
-        response = self.client.query(prompt)
+    def run_single_case(self, item: WorkItem) -> tuple[APIResponse, dict]:
+        """Run a single test case and return the response and result dict."""
+        with technique_scope(item.technique):
+            response = self.client.query(
+                item.prompt, options=item.options, run=item.run, stop_when=item.stop_when
+            )
+        return response, self._build_result(item, response)
+
+    async def _arun_single_case(self, item: WorkItem) -> tuple[APIResponse, dict]:
+        """Run a single test case through the async client."""
+        with technique_scope(item.technique):
+            response = await aquery_client(
+                self.client, item.prompt, options=item.options, run=item.run,
+                stop_when=item.stop_when,
+            )
+        return response, self._build_result(item, response)
 
+    def _build_result(self, item: WorkItem, response: APIResponse) -> dict:
+        """Evaluate a response and build the result row."""
+        case, prompt, run = item.case, item.prompt, item.run
         if response.success:
             is_correct, confidence = self.evaluator.evaluate(
                 response.text, str(case["expected_answer"]), case["answer_type"]
@@ -88,6 +203,13 @@ class ExperimentRunner:
             "confidence": confidence,
             "latency_ms": response.latency_ms,
             "success": response.success,
+            "cached": response.cached,
+            "coalesced": response.coalesced,
+            "hedged": response.hedged,
+            "host": response.host,
+            "early_stopped": response.early_stopped,
+            "budget_unused": response.budget_unused,
+            **response.timings(),
         }
 
     def run_technique(
@@ -95,64 +217,500 @@ class ExperimentRunner:
         technique_name: str,
         prompt_generator: Callable[[dict], str],
         test_cases: pd.DataFrame | None = None,
+        resume: bool = False,
     ) -> pd.DataFrame:
-        """Run a single prompt technique across all test cases."""
+        """
+        Run a single prompt technique across all test cases.
+
+        Every finished row is appended to ``results/checkpoints/<technique>.jsonl``
+        as it arrives. With ``resume`` the (case, run) items that already
+        succeeded for this model are loaded from there instead of re-run.
+        SIGINT/SIGTERM (or :meth:`request_stop`) stops dispatching, waits for
+        the calls in flight and raises ``RunInterrupted``. With
+        ``config.adaptive_runs`` the number of runs per case is chosen while
+        running (see :func:`~src.adaptive_sampling.run_adaptive`). With ``config.time_budget``
+        cases are run in stratified (category x difficulty) order and no
+        call starts once the budget is nearly spent; the rows finished by
+        then are returned and :attr:`budget_exhausted` is set.
+        """
         logger.info(f"Starting experiment: technique={technique_name}")
 
         if test_cases is None:
             test_cases = self.load_test_cases()
             logger.debug(f"Loaded {len(test_cases)} test cases from {self.data_path}")
 
+        self.begin_technique(technique_name)
+        if self.config.adaptive_runs:
+            return run_adaptive(self, technique_name, prompt_generator, test_cases, resume)
+        work = self.build_work_items(test_cases, prompt_generator)
         total_cases = len(test_cases)
-        total_calls = total_cases * self.config.runs_per_case
-        call_count = 0
+        total_calls = len(work)
+
+        logger.info(
+            f"Experiment plan: {total_cases} cases x {self.config.runs_per_case} runs "
+            f"= {total_calls} API calls"
+        )
+
+        store, results, pending = self.open_checkpoint(technique_name, work, resume)
+        progress = self.start_progress(technique_name, results)
+        if self.start_budget():
+            pending = stratified_indices(work, pending)
+        pending = self.plan_dispatch(pending, lambda index: (technique_name, work[index]))
+
+        def record(index: int, result: dict) -> None:
+            results[index] = result
+            store.append(result)
+            progress.record(result["correct"], result["success"], result["latency_ms"])
+            logger.debug(
+                f"Call {index}: case_id={result['id']}, run={result['run']}, "
+                f"correct={result['correct']}"
+            )
 
-        logger.info(f"Experiment plan: {total_cases} cases x {self.config.runs_per_case} runs = {total_calls} API calls")
+        started = time.monotonic()
+        try:
+            with self.graceful_stop():
+                self.dispatch(work, record, pending)
+        finally:
+            store.close()
+            self.finish_progress(progress)
+            self.report_dispatch(
+                {i: results[i] for i in pending}, self.max_workers, time.monotonic() - started,
+                lambda index: technique_name,
+            )
+        self.raise_if_stopped(technique_name, progress.completed, total_calls)
+        return self.save_results(technique_name, results)
+
+    def start_budget(self) -> bool:
+        """Start the ``config.time_budget`` clock, if set; return whether it is."""
+        return self.budget.start(self.config.time_budget)
+
+    @property
+    def budget_exhausted(self) -> bool:
+        """Whether the time budget ran out before every call was started."""
+        return self.budget.exhausted
+
+    def _out_of_time(self) -> bool:
+        """Return True once no new call should start within the time budget."""
+        if not self.budget.running:
+            return False
+        p95_ms = self.progress.histogram.percentile(95) if self.progress is not None else None
+        return self.budget.out_of_time(p95_ms)
+
+    def plan_dispatch(
+        self,
+        pending: list,
+        item_of: Callable[[Hashable], tuple[str, WorkItem]],
+        rounds: list[list] | None = None,
+    ) -> list:
+        """
+        Order the ``pending`` calls as configured, remembering the plan for :meth:`report_dispatch`.
+
+        ``item_of`` gives the technique and work item of a key of
+        ``pending``. With ``config.lpt_scheduling`` calls go longest
+        predicted latency first, only within each of ``rounds``
+        (consecutive slices of ``pending``) when given; with
+        ``config.prefix_grouping`` calls sharing a prompt prefix are then
+        gathered, and :meth:`dispatch` starts the rest of a group only once
+        its first call has returned. Under a running time budget the order
+        is kept as is.
+        """
+        self._lpt_plan = None
+        self._prefix_groups = None
+        self._prefix_group_of = {}
+        if self.budget.running:
+            return pending
+        if self.config.lpt_scheduling:
+            predicted = {}
+            for key in pending:
+                technique, item = item_of(key)
+                predicted[key] = self.latency_model.predict(technique, item.case)
+            self._lpt_plan = LongestFirstPlan(pending, predicted, rounds)
+            pending = self._lpt_plan.order
+        if self.config.prefix_grouping:
+            prompts = {key: item_of(key)[1].prompt for key in pending}
+            self._prefix_groups = group_order(pending, prompts)
+            self._prefix_group_of = {
+                prompts[key]: number
+                for number, group in enumerate(self._prefix_groups) if len(group) > 1
+                for key in group
+            }
+            pending = [key for group in self._prefix_groups for key in group]
+            if self._lpt_plan is not None:
+                self._lpt_plan.order = pending
+        return pending
+
+    def report_dispatch(
+        self, rows: dict, workers: int, wall_s: float, technique_of: Callable[[Hashable], str]
+    ) -> None:
+        """
+        Report how the last :meth:`plan_dispatch` order worked out.
+
+        ``rows`` maps every planned key to its result row (None for calls
+        never made). Fills :attr:`schedule_report` and, per technique
+        (``technique_of`` a key), :attr:`prefix_report`.
+        """
+        plan, self._lpt_plan = self._lpt_plan, None
+        latencies = {key: row["latency_ms"] for key, row in rows.items() if row is not None}
+        self.schedule_report = plan.report(latencies, workers, wall_s) if plan else None
+        groups, self._prefix_groups = self._prefix_groups, None
+        self._prefix_group_of = {}
+        if groups is None:
+            return
+        for technique in dict.fromkeys(map(technique_of, rows)):
+            own = [[key for key in group if technique_of(key) == technique] for group in groups]
+            self.prefix_report[technique] = report_prefix_cache(technique, own, rows)
+
+    def _prefix_gate(self, work: list[WorkItem]) -> PrefixGate:
+        """Gate holding back the later calls of the prefix groups last planned."""
+        group_of = self._prefix_group_of
+        return PrefixGate(lambda index: group_of.get(work[index].prompt))
+
+    @property
+    def latency_model(self) -> LatencyModel:
+        """Latency model built from the results under :attr:`results_dir` (loaded once)."""
+        if self._latency_model is None:
+            self._latency_model = LatencyModel.from_results(self.results_dir)
+        return self._latency_model
+
+    def request_stop(self) -> None:
+        """Stop starting new calls; the running technique drains and raises ``RunInterrupted``."""
+        self._stop.set()
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether a stop was requested (by :meth:`request_stop` or a signal)."""
+        return self._stop.is_set()
+
+    def graceful_stop(self):
+        """Context manager turning SIGINT/SIGTERM into :meth:`request_stop` while it is open."""
+        return stop_on_signals(self._stop)
+
+    def checkpoint_store(
+        self, technique_name: str, resume: bool
+    ) -> tuple[CheckpointStore, dict[tuple[str, int], dict]]:
+        """Open the technique's checkpoint; return it with the rows to reuse."""
+        self._stop.clear()
+        store = CheckpointStore(
+            str(self.results_dir / "checkpoints" / f"{technique_name}.jsonl"),
+            technique_name, self.config.model_name,
+        )
+        done = store.completed() if resume else {}
+        if not resume:
+            store.reset()
+        return store, done
+
+    def open_checkpoint(
+        self, technique_name: str, work: list[WorkItem], resume: bool
+    ) -> tuple[CheckpointStore, list[dict | None], list[int]]:
+        """Open the technique's checkpoint and split work into done rows and pending indices."""
+        store, done = self.checkpoint_store(technique_name, resume)
+        results: list[dict | None] = [None] * len(work)
+        pending = []
+        for index, item in enumerate(work):
+            row = done.get(checkpoint_key(item.case["id"], item.run))
+            if row is None:
+                pending.append(index)
+            else:
+                results[index] = row
+        if done:
+            loaded = len(work) - len(pending)
+            logger.info(f"Resuming {technique_name}: {loaded} of {len(work)} calls already done")
+            print(f"  Resuming: {loaded}/{len(work)} calls loaded from checkpoint")
+        return store, results, pending
+
+    def raise_if_stopped(self, technique_name: str, completed: int, total_calls: int) -> None:
+        """Raise ``RunInterrupted`` if the run was stopped before finishing."""
+        if self._stop.is_set() and completed < total_calls:
+            raise RunInterrupted(
+                f"{technique_name} stopped after {completed}/{total_calls} calls; "
+                f"rerun with resume to continue"
+            )
 
-        results = []
+    def dispatch(
+        self,
+        work: list[WorkItem],
+        record: Callable[[int, dict], None],
+        indices: list[int] | None = None,
+        skip: Callable[[int], bool] | None = None,
+    ) -> None:
+        """
+        Run the work items at ``indices`` (all by default), retrying failures.
+
+        Fresh items and items whose backoff has elapsed are started as worker
+        slots free up; an item waiting for its retry never occupies a slot.
+        Items (fresh or due for a retry) for which ``skip`` returns True
+        when they come up are dropped unrun. Calls of a prefix group
+        planned by :meth:`plan_dispatch` wait for the group's first call to
+        return. Once a stop is requested nothing new starts and only the
+        calls in flight are awaited. ``record`` and ``skip`` are only
+        called from this thread, so they need no lock.
+        """
+        retries = RetryScheduler.from_config(self.config)
+        fresh = deque(range(len(work)) if indices is None else indices)
+        gate = self._prefix_gate(work)
+        released: deque[int] = deque()
+
+        def next_index() -> int | None:
+            if self._stop.is_set() or self._out_of_time():
+                fresh.clear()
+                released.clear()
+                retries.clear()
+                return None
+            while (ready := retries.pop_ready()) is not None:
+                if skip is None or not skip(ready):
+                    return ready
+            while released:
+                index = released.popleft()
+                if skip is None or not skip(index):
+                    return index
+            while fresh:
+                index = fresh.popleft()
+                if (skip is None or not skip(index)) and gate.admit(index):
+                    return index
+            return None
+
+        def settle(index: int, response: APIResponse, result: dict) -> None:
+            released.extend(gate.release(index))
+            if retries.should_retry(index, response):
+                delay = retries.defer(index, response.retry_after)
+                logger.info(
+                    f"Call {index} failed ({str(response.error)[:50]}); retrying in {delay:.1f}s"
+                )
+                return
+            record(index, {**result, **retries.summary(index)})
+
+        if self.max_workers == 1:
+            while fresh or released or retries:
+                index = next_index()
+                if index is None:
+                    if retries:
+                        time.sleep(retries.time_until_next())
+                    continue
+                retries.start(index)
+                settle(index, *self.run_single_case(work[index]))
+            return
+
+        logger.info(f"Dispatching calls over {self.max_workers} worker threads")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while fresh or released or retries or running:
+                while len(running) < self.max_workers and (index := next_index()) is not None:
+                    retries.start(index)
+                    running[pool.submit(self.run_single_case, work[index])] = index
+                if not running:
+                    if retries:
+                        time.sleep(retries.time_until_next())
+                    continue
+                done, _ = wait(
+                    running, timeout=retries.time_until_next(), return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    settle(running.pop(future), *future.result())
+
+    async def arun_technique(
+        self,
+        technique_name: str,
+        prompt_generator: Callable[[dict], str],
+        test_cases: pd.DataFrame | None = None,
+        concurrency: int | None = None,
+        resume: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Run a technique with up to ``concurrency`` requests in flight.
+
+        Clients implementing ``AsyncLLMClient`` are awaited directly; plain
+        ``LLMClient`` calls run in worker threads. Rows are written in
+        the same (case, run) order as :meth:`run_technique` regardless of the
+        order in which responses arrive. Checkpointing, ``resume`` and
+        stopping work as in :meth:`run_technique`.
+        """
+        concurrency = max(1, concurrency or self.config.max_concurrency)
+        logger.info(
+            f"Starting async experiment: technique={technique_name}, concurrency={concurrency}"
+        )
+
+        if test_cases is None:
+            test_cases = self.load_test_cases()
+            logger.debug(f"Loaded {len(test_cases)} test cases from {self.data_path}")
+
+        self.begin_technique(technique_name)
+        work = self.build_work_items(test_cases, prompt_generator)
+        total_cases = len(test_cases)
+        total_calls = len(work)
+        logger.info(
+            f"Experiment plan: {total_cases} cases x {self.config.runs_per_case} runs "
+            f"= {total_calls} API calls"
+        )
+
+        store, results, pending = self.open_checkpoint(technique_name, work, resume)
+        semaphore = asyncio.Semaphore(concurrency)
+        retries = RetryScheduler.from_config(self.config)
+        progress = self.start_progress(technique_name, results)
+        if self.start_budget():
+            pending = stratified_indices(work, pending)
+        pending = self.plan_dispatch(pending, lambda index: (technique_name, work[index]))
+
+        gate = self._prefix_gate(work)
+        held: dict[int, asyncio.Event] = {}
+
+        def release(index: int) -> None:
+            for key in gate.release(index):
+                held.pop(key).set()
+
+        async def run_item(index: int) -> None:
+            if not gate.admit(index):
+                held[index] = asyncio.Event()
+                await held[index].wait()
+            while True:
+                async with semaphore:
+                    if self._stop.is_set() or self._out_of_time():
+                        release(index)
+                        return
+                    retries.start(index)
+                    response, result = await self._arun_single_case(work[index])
+                release(index)
+                if not retries.should_retry(index, response):
+                    break
+                # Back off without holding a slot, so other items keep flowing
+                delay = retries.backoff(index, response.retry_after)
+                logger.info(
+                    f"Call {index} failed ({str(response.error)[:50]}); retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            result.update(retries.summary(index))
+            results[index] = result
+            store.append(result)
+            progress.record(result["correct"], result["success"], result["latency_ms"])
+
+        started = time.monotonic()
+        try:
+            with self.graceful_stop():
+                await asyncio.gather(*(run_item(i) for i in pending))
+        finally:
+            store.close()
+            self.finish_progress(progress)
+            self.report_dispatch(
+                {i: results[i] for i in pending}, concurrency, time.monotonic() - started,
+                lambda index: technique_name,
+            )
+        self.raise_if_stopped(technique_name, progress.completed, total_calls)
+        return self.save_results(technique_name, results)
+
+    def generation_options(self, prompt_generator: Callable[[dict], str]) -> dict:
+        """
+        Resolve the generation options for a technique.
+
+        The technique's ``GENERATION_OPTIONS`` (when ``prompt_generator`` is a
+        ``BasePromptGenerator`` or its bound ``generate`` method) are
+        overridden by any option set explicitly in ``Config``.
+        """
+        return resolve_generation_options(self.config, prompt_generator)
+
+    def begin_technique(self, technique_name: str) -> None:
+        """Tell clients keeping per-technique state (e.g. hedging) which technique runs."""
+        self.reset_reports()
+        begin = getattr(self.client, "begin_technique", None)
+        if begin is not None:
+            begin(technique_name)
+
+    def reset_reports(self) -> None:
+        """Forget the dispatch reports of the previous run."""
+        self.schedule_report = None
+        self.prefix_report = {}
+
+    def build_work_items(
+        self, test_cases: pd.DataFrame, prompt_generator: Callable[[dict], str]
+    ) -> list[WorkItem]:
+        """Expand test cases into ordered (case, run) work items."""
+        return [
+            replace(template, run=run)
+            for template in self.case_templates(test_cases, prompt_generator)
+            for run in range(1, self.config.runs_per_case + 1)
+        ]
+
+    def case_templates(
+        self, test_cases: pd.DataFrame, prompt_generator: Callable[[dict], str]
+    ) -> list[WorkItem]:
+        """Build one run-1 work item per case, to be copied for each run."""
+        if isinstance(prompt_generator, BasePromptGenerator):
+            prompt_generator = prompt_generator.generate
+        generator = getattr(prompt_generator, "__self__", None)
+        options = self.generation_options(prompt_generator)
+        logger.debug(f"Generation options: {options}")
+        work = []
         for idx, (_, case) in enumerate(test_cases.iterrows()):
             case_dict = case.to_dict()
             prompt = prompt_generator(case_dict)
-            logger.debug(f"Processing case {idx+1}/{total_cases}: id={case_dict.get('id')}, category={case_dict.get('category')}")
-
-            for run in range(1, self.config.runs_per_case + 1):
-                call_count += 1
-                result = self._run_single_case(case_dict, prompt, run)
-                results.append(result)
-
-                logger.debug(f"Call {call_count}: case_id={case_dict.get('id')}, run={run}, correct={result['correct']}")
-
-                # Progress update every 10 calls
-                if call_count % 10 == 0 or call_count == total_calls:
-                    correct_count = sum(1 for r in results if r["correct"])
-                    accuracy = correct_count / len(results) * 100
-                    logger.info(f"Progress: [{call_count}/{total_calls}] accuracy={accuracy:.1f}%")
-                    print(f"  [{call_count}/{total_calls}] Case {idx+1}/{total_cases}, "
-                          f"Running accuracy: {accuracy:.1f}%")
-
-        results_df = pd.DataFrame(results)
+            stop_when = None
+            if self.config.early_stop and isinstance(generator, BasePromptGenerator):
+                stop_when = generator.answer_detector(case_dict)
+            logger.debug(
+                f"Prepared case {idx+1}/{len(test_cases)}: id={case_dict.get('id')}, "
+                f"category={case_dict.get('category')}"
+            )
+            work.append(WorkItem(case_dict, prompt, 1, options, stop_when))
+        return work
+
+    def start_progress(self, technique_name: str, results: list[dict | None]) -> ProgressTracker:
+        """Create the technique's progress tracker, counting rows loaded on resume."""
+        progress = ProgressTracker(len(results), technique_name, self.progress_listeners)
+        loaded = [row for row in results if row is not None]
+        progress.preload(
+            correct=sum(row["correct"] for row in loaded),
+            errors=sum(not row["success"] for row in loaded),
+            count=len(loaded),
+        )
+        self.progress = progress
+        return progress
+
+    def finish_progress(self, progress: ProgressTracker) -> None:
+        """Send the final progress event and log the technique's summary."""
+        event = progress.finish()
+        logger.info(
+            f"Progress: [{event.completed}/{event.total}] accuracy={event.accuracy:.1%} "
+            f"errors={event.error_rate:.1%} throughput={event.throughput_rps:.2f} calls/s"
+        )
+
+    def save_results(self, technique_name: str, results: list[dict | None]) -> pd.DataFrame:
+        """Write ordered result rows (skipping calls never made) to the raw results CSV."""
+        results_df = pd.DataFrame([row for row in results if row is not None])
         output_path = self.results_dir / "raw" / f"{technique_name}_results.csv"
         results_df.to_csv(output_path, index=False)
 
+        if results_df.empty:
+            logger.warning(
+                f"Experiment complete: technique={technique_name}, no calls finished, "
+                f"saved to {output_path}"
+            )
+            return results_df
         final_accuracy = results_df["correct"].mean() * 100
-        logger.info(f"Experiment complete: technique={technique_name}, accuracy={final_accuracy:.1f}%, saved to {output_path}")
+        logger.info(
+            f"Experiment complete: technique={technique_name}, accuracy={final_accuracy:.1f}%, "
+            f"saved to {output_path}"
+        )
 
         return results_df
 
     def run_all_techniques(
-        self, technique_generators: dict[str, Callable[[dict], str]]
+        self,
+        technique_generators: dict[str, Callable[[dict], str]],
+        ordering: str | None = None,
+        resume: bool = False,
     ) -> dict[str, pd.DataFrame]:
-        """Run all prompt techniques and collect results."""
-        test_cases = self.load_test_cases()
-        all_results = {}
-
-        for technique_name, generator in technique_generators.items():
-            results = self.run_technique(technique_name, generator, test_cases)
-            all_results[technique_name] = results
-
+        """
+        Run all prompt techniques as one session and collect results.
+
+        Calls of all techniques share one work queue, in the ``ordering``
+        (default ``config.session_ordering``) registered in
+        ``session_scheduler.ORDERINGS``.
+        """
+        scheduler = SessionScheduler(self, ordering or self.config.session_ordering)
+        return scheduler.run(technique_generators, resume=resume)
+
+    def save_comparison(self, all_results: dict[str, pd.DataFrame]) -> dict:
+        """Write comparison statistics across techniques."""
         stats = self.metrics_calc.generate_comparison_stats(all_results)
         stats_path = self.results_dir / "stats" / "comparison_stats.json"
         with open(stats_path, "w") as f:
             json.dump(stats, f, indent=2)
-
-        return all_results
+        return stats
@@ -0,0 +1,343 @@
+"""Hedged requests: duplicate slow calls and keep whichever answers first."""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from .client_utils import aquery_client, current_technique
+from .config import Config
+from .ollama_client import APIResponse, StopCondition
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """
+    Rolling window of recent call latencies.
+
+    Parameters
+    ----------
+    size : int
+        Number of most recent latencies kept.
+    min_samples : int
+        Samples required before a quantile is reported.
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20) -> None:
+        """Initialize an empty window."""
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, latency_ms: float) -> None:
+        """Record a latency in milliseconds."""
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def quantile(self, q: float) -> float | None:
+        """Return the ``q`` quantile in milliseconds, or None until warmed up."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            return float(np.quantile(list(self._samples), q))
+
+
+@dataclass
+class HedgingStats:
+    """
+    Hedging counters and latencies for one technique.
+
+    Attributes
+    ----------
+    calls : int
+        Calls sent through the hedging client.
+    hedges : int
+        Duplicate requests fired.
+    hedge_wins : int
+        Calls answered by the duplicate rather than the original.
+    latencies_ms : list of float
+        Latency seen by the caller for each successful call.
+    saved_ms : list of float
+        Estimated latency the original would still have needed, per call
+        (0 unless the duplicate won).
+    """
+
+    calls: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    saved_ms: list[float] = field(default_factory=list)
+
+    def report(self) -> dict:
+        """
+        Summarize the load added and the tail latency removed.
+
+        ``unhedged_p95_ms``/``unhedged_p99_ms`` are the quantiles had every
+        call waited for its original request, estimated by adding back the
+        decode time the cancelled original still lacked. They are lower
+        bounds: time the original would have spent queued is not counted.
+        """
+        report = {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "extra_load_pct": 100 * self.hedges / self.calls if self.calls else 0.0,
+        }
+        if self.latencies_ms:
+            observed = np.array(self.latencies_ms)
+            unhedged = observed + np.array(self.saved_ms)
+            for q in (95, 99):
+                report[f"p{q}_ms"] = float(np.percentile(observed, q))
+                report[f"unhedged_p{q}_ms"] = float(np.percentile(unhedged, q))
+            report["tail_removed_ms"] = report["unhedged_p99_ms"] - report["p99_ms"]
+        return report
+
+
+class _CancelOnSignal:
+    """Stop condition that also ends the stream once the call has lost."""
+
+    def __init__(self, stop_when: StopCondition | None) -> None:
+        self.stop_when = stop_when
+        self.cancelled = threading.Event()
+        self.received_chars = 0
+
+    def __call__(self, text: str) -> bool:
+        self.received_chars = len(text)
+        if self.cancelled.is_set():
+            return True
+        return self.stop_when is not None and self.stop_when(text)
+
+
+def _in_thread(query, prompt: str, **kwargs) -> Future:
+    """Run ``query(prompt, **kwargs)`` on a thread of its own; return a future of the response."""
+    future: Future = Future()
+    # Wrapped clients still see the caller's technique
+    context = contextvars.copy_context()
+
+    def run() -> None:
+        try:
+            future.set_result(query(prompt, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=context.run, args=(run,), name="hedge", daemon=True).start()
+    return future
+
+
+def _remaining_ms(winner: APIResponse, loser: _CancelOnSignal) -> float:
+    """Estimate how long the cancelled original still needed to finish."""
+    decode_ms = winner.latency_ms - (winner.ttft_ms or 0.0)
+    if not winner.text:
+        return 0.0
+    progress = min(loser.received_chars / len(winner.text), 1.0)
+    return max(decode_ms * (1 - progress), 0.0)
+
+
+class HedgingClient:
+    """
+    ``LLMClient`` wrapper that duplicates calls slower than the recent p95.
+
+    When a call has not answered within the ``hedge_quantile`` of the
+    technique's recent latencies, a duplicate is sent (to ``secondary`` if
+    given, otherwise to the same client). The first successful response is
+    returned at once and the other request is cancelled in the background:
+    hedged calls are streamed, and the loser's stream is closed at its next
+    chunk. At most ``hedge_max_extra`` of the calls may be hedged.
+    Latencies are timed from the call to its return, as the caller sees
+    them. Calls tagged with a technique (see
+    :func:`~src.client_utils.technique_scope`) use that technique's window
+    and counters; untagged calls use those of :meth:`begin_technique`.
+
+    Parameters
+    ----------
+    client : LLMClient
+        Client for the original request.
+    config : Config
+        Configuration providing the hedging settings.
+    secondary : LLMClient, optional
+        Client for duplicates, e.g. one bound to a second host.
+    """
+
+    def __init__(self, client, config: Config, secondary=None) -> None:
+        """Wrap ``client``."""
+        self.client = client
+        self.secondary = secondary or client
+        self.quantile = config.hedge_quantile
+        self.max_extra = config.hedge_max_extra
+        self.min_samples = config.hedge_min_samples
+        self.technique = "default"
+        self.windows: dict[str, LatencyWindow] = {}
+        self.stats: dict[str, HedgingStats] = {}
+        self._lock = threading.Lock()
+        self.begin_technique(self.technique)
+
+    def __getattr__(self, name: str):
+        """Delegate unknown attributes to the wrapped client."""
+        return getattr(self.client, name)
+
+    def begin_technique(self, name: str) -> None:
+        """Switch to the latency window and counters of technique ``name``."""
+        with self._lock:
+            self.technique = name
+            self._track(name)
+        begin = getattr(self.client, "begin_technique", None)
+        if begin is not None:
+            begin(name)
+
+    def report(self, name: str | None = None) -> dict:
+        """Return the hedging report of a technique (the current one by default)."""
+        return self.stats[name or self.technique].report()
+
+    def close(self) -> None:
+        """Close the wrapped client."""
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+    def _track(self, name: str) -> None:
+        """Create the window and counters of technique ``name`` (lock held)."""
+        self.windows.setdefault(name, LatencyWindow(min_samples=self.min_samples))
+        self.stats.setdefault(name, HedgingStats())
+
+    def _hedge_after(self) -> tuple[str, float | None]:
+        """Count a call; return its technique and the hedge delay in seconds."""
+        with self._lock:
+            technique = current_technique() or self.technique
+            self._track(technique)
+            self.stats[technique].calls += 1
+            threshold_ms = self.windows[technique].quantile(self.quantile)
+        return technique, None if threshold_ms is None else threshold_ms / 1000
+
+    def _take_hedge_slot(self, technique: str) -> bool:
+        """Reserve one duplicate if the extra-load budget allows it."""
+        with self._lock:
+            stats = self.stats[technique]
+            if stats.hedges + 1 > self.max_extra * stats.calls:
+                return False
+            stats.hedges += 1
+            return True
+
+    def _record(
+        self,
+        technique: str,
+        response: APIResponse,
+        started: float,
+        hedge_won: bool = False,
+        saved_ms: float = 0.0,
+    ) -> APIResponse:
+        """Time a finished call from ``started`` (``time.perf_counter``) and record it."""
+        response = replace(
+            response, latency_ms=(time.perf_counter() - started) * 1000, hedged=hedge_won
+        )
+        if response.success:
+            with self._lock:
+                stats = self.stats[technique]
+                stats.latencies_ms.append(response.latency_ms)
+                stats.saved_ms.append(saved_ms)
+                stats.hedge_wins += hedge_won
+            self.windows[technique].add(response.latency_ms)
+        return response
+
+    def query(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+        **kwargs,
+    ) -> APIResponse:
+        """
+        Send the request and hedge it if it runs past the latency threshold.
+
+        Once the window is warmed up the original and the duplicate each run
+        on a thread of their own, so neither waits for a free worker and the
+        hedge delay counts from the original's start. The caller gets the
+        first successful response; the other request is told to stop and
+        finishes in the background.
+        """
+        started = time.perf_counter()
+        technique, delay = self._hedge_after()
+        if delay is None:
+            response = self.client.query(
+                prompt, options=options, run=run, stop_when=stop_when, **kwargs
+            )
+            return self._record(technique, response, started)
+
+        primary_stop = _CancelOnSignal(stop_when)
+        primary = _in_thread(
+            self.client.query, prompt, options=options, run=run, stop_when=primary_stop, **kwargs
+        )
+        stops = {primary: primary_stop}
+        if not wait([primary], timeout=delay).done and self._take_hedge_slot(technique):
+            logger.debug(f"Hedging run {run} after {delay * 1000:.0f}ms")
+            hedge_stop = _CancelOnSignal(stop_when)
+            hedge = _in_thread(
+                self.secondary.query, prompt, options=options, run=run, stop_when=hedge_stop,
+                **kwargs,
+            )
+            stops[hedge] = hedge_stop
+        pending, winner = set(stops), None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.result().success), None)
+        for future, stop in stops.items():
+            if future is not winner:
+                stop.cancelled.set()
+        if winner is None or winner is primary:
+            return self._record(technique, primary.result(), started)
+        response = winner.result()
+        saved_ms = _remaining_ms(response, primary_stop)
+        return self._record(technique, response, started, True, saved_ms)
+
+    async def aquery(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+        **kwargs,
+    ) -> APIResponse:
+        """Async variant of :meth:`query`; the losing task is cancelled."""
+        started = time.perf_counter()
+        technique, delay = self._hedge_after()
+        primary_stop = _CancelOnSignal(stop_when)
+        primary = asyncio.ensure_future(aquery_client(
+            self.client, prompt, options=options, run=run,
+            stop_when=stop_when if delay is None else primary_stop, **kwargs,
+        ))
+        if delay is None:
+            return self._record(technique, await primary, started)
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._take_hedge_slot(technique):
+            return self._record(technique, await primary, started)
+
+        hedge_stop = _CancelOnSignal(stop_when)
+        hedge = asyncio.ensure_future(aquery_client(
+            self.secondary, prompt, options=options, run=run, stop_when=hedge_stop, **kwargs
+        ))
+        pending = {primary, hedge}
+        winner = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.result().success), None)
+        # Sync clients run in threads, which only notice the signal, not the cancel
+        primary_stop.cancelled.set()
+        hedge_stop.cancelled.set()
+        for task in pending:
+            task.cancel()
+        if winner is hedge:
+            response = hedge.result()
+            saved_ms = _remaining_ms(response, primary_stop)
+            return self._record(technique, response, started, True, saved_ms)
+        return self._record(technique, primary.result(), started)
@@ -0,0 +1,274 @@
+"""Load balancing of LLM calls over several Ollama hosts."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from .config import Config
+from .ollama_client import APIResponse, ConnectionStats, OllamaClient
+from .prefix_groups import MIN_SHARED_PREFIX, shared_prefix_length
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Balancing policies accepted by ``Config.load_balancing``
+BALANCING_POLICIES = ("least_outstanding", "latency")
+
+
+@dataclass
+class HostState:
+    """
+    Routing and circuit-breaker state of one host.
+
+    Attributes
+    ----------
+    client : OllamaClient
+        Client bound to the host.
+    outstanding : int
+        Requests currently in flight on the host.
+    ewma_ms : float, optional
+        Exponentially weighted moving average of successful call latency.
+    failures : int
+        Consecutive failed calls.
+    ejected_until : float
+        Monotonic time until which the breaker is open (0 when closed).
+    served : int
+        Successful calls served by the host.
+    last_prompt : str
+        Prompt most recently sent to the host.
+    """
+
+    client: OllamaClient
+    outstanding: int = 0
+    ewma_ms: float | None = None
+    failures: int = 0
+    ejected_until: float = 0.0
+    served: int = 0
+    last_prompt: str = ""
+
+    @property
+    def host(self) -> str:
+        """URL of the host."""
+        return self.client.host
+
+
+class OllamaPoolClient:
+    """
+    ``LLMClient`` spreading calls over several Ollama hosts.
+
+    Each call goes to the host chosen by ``config.load_balancing``:
+    ``"least_outstanding"`` picks the host with the fewest requests in
+    flight, ``"latency"`` the one with the lowest expected wait (latency
+    EWMA times queued requests). After ``breaker_failures`` consecutive
+    failures a host is ejected for ``breaker_cooldown`` seconds and only
+    readmitted once it passes an ``/api/tags`` health check. Responses
+    record the host that served them. With ``config.prefix_grouping`` a
+    prompt sharing a long prefix with the last prompt of a host goes to
+    that host, whose prompt cache still holds the prefix, unless it has
+    more than ``AFFINITY_SLACK`` requests in flight beyond the chosen host.
+
+    Parameters
+    ----------
+    config : Config
+        Configuration instance with settings.
+    hosts : list of str, optional
+        Host URLs. Defaults to ``config.hosts()``.
+    """
+
+    # Weight of the newest sample in the latency EWMA
+    EWMA_ALPHA = 0.3
+    # Extra requests in flight accepted to keep a prompt on its prefix's host
+    AFFINITY_SLACK = 1
+
+    def __init__(self, config: Config, hosts: list[str] | None = None) -> None:
+        """Create one pooled client per host."""
+        hosts = hosts or config.hosts()
+        if not hosts:
+            raise ValueError("OllamaPoolClient needs at least one host")
+        if config.load_balancing not in BALANCING_POLICIES:
+            raise ValueError(
+                f"Unknown load balancing policy {config.load_balancing!r}; "
+                f"expected one of {BALANCING_POLICIES}"
+            )
+        self.config = config
+        self.model = config.model_name
+        self.policy = config.load_balancing
+        self.members = [HostState(OllamaClient(config, host=host)) for host in hosts]
+        self._lock = threading.Lock()
+        logger.info(f"OllamaPoolClient initialized: hosts={hosts}, policy={self.policy}")
+
+    def __enter__(self) -> "OllamaPoolClient":
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close every host's session when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        for member in self.members:
+            member.client.close()
+
+    @property
+    def hosts(self) -> list[str]:
+        """URLs of all hosts in the pool."""
+        return [member.host for member in self.members]
+
+    def _cost(self, member: HostState) -> float:
+        """Routing cost of a host under the configured policy."""
+        if self.policy == "latency":
+            # Unmeasured hosts look free so each gets sampled early on
+            return (member.ewma_ms or 0.0) * (member.outstanding + 1)
+        return member.outstanding
+
+    def _readmit(self, member: HostState) -> bool:
+        """Health-check an ejected host whose cooldown has passed."""
+        if not member.client.is_healthy():
+            with self._lock:
+                member.ejected_until = time.monotonic() + self.config.breaker_cooldown
+            return False
+        with self._lock:
+            member.ejected_until = 0.0
+            member.failures = 0
+        logger.info(f"Host {member.host} passed its health check; readmitted")
+        return True
+
+    def _acquire(self, prompt: str = "") -> HostState:
+        """Pick a host for ``prompt`` and count the request as outstanding on it."""
+        now = time.monotonic()
+        with self._lock:
+            probe = [m for m in self.members if 0 < m.ejected_until <= now]
+        for member in probe:
+            self._readmit(member)
+
+        with self._lock:
+            candidates = [m for m in self.members if m.ejected_until == 0.0]
+            if not candidates:
+                # Every breaker is open: try the host that comes back soonest
+                candidates = [min(self.members, key=lambda m: m.ejected_until)]
+            member = min(candidates, key=self._cost)
+            if self.config.prefix_grouping:
+                affine = [
+                    m for m in candidates
+                    if m.outstanding <= member.outstanding + self.AFFINITY_SLACK
+                    and shared_prefix_length(m.last_prompt, prompt) >= MIN_SHARED_PREFIX
+                ]
+                if affine:
+                    member = min(affine, key=self._cost)
+            member.outstanding += 1
+            member.last_prompt = prompt
+        return member
+
+    def _release(self, member: HostState, response: APIResponse) -> None:
+        """Update load, latency and breaker state after a call."""
+        with self._lock:
+            member.outstanding -= 1
+            if response.success:
+                member.failures = 0
+                member.served += 1
+                if member.ewma_ms is None:
+                    member.ewma_ms = response.latency_ms
+                else:
+                    member.ewma_ms += self.EWMA_ALPHA * (response.latency_ms - member.ewma_ms)
+                return
+            member.failures += 1
+            if member.failures >= self.config.breaker_failures and member.ejected_until == 0.0:
+                member.ejected_until = time.monotonic() + self.config.breaker_cooldown
+                logger.warning(
+                    f"Ejecting host {member.host} for {self.config.breaker_cooldown:.0f}s "
+                    f"after {member.failures} consecutive failures"
+                )
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        """Send the prompt to the chosen host; see :meth:`OllamaClient.query`."""
+        member = self._acquire(prompt)
+        try:
+            response = member.client.query(prompt, **kwargs)
+        except Exception:
+            self._release(member, APIResponse(text="", latency_ms=0.0, success=False))
+            raise
+        self._release(member, response)
+        return replace(response, host=member.host)
+
+    def check_health(self) -> dict[str, bool]:
+        """Health-check every host, ejecting those that fail."""
+        health = {}
+        for member in self.members:
+            healthy = member.client.is_healthy()
+            with self._lock:
+                if healthy:
+                    member.ejected_until = 0.0
+                    member.failures = 0
+                elif member.ejected_until == 0.0:
+                    member.ejected_until = time.monotonic() + self.config.breaker_cooldown
+            health[member.host] = healthy
+        return health
+
+    def host_stats(self) -> dict[str, dict]:
+        """Per-host calls served, latency EWMA and breaker state."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                m.host: {
+                    "served": m.served,
+                    "ewma_ms": m.ewma_ms,
+                    "ejected": m.ejected_until > now,
+                }
+                for m in self.members
+            }
+
+    def connection_stats(self) -> ConnectionStats:
+        """Connection reuse summed over all hosts."""
+        stats = [member.client.connection_stats() for member in self.members]
+        return ConnectionStats(
+            requests=sum(s.requests for s in stats),
+            connections_opened=sum(s.connections_opened for s in stats),
+        )
+
+    def list_models(self) -> list[str]:
+        """List the models of the first host that answers."""
+        for member in self.members:
+            models = member.client.list_models()
+            if models:
+                return models
+        return []
+
+    def model_digest(self) -> str | None:
+        """Return the model digest reported by the first host that has it."""
+        for member in self.members:
+            digest = member.client.model_digest()
+            if digest:
+                return digest
+        return None
+
+    def warm_up(self, keep_alive: str | int | None = None) -> APIResponse:
+        """Load the model on every host; return the slowest (or first failed) warm-up."""
+        responses = [member.client.warm_up(keep_alive) for member in self.members]
+        failed = [r for r in responses if not r.success]
+        return failed[0] if failed else max(responses, key=lambda r: r.latency_ms)
+
+    def unload(self) -> bool:
+        """Evict the model on every host."""
+        return all([member.client.unload() for member in self.members])
+
+
+def create_ollama_client(config: Config) -> OllamaClient | OllamaPoolClient:
+    """
+    Build the client for the configured host(s).
+
+    Parameters
+    ----------
+    config : Config
+        Configuration whose ``ollama_host`` may list several hosts.
+
+    Returns
+    -------
+    OllamaClient or OllamaPoolClient
+        A plain client for one host, a load-balancing pool for several.
+    """
+    hosts = config.hosts()
+    if len(hosts) > 1:
+        return OllamaPoolClient(config, hosts)
+    return OllamaClient(config, host=hosts[0] if hosts else None)
@@ -0,0 +1,210 @@
+"""Latency prediction from past results and longest-first (LPT) dispatch order."""
+
+import heapq
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Prediction used when no history matches at all
+DEFAULT_LATENCY_MS = 5000.0
+
+# Results columns read as latency history; ``cached`` is also read when present
+HISTORY_COLUMNS = ("id", "category", "difficulty", "latency_ms", "success")
+
+
+class LatencyModel:
+    """
+    Predict a call's latency from the latencies of earlier runs.
+
+    The prediction is the median successful ``latency_ms`` of the most
+    specific group with enough history: the same (technique, case), then
+    (technique, category, difficulty), (technique, category), the technique,
+    and finally all rows. Rows served from the response cache replay the
+    latency of the call that filled the cache, so they are left out.
+
+    Parameters
+    ----------
+    history : pd.DataFrame
+        Result rows with ``technique``, ``id``, ``category``,
+        ``difficulty``, ``latency_ms`` and ``success`` columns, and
+        optionally ``cached``.
+    min_samples : int
+        Rows a group needs (except the per-case group) to be used.
+    """
+
+    LEVELS = (
+        ("technique", "id"),
+        ("technique", "category", "difficulty"),
+        ("technique", "category"),
+        ("technique",),
+    )
+
+    def __init__(self, history: pd.DataFrame, min_samples: int = 3) -> None:
+        """Index the medians of every grouping level."""
+        self.min_samples = min_samples
+        ok = history
+        if not history.empty:
+            measured = history["success"].astype(bool)
+            if "cached" in history.columns:
+                measured &= ~history["cached"].fillna(False).astype(bool)
+            ok = history[measured]
+        self.global_ms = float(ok["latency_ms"].median()) if not ok.empty else DEFAULT_LATENCY_MS
+        self.medians: list[dict[tuple, float]] = []
+        for level, keys in enumerate(self.LEVELS):
+            if ok.empty:
+                self.medians.append({})
+                continue
+            grouped = ok.groupby(list(keys))["latency_ms"].agg(["median", "size"])
+            needed = 1 if level == 0 else min_samples
+            grouped = grouped[grouped["size"] >= needed]
+            self.medians.append({
+                (key if isinstance(key, tuple) else (key,)): float(row["median"])
+                for key, row in grouped.iterrows()
+            })
+
+    @classmethod
+    def from_results(cls, results_dir: str | Path = "results") -> "LatencyModel":
+        """
+        Build a model from the ``*_results.csv`` files of earlier runs.
+
+        Reads ``<results_dir>/<technique>_results.csv`` and
+        ``<results_dir>/raw/<technique>_results.csv``; the technique is taken
+        from the file name. Missing or unreadable files are skipped.
+        """
+        results_dir = Path(results_dir)
+        frames = []
+        paths = sorted(results_dir.glob("*_results.csv"))
+        paths += sorted(results_dir.glob("raw/*_results.csv"))
+        columns = HISTORY_COLUMNS + ("cached",)
+        for path in paths:
+            try:
+                frame = pd.read_csv(path, usecols=lambda column: column in columns)
+            except (ValueError, OSError, pd.errors.ParserError) as e:
+                logger.debug(f"Skipping latency history {path}: {e}")
+                continue
+            if not set(HISTORY_COLUMNS) <= set(frame.columns):
+                logger.debug(f"Skipping latency history {path}: missing columns")
+                continue
+            frames.append(frame.assign(technique=path.name.removesuffix("_results.csv")))
+        history = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=["technique", *HISTORY_COLUMNS]
+        )
+        logger.info(f"Latency model built from {len(history)} rows in {len(frames)} files")
+        return cls(history)
+
+    def predict(self, technique: str, case: dict) -> float:
+        """Predicted latency in milliseconds of one call of ``technique`` on ``case``."""
+        values = {"technique": technique, **case}
+        for keys, medians in zip(self.LEVELS, self.medians):
+            key = tuple(values.get(k) for k in keys)
+            if key in medians:
+                return medians[key]
+        return self.global_ms
+
+
+def lpt_order(keys: list, predicted_ms: dict) -> list:
+    """Order work item ``keys`` longest predicted latency first (stable for ties)."""
+    return sorted(keys, key=lambda key: -predicted_ms[key])
+
+
+def simulate_makespan(durations: list[float], workers: int) -> float:
+    """
+    Makespan of dispatching ``durations`` in order to ``workers`` slots.
+
+    Each call starts on the slot that frees up first, as the runner's
+    worker pool does.
+    """
+    slots = [0.0] * max(1, workers)
+    for duration in durations:
+        heapq.heappush(slots, heapq.heappop(slots) + duration)
+    return max(slots)
+
+
+def makespan_report(
+    fifo: list,
+    dispatched: list,
+    predicted_ms: dict[int, float],
+    actual_ms: dict[int, float],
+    workers: int,
+    wall_s: float,
+) -> dict:
+    """
+    Compare the makespan of the dispatch order with FIFO order.
+
+    Both orders are replayed with the predicted and with the measured
+    latencies of the calls that ran, on the same number of workers.
+
+    Parameters
+    ----------
+    fifo : list
+        Work item keys (indices or slots) in FIFO order.
+    dispatched : list
+        The same keys in the order they were dispatched.
+    predicted_ms, actual_ms : dict
+        Predicted and measured latency per work item.
+    workers : int
+        Calls in flight at once.
+    wall_s : float
+        Measured wall time of the run.
+
+    Returns
+    -------
+    dict
+        Predicted and replayed makespans in seconds for both orders, the
+        replayed saving, and the measured wall time.
+    """
+    ran_fifo = [key for key in fifo if key in actual_ms]
+    ran_dispatched = [key for key in dispatched if key in actual_ms]
+    replayed_fifo = simulate_makespan([actual_ms[i] / 1000 for i in ran_fifo], workers)
+    replayed = simulate_makespan([actual_ms[i] / 1000 for i in ran_dispatched], workers)
+    return {
+        "workers": workers,
+        "predicted_fifo_s": simulate_makespan([predicted_ms[i] / 1000 for i in fifo], workers),
+        "predicted_s": simulate_makespan([predicted_ms[i] / 1000 for i in dispatched], workers),
+        "replayed_fifo_s": replayed_fifo,
+        "replayed_s": replayed,
+        "replayed_saving_pct": (1 - replayed / replayed_fifo) * 100 if replayed_fifo else 0.0,
+        "wall_s": wall_s,
+    }
+
+
+class LongestFirstPlan:
+    """
+    Longest-first order of a run's pending calls, kept to report its makespan.
+
+    Parameters
+    ----------
+    pending : list
+        Work item keys (indices or slots) in FIFO order.
+    predicted_ms : dict
+        Predicted latency per key.
+    rounds : list of list, optional
+        Consecutive slices of ``pending``; calls are then only reordered
+        within their round, so the coarse order is kept.
+    """
+
+    def __init__(self, pending: list, predicted_ms: dict, rounds: list[list] | None = None) -> None:
+        """Order ``pending`` longest predicted latency first."""
+        self.fifo = list(pending)
+        self.predicted_ms = predicted_ms
+        self.order = [
+            key for keys in (rounds or [pending]) for key in lpt_order(keys, predicted_ms)
+        ]
+
+    def report(self, latencies_ms: dict, workers: int, wall_s: float) -> dict:
+        """Compare the dispatched order with FIFO order (:func:`makespan_report`) and print it."""
+        report = makespan_report(
+            self.fifo, self.order, self.predicted_ms, latencies_ms, workers, wall_s
+        )
+        logger.info(f"Schedule report: {report}")
+        print(
+            f"  Longest-first: makespan {report['replayed_s']:.1f}s vs "
+            f"{report['replayed_fifo_s']:.1f}s in FIFO order "
+            f"({report['replayed_saving_pct']:.1f}% saved, {workers} workers; "
+            f"wall time {wall_s:.1f}s)"
+        )
+        return report
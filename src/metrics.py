@@ -5,6 +5,8 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from .stratification import STRATA_KEYS, stratum_of
+
 
 @dataclass
 class TechniqueMetrics:
@@ -20,18 +22,26 @@ class TechniqueMetrics:
 class MetricsCalculator:
     """Calculator for experiment metrics and statistics."""
 
-    def calculate_metrics(self, scores: list[int | float]) -> TechniqueMetrics:
-        """Calculate metrics from a list of correctness scores."""
+    def calculate_metrics(
+        self, scores: list[int | float], weights: list[float] | None = None
+    ) -> TechniqueMetrics:
+        """
+        Calculate metrics from a list of correctness scores.
+
+        With ``weights`` the mean and variance are weighted, e.g. by
+        :meth:`case_weights` so that every case counts once however many
+        runs it got.
+        """
         if not scores:
             return TechniqueMetrics(
                 accuracy=0.0, mean=0.0, variance=0.0, std_dev=0.0, count=0
             )
 
-        scores_array = np.array(scores)
+        scores_array = np.array(scores, dtype=float)
         count = len(scores_array)
-        mean = float(np.mean(scores_array))
-        variance = float(np.var(scores_array))
-        std_dev = float(np.std(scores_array))
+        mean = float(np.average(scores_array, weights=weights))
+        variance = float(np.average((scores_array - mean) ** 2, weights=weights))
+        std_dev = float(np.sqrt(variance))
 
         return TechniqueMetrics(
             accuracy=mean,
@@ -41,6 +51,126 @@ class MetricsCalculator:
             count=count,
         )
 
+    def case_weights(self, df: pd.DataFrame) -> list[float] | None:
+        """
+        Weight each row by one over its case's number of runs.
+
+        With the same runs for every case this equals unweighted metrics;
+        with adaptive runs it stops cases that were sampled more often from
+        dominating. Returns None when rows carry no case ``id``.
+        """
+        if "id" not in df.columns:
+            return None
+        return (1.0 / df.groupby("id")["id"].transform("size")).tolist()
+
+    def calculate_case_metrics(
+        self, df: pd.DataFrame, score_column: str = "correct"
+    ) -> TechniqueMetrics:
+        """Calculate metrics of result rows with every case weighted equally."""
+        return self.calculate_metrics(df[score_column].tolist(), self.case_weights(df))
+
+    def calculate_consistency(
+        self, df: pd.DataFrame, score_column: str = "correct"
+    ) -> dict:
+        """
+        Measure how consistently cases are answered across runs.
+
+        Returns the number of cases, the mean runs per case, the share of
+        cases with at least two runs whose verdicts disagree (``flip_rate``)
+        and the pooled within-case variance, in which each case's unbiased
+        variance is weighted by its degrees of freedom (runs - 1).
+        """
+        if df.empty or "id" not in df.columns:
+            return {"cases": 0, "mean_runs": 0.0, "flip_rate": 0.0, "within_case_variance": 0.0}
+        per_case = df.groupby("id")[score_column].agg(["size", "var"])
+        repeated = per_case[per_case["size"] >= 2]
+        dof = (repeated["size"] - 1).sum()
+        pooled = float(((repeated["size"] - 1) * repeated["var"]).sum() / dof) if dof else 0.0
+        return {
+            "cases": int(len(per_case)),
+            "mean_runs": float(per_case["size"].mean()),
+            "flip_rate": float((repeated["var"] > 0).mean()) if len(repeated) else 0.0,
+            "within_case_variance": pooled,
+        }
+
+    def stratum_coverage(
+        self, df: pd.DataFrame, test_cases: pd.DataFrame, keys: tuple[str, ...] = STRATA_KEYS
+    ) -> dict[str, dict]:
+        """
+        Count the finished cases of every stratum of the test set.
+
+        Returns
+        -------
+        dict
+            Stratum label to ``cases`` in the test set, ``finished_cases``
+            with at least one result row, and their ratio ``coverage``.
+        """
+        finished = set(df["id"]) if "id" in df.columns else set()
+        coverage = {}
+        for case in test_cases.to_dict("records"):
+            entry = coverage.setdefault(stratum_of(case, keys), {"cases": 0, "finished_cases": 0})
+            entry["cases"] += 1
+            entry["finished_cases"] += int(case["id"] in finished)
+        for entry in coverage.values():
+            entry["coverage"] = entry["finished_cases"] / entry["cases"]
+        return coverage
+
+    def calculate_stratified_metrics(
+        self,
+        df: pd.DataFrame,
+        test_cases: pd.DataFrame,
+        keys: tuple[str, ...] = STRATA_KEYS,
+        score_column: str = "correct",
+    ) -> dict:
+        """
+        Estimate accuracy over the whole test set from a partial run.
+
+        Each stratum's case-level accuracy is weighted by its share of the
+        test set (post-stratification), so strata that finished more cases
+        do not dominate. The standard error includes the finite population
+        correction. Strata without any finished case cannot be estimated;
+        the weights of the covered strata are renormalized and their share
+        of the test set is reported as ``population_share_covered``.
+
+        Returns
+        -------
+        dict
+            ``accuracy``, ``std_error``, ``strata_covered``,
+            ``strata_total`` and ``population_share_covered``.
+        """
+        population = test_cases.assign(
+            _stratum=[stratum_of(case, keys) for case in test_cases.to_dict("records")]
+        )
+        sizes = population.groupby("_stratum").size()
+        case_scores = (
+            df.groupby("id")[score_column].mean() if not df.empty else pd.Series(dtype=float)
+        )
+        estimate = variance = covered_share = 0.0
+        covered = 0
+        for stratum, ids in population.groupby("_stratum")["id"]:
+            scores = case_scores[case_scores.index.isin(ids)]
+            if scores.empty:
+                continue
+            covered += 1
+            weight = sizes[stratum] / len(population)
+            covered_share += weight
+            estimate += weight * scores.mean()
+            if len(scores) > 1:
+                fpc = 1 - len(scores) / sizes[stratum]
+                variance += weight ** 2 * scores.var(ddof=1) / len(scores) * fpc
+        if covered_share == 0:
+            return {
+                "accuracy": 0.0, "std_error": 0.0, "strata_covered": 0,
+                "strata_total": int(len(sizes)), "population_share_covered": 0.0,
+            }
+        return {
+            "accuracy": float(estimate / covered_share),
+            "std_error": float(np.sqrt(variance) / covered_share),
+            "strata_covered": covered,
+            "strata_total": int(len(sizes)),
+            "population_share_covered": float(covered_share),
+        }
+
     def calculate_improvement(
         self, baseline_accuracy: float, technique_accuracy: float
     ) -> float:
@@ -56,8 +186,7 @@ class MetricsCalculator:
         results = {}
         for category in df["category"].unique():
             category_df = df[df["category"] == category]
-            scores = category_df[score_column].tolist()
-            results[category] = self.calculate_metrics(scores)
+            results[category] = self.calculate_case_metrics(category_df, score_column)
         return results
 
     def aggregate_by_difficulty(
@@ -67,8 +196,7 @@ class MetricsCalculator:
         results = {}
         for difficulty in df["difficulty"].unique():
             difficulty_df = df[df["difficulty"] == difficulty]
-            scores = difficulty_df[score_column].tolist()
-            results[int(difficulty)] = self.calculate_metrics(scores)
+            results[int(difficulty)] = self.calculate_case_metrics(difficulty_df, score_column)
         return results
 
     def generate_comparison_stats(self, results: dict[str, pd.DataFrame]) -> dict:
@@ -82,8 +210,7 @@ class MetricsCalculator:
         baseline_accuracy = 0.0
 
         for technique, df in results.items():
-            scores = df["correct"].tolist()
-            metrics = self.calculate_metrics(scores)
+            metrics = self.calculate_case_metrics(df)
 
             if technique == "baseline":
                 baseline_accuracy = metrics.accuracy
@@ -1,17 +1,38 @@
 """Ollama API client wrapper with retry logic and latency tracking."""
 
+import json
 import logging
 import time
 
 import requests
 from dataclasses import dataclass
+from typing import Callable
+from requests.adapters import HTTPAdapter
 
 from .config import Config
+from .rate_limiter import THROTTLE_STATUSES, TokenBucketLimiter, parse_retry_after
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
 
+# Server-side timing fields reported by Ollama in the final response object
+SERVER_TIMING_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+# Per-call timing columns written alongside latency_ms in the results CSVs
+TIMING_COLUMNS = ("ttft_ms", "inter_token_ms", "tokens_per_sec") + SERVER_TIMING_FIELDS
+
+# Callback deciding from the text streamed so far whether to stop generating
+StopCondition = Callable[[str], bool]
+
+
 @dataclass
 class APIResponse:
     """
@@ -27,35 +48,394 @@ class APIResponse:
         Whether the API call was successful.
     error : str, optional
         Error message if the call failed.
+    ttft_ms : float, optional
+        Time to the first generated token in milliseconds (streaming only).
+    inter_token_ms : float, optional
+        Mean gap between streamed tokens in milliseconds (streaming only).
+    tokens_per_sec : float, optional
+        Decode throughput, from ``eval_count / eval_duration`` when reported.
+    total_duration, load_duration, prompt_eval_duration, eval_duration : int, optional
+        Ollama's server-side timings in nanoseconds.
+    prompt_eval_count, eval_count : int, optional
+        Number of prompt tokens evaluated and tokens generated.
+    cached : bool
+        Whether the response was served from a response cache.
+    coalesced : bool
+        Whether the response was shared from an identical in-flight request.
+    hedged : bool
+        Whether the response came from a hedged duplicate request.
+    host : str, optional
+        Ollama host that served (or failed) the call.
+    early_stopped : bool
+        Whether the stream was closed as soon as the final answer appeared.
+    budget_unused : int, optional
+        Unused ``num_predict`` budget at the point the stream was closed.
+        This bounds the tokens saved from above; the model may have ended
+        its reply sooner on its own.
+    status_code : int, optional
+        HTTP status of the last failed attempt.
+    retry_after : float, optional
+        Seconds the server asked us to wait (``Retry-After``) on failure.
     """
 
     text: str
     latency_ms: float
     success: bool
     error: str | None = None
+    ttft_ms: float | None = None
+    inter_token_ms: float | None = None
+    tokens_per_sec: float | None = None
+    total_duration: int | None = None
+    load_duration: int | None = None
+    prompt_eval_count: int | None = None
+    prompt_eval_duration: int | None = None
+    eval_count: int | None = None
+    eval_duration: int | None = None
+    cached: bool = False
+    coalesced: bool = False
+    hedged: bool = False
+    host: str | None = None
+    early_stopped: bool = False
+    budget_unused: int | None = None
+    status_code: int | None = None
+    retry_after: float | None = None
+
+    def timings(self) -> dict:
+        """Return the timing columns for a results row."""
+        return {name: getattr(self, name) for name in TIMING_COLUMNS}
+
+
+def server_timings(result: dict) -> dict:
+    """
+    Extract Ollama's server-side timing fields from a final response object.
+
+    Parameters
+    ----------
+    result : dict
+        Final (``done``) JSON object returned by ``/api/generate``.
+
+    Returns
+    -------
+    dict
+        Timing fields plus ``tokens_per_sec`` derived from the eval counters.
+    """
+    timings = {name: result.get(name) for name in SERVER_TIMING_FIELDS}
+    if timings["eval_count"] and timings["eval_duration"]:
+        timings["tokens_per_sec"] = timings["eval_count"] / (timings["eval_duration"] / 1e9)
+    return timings
+
+
+class StreamAccumulator:
+    """
+    Collect an NDJSON ``/api/generate`` stream into an ``APIResponse``.
+
+    Chunks are fed in arrival order together with the ``time.perf_counter()``
+    reading taken when they arrived, relative to ``start_time``.
+
+    Parameters
+    ----------
+    start_time : float
+        ``time.perf_counter()`` reading taken when the request was sent.
+    stop_when : StopCondition, optional
+        Called with the text so far after each token; once it returns True
+        :meth:`feed` asks the caller to close the stream.
+    num_predict : int, optional
+        Token budget of the request, used to report ``budget_unused``.
+    """
+
+    def __init__(
+        self,
+        start_time: float,
+        stop_when: StopCondition | None = None,
+        num_predict: int | None = None,
+    ) -> None:
+        """Initialize an empty accumulator."""
+        self.start_time = start_time
+        self.stop_when = stop_when
+        self.num_predict = num_predict
+        self.parts: list[str] = []
+        self.token_times: list[float] = []
+        self.final: dict | None = None
+        self.error: str | None = None
+        self.early_stopped = False
+
+    @property
+    def text(self) -> str:
+        """Text generated so far."""
+        return "".join(self.parts)
+
+    def feed(self, chunk: dict, now: float) -> bool:
+        """
+        Add one decoded stream chunk received at ``now``.
+
+        Returns
+        -------
+        bool
+            True if the caller should stop reading, because the stream is
+            done, reported an error, or the stop condition was met.
+        """
+        if "error" in chunk:
+            self.error = str(chunk["error"])
+            return True
+        token = chunk.get("response", "")
+        if token:
+            self.parts.append(token)
+            self.token_times.append(now)
+        if chunk.get("done"):
+            self.final = chunk
+            return True
+        if token and self.stop_when is not None and self.stop_when(self.text):
+            self.early_stopped = True
+            return True
+        return False
+
+    def to_response(self, end_time: float) -> APIResponse:
+        """Build the response once the stream has finished."""
+        latency_ms = (end_time - self.start_time) * 1000
+        if self.error is not None:
+            return APIResponse(text="", latency_ms=latency_ms, success=False, error=self.error)
+
+        ttft_ms = inter_token_ms = tokens_per_sec = None
+        if self.token_times:
+            ttft_ms = (self.token_times[0] - self.start_time) * 1000
+            decode_s = self.token_times[-1] - self.token_times[0]
+            if len(self.token_times) > 1:
+                inter_token_ms = decode_s * 1000 / (len(self.token_times) - 1)
+                if decode_s > 0:
+                    tokens_per_sec = (len(self.token_times) - 1) / decode_s
+
+        response = APIResponse(
+            text=self.text.strip(),
+            latency_ms=latency_ms,
+            success=True,
+            ttft_ms=ttft_ms,
+            inter_token_ms=inter_token_ms,
+            tokens_per_sec=tokens_per_sec,
+            early_stopped=self.early_stopped,
+        )
+        if self.early_stopped and self.num_predict:
+            response.budget_unused = max(self.num_predict - len(self.token_times), 0)
+        # Prefer the server's own decode rate over the client-side estimate
+        for name, value in server_timings(self.final or {}).items():
+            if value is not None:
+                setattr(response, name, value)
+        return response
+
+
+def build_generate_payload(
+    model: str,
+    prompt: str,
+    stream: bool = False,
+    options: dict | None = None,
+    keep_alive: str | int | None = None,
+) -> dict:
+    """
+    Build the JSON body for an Ollama ``/api/generate`` request.
+
+    Parameters
+    ----------
+    model : str
+        Name of the Ollama model.
+    prompt : str
+        The prompt to send to the model.
+    stream : bool
+        Whether to ask for an NDJSON chunk stream.
+    options : dict, optional
+        Generation options such as ``temperature`` or ``seed``.
+    keep_alive : str or int, optional
+        How long the server keeps the model loaded after this request.
+
+    Returns
+    -------
+    dict
+        Request body shared by the sync and async clients.
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+    }
+    if options:
+        payload["options"] = options
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Connection reuse counters for the client's HTTP session.
+
+    Attributes
+    ----------
+    requests : int
+        Number of HTTP requests sent through the session.
+    connections_opened : int
+        Number of new TCP connections that had to be established.
+    """
+
+    requests: int
+    connections_opened: int
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests served over an already open keep-alive connection."""
+        return max(self.requests - self.connections_opened, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests that reused an existing connection."""
+        return self.connections_reused / self.requests if self.requests else 0.0
 
 
 class OllamaClient:
     """
     Client for interacting with the Ollama API.
 
+    The client owns a pooled keep-alive ``requests.Session`` sized from the
+    configuration, so consecutive calls reuse TCP connections instead of
+    opening a new one per prompt. One instance can be shared by worker threads.
+    Every attempt first takes a token from the rate limiter, which backs off
+    when the server answers 429/503.
+
     Parameters
     ----------
     config : Config
         Configuration instance with settings.
     host : str
         Ollama host URL. For WSL accessing Windows Ollama, use the Windows host IP.
+    limiter : TokenBucketLimiter, optional
+        Limiter to share with other clients. Defaults to one built from
+        ``request_delay`` and the backoff settings in ``config``.
     """
 
-    def __init__(self, config: Config, host: str | None = None) -> None:
+    def __init__(
+        self,
+        config: Config,
+        host: str | None = None,
+        limiter: TokenBucketLimiter | None = None,
+    ) -> None:
         """Initialize the Ollama client with configuration."""
         self.config = config
         # Default to localhost, but WSL needs Windows host IP
         self.host = host or "http://localhost:11434"
         self.model = config.model_name
-        logger.info(f"OllamaClient initialized: host={self.host}, model={self.model}")
+        self.timeout = (config.connect_timeout, config.read_timeout)
+        self.limiter = limiter or TokenBucketLimiter.from_config(config)
+        self._adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        logger.info(
+            f"OllamaClient initialized: host={self.host}, model={self.model}, "
+            f"pool_maxsize={config.pool_maxsize}, timeout={self.timeout}"
+        )
+
+    def __enter__(self) -> "OllamaClient":
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the session when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def connection_stats(self) -> ConnectionStats:
+        """
+        Report how many requests reused a pooled connection.
 
-    def query(self, prompt: str) -> APIResponse:
+        Returns
+        -------
+        ConnectionStats
+            Request and new-connection counts summed over all host pools.
+        """
+        pools = self._adapter.poolmanager.pools
+        requests_sent = connections_opened = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        return ConnectionStats(requests=requests_sent, connections_opened=connections_opened)
+
+    def _payload(self, prompt: str, options: dict | None = None, stream: bool = False) -> dict:
+        """Build the JSON body for an ``/api/generate`` request."""
+        return build_generate_payload(
+            self.model, prompt, stream=stream, options=options,
+            keep_alive=self.config.keep_alive,
+        )
+
+    def warm_up(self, keep_alive: str | int | None = None) -> APIResponse:
+        """
+        Load the model into memory before the first timed call.
+
+        Sends an empty prompt, which makes Ollama load the model without
+        generating anything, so model load time is not charged to the first
+        experiment call.
+
+        Parameters
+        ----------
+        keep_alive : str or int, optional
+            How long to keep the model loaded afterwards (``-1`` keeps it
+            resident). Defaults to ``config.keep_alive``.
+
+        Returns
+        -------
+        APIResponse
+            ``latency_ms`` is the warm-up wall time and ``load_duration`` the
+            server-reported load time in nanoseconds.
+        """
+        keep_alive = self.config.keep_alive if keep_alive is None else keep_alive
+        payload = build_generate_payload(self.model, "", keep_alive=keep_alive)
+        logger.info(f"Warming up model {self.model} (keep_alive={keep_alive})")
+        start_time = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.host}/api/generate", json=payload, timeout=self.timeout
+            )
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            if response.status_code == 200:
+                return APIResponse(
+                    text="", latency_ms=latency_ms, success=True,
+                    **server_timings(response.json()),
+                )
+            error = f"HTTP {response.status_code}: {response.text}"
+        except requests.exceptions.RequestException as e:
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            error = str(e)
+        logger.warning(f"Warm-up failed: {error}")
+        return APIResponse(text="", latency_ms=latency_ms, success=False, error=error)
+
+    def unload(self) -> bool:
+        """Ask Ollama to evict the model from memory now."""
+        return self.warm_up(keep_alive=0).success
+
+    def _read_stream(
+        self, response: requests.Response, accumulator: StreamAccumulator
+    ) -> APIResponse:
+        """Consume an NDJSON chunk stream, timing each token as it arrives."""
+        for line in response.iter_lines():
+            if line and accumulator.feed(json.loads(line), time.perf_counter()):
+                break
+        return accumulator.to_response(time.perf_counter())
+
+    def query(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+    ) -> APIResponse:
         """
         Send a prompt to Ollama and get a response.
 
@@ -63,46 +443,88 @@ class OllamaClient:
         ----------
         prompt : str
             The prompt to send to the model.
+        options : dict, optional
+            Generation options passed through to Ollama. Defaults to the
+            options configured in ``Config``.
+        run : int
+            Run index of the call. Not sent to Ollama; wrappers such as the
+            response cache use it to keep repeated runs apart.
+        stop_when : StopCondition, optional
+            Stream the generation and close it as soon as this returns True
+            for the text received so far.
 
         Returns
         -------
         APIResponse
             Response containing text, latency, and success status.
         """
+        if options is None:
+            options = self.config.generation_options()
+        stream = self.config.stream or stop_when is not None
         last_error = None
-        prompt_preview = prompt[:100].replace('\n', ' ') + '...' if len(prompt) > 100 else prompt.replace('\n', ' ')
+        attempts = self.config.client_attempts()
+        status_code = retry_after = None
+        prompt_preview = prompt.replace('\n', ' ')
+        if len(prompt_preview) > 100:
+            prompt_preview = prompt_preview[:100] + '...'
         logger.debug(f"API call starting: prompt_length={len(prompt)}, preview='{prompt_preview}'")
 
-        for attempt in range(self.config.max_retries):
+        for attempt in range(attempts):
             try:
-                logger.debug(f"Attempt {attempt + 1}/{self.config.max_retries}")
+                logger.debug(f"Attempt {attempt + 1}/{attempts}")
+                throttled = False
+                self.limiter.acquire()
                 start_time = time.perf_counter()
 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.host}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                    },
-                    timeout=120,  # 2 minute timeout for slower local models
+                    json=self._payload(prompt, options, stream),
+                    timeout=self.timeout,
+                    stream=stream,
                 )
 
-                end_time = time.perf_counter()
-                latency_ms = (end_time - start_time) * 1000
-
-                if response.status_code == 200:
+                if response.status_code == 200 and stream:
+                    accumulator = StreamAccumulator(
+                        start_time, stop_when, options.get("num_predict")
+                    )
+                    # Closing early drops the connection, which makes Ollama stop decoding
+                    with response:
+                        api_response = self._read_stream(response, accumulator)
+                    api_response.host = self.host
+                    if api_response.success:
+                        logger.debug(
+                            f"API call success: latency={api_response.latency_ms:.0f}ms, "
+                            f"ttft={api_response.ttft_ms}ms"
+                        )
+                        self.limiter.reward()
+                        return api_response
+                    last_error = api_response.error
+                    logger.warning(f"API stream failed: {last_error}")
+                elif response.status_code == 200:
                     result = response.json()
+                    latency_ms = (time.perf_counter() - start_time) * 1000
                     response_text = result.get("response", "").strip()
-                    logger.debug(f"API call success: latency={latency_ms:.0f}ms, response_length={len(response_text)}")
+                    logger.debug(
+                        f"API call success: latency={latency_ms:.0f}ms, "
+                        f"response_length={len(response_text)}"
+                    )
+                    self.limiter.reward()
                     return APIResponse(
                         text=response_text,
                         latency_ms=latency_ms,
                         success=True,
+                        host=self.host,
+                        **server_timings(result),
                     )
                 else:
                     last_error = f"HTTP {response.status_code}: {response.text}"
+                    status_code = response.status_code
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
                     logger.warning(f"API call failed: {last_error}")
+                    if status_code in THROTTLE_STATUSES:
+                        # The limiter pauses every caller, so no extra sleep here
+                        self.limiter.penalize(retry_after)
+                        throttled = True
 
             except requests.exceptions.ConnectionError as e:
                 last_error = f"Connection error: {str(e)}"
@@ -112,36 +534,62 @@ class OllamaClient:
             except requests.exceptions.Timeout:
                 last_error = "Request timed out"
                 logger.error(f"Request timeout on attempt {attempt + 1}")
-                print(f"  Timeout on attempt {attempt + 1}/{self.config.max_retries}")
+                print(f"  Timeout on attempt {attempt + 1}/{attempts}")
 
             except Exception as e:
                 last_error = str(e)
                 logger.error(f"Unexpected error: {e}")
 
-            if attempt < self.config.max_retries - 1:
+            if attempt < attempts - 1 and not throttled:
                 wait_time = self.config.retry_delay * (attempt + 1)
                 logger.info(f"Retrying in {wait_time:.0f}s after error: {str(last_error)[:50]}")
                 print(f"  Error: {str(last_error)[:50]}... retrying in {wait_time:.0f}s")
                 time.sleep(wait_time)
 
-        logger.error(f"All {self.config.max_retries} attempts failed: {last_error}")
+        logger.error(f"All {attempts} attempts failed: {last_error}")
         return APIResponse(
             text="",
             latency_ms=0.0,
             success=False,
             error=last_error,
+            host=self.host,
+            status_code=status_code,
+            retry_after=retry_after,
         )
 
-    def list_models(self) -> list[str]:
-        """List available models from Ollama."""
-        logger.debug(f"Fetching available models from {self.host}")
+    def _fetch_tags(self) -> list[dict]:
+        """Fetch the model entries reported by ``/api/tags``."""
         try:
-            response = requests.get(f"{self.host}/api/tags", timeout=10)
+            response = self.session.get(
+                f"{self.host}/api/tags", timeout=(self.config.connect_timeout, 10)
+            )
             if response.status_code == 200:
-                models = response.json().get("models", [])
-                model_names = [m["name"] for m in models]
-                logger.debug(f"Found {len(model_names)} models: {model_names}")
-                return model_names
+                return response.json().get("models", [])
         except Exception as e:
             logger.warning(f"Failed to list models: {e}")
         return []
+
+    def is_healthy(self) -> bool:
+        """Return True if the server answers ``/api/tags``."""
+        try:
+            response = self.session.get(
+                f"{self.host}/api/tags", timeout=(self.config.connect_timeout, 10)
+            )
+            return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Health check of {self.host} failed: {e}")
+            return False
+
+    def list_models(self) -> list[str]:
+        """List available models from Ollama."""
+        logger.debug(f"Fetching available models from {self.host}")
+        model_names = [m["name"] for m in self._fetch_tags()]
+        logger.debug(f"Found {len(model_names)} models: {model_names}")
+        return model_names
+
+    def model_digest(self) -> str | None:
+        """Return the digest of the configured model, or None if unavailable."""
+        for entry in self._fetch_tags():
+            if entry.get("name") == self.model or entry.get("model") == self.model:
+                return entry.get("digest")
+        return None
@@ -0,0 +1,193 @@
+"""Grouping of prompts that share a prefix, so the server can reuse its prompt cache."""
+
+import logging
+import os
+from collections.abc import Hashable
+from typing import Callable
+
+import pandas as pd
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Shared characters that make two prompts worth running back to back
+MIN_SHARED_PREFIX = 64
+
+
+def shared_prefix_length(first: str, second: str) -> int:
+    """Number of leading characters ``first`` and ``second`` have in common."""
+    return len(os.path.commonprefix([first, second]))
+
+
+def prefix_groups(prompts: dict[Hashable, str], min_chars: int = MIN_SHARED_PREFIX) -> list[list]:
+    """
+    Group work items whose prompts share at least ``min_chars`` leading characters.
+
+    Prompts are sorted so that shared prefixes become neighbours; a group
+    is a run of neighbours each sharing ``min_chars`` with the next. In
+    sorted order that bound holds for every pair in the group.
+
+    Parameters
+    ----------
+    prompts : dict
+        Work item key (index or slot) to its prompt.
+    min_chars : int
+        Shared prefix length needed to join a group.
+
+    Returns
+    -------
+    list of list
+        Keys of each group, in sorted prompt order.
+    """
+    groups: list[list] = []
+    for key in sorted(prompts, key=prompts.__getitem__):
+        if groups and shared_prefix_length(prompts[groups[-1][-1]], prompts[key]) >= min_chars:
+            groups[-1].append(key)
+        else:
+            groups.append([key])
+    return groups
+
+
+def group_order(
+    order: list, prompts: dict[Hashable, str], min_chars: int = MIN_SHARED_PREFIX
+) -> list[list]:
+    """
+    Gather ``order`` into prefix groups dispatched back to back.
+
+    A group starts where its first member appeared in ``order`` and keeps
+    its members in their ``order`` sequence, so an order such as
+    longest-first still decides which group goes first.
+
+    Returns
+    -------
+    list of list
+        Groups in dispatch order; flattening them gives the new order.
+    """
+    position = {key: i for i, key in enumerate(order)}
+    groups = [
+        sorted(group, key=position.__getitem__) for group in prefix_groups(prompts, min_chars)
+    ]
+    groups.sort(key=lambda group: position[group[0]])
+    shared = [group for group in groups if len(group) > 1]
+    logger.info(
+        f"Prefix grouping: {sum(map(len, shared))} of {len(order)} calls in {len(shared)} groups"
+    )
+    return groups
+
+
+class PrefixGate:
+    """
+    Hold a prefix group's later calls back until its first call has returned.
+
+    Calls of a group started together would each evaluate the shared
+    prefix, none finding it in the server's cache yet. The first call of
+    each group is let through on its own; the rest are held and released
+    once it returns, and may then run in parallel.
+
+    Parameters
+    ----------
+    group_of : callable
+        Maps a call's key to its group, or to None for calls not in a
+        group of two or more (never held).
+    """
+
+    def __init__(self, group_of: Callable[[Hashable], Hashable | None]) -> None:
+        """Start with no group opened."""
+        self.group_of = group_of
+        self._leaders: dict[Hashable, Hashable] = {}
+        self._held: dict[Hashable, list] = {}
+        self._opened: set = set()
+
+    def admit(self, key: Hashable) -> bool:
+        """Return whether call ``key`` may start now; otherwise hold it."""
+        group = self.group_of(key)
+        if group is None or group in self._opened:
+            return True
+        if group in self._held:
+            self._held[group].append(key)
+            return False
+        self._held[group] = []
+        self._leaders[key] = group
+        return True
+
+    def release(self, key: Hashable) -> list:
+        """Record that call ``key`` returned; return the held calls it frees."""
+        group = self._leaders.pop(key, None)
+        if group is None:
+            return []
+        self._opened.add(group)
+        return self._held.pop(group)
+
+
+def prefix_cache_report(groups: list[list], rows: dict) -> dict:
+    """
+    Estimate the prompt evaluation a grouped run saved.
+
+    The first call of each group pays for evaluating the shared prefix;
+    later calls should find it in the server's cache. The saving is the
+    difference of their mean ``prompt_eval_duration`` times the number of
+    later calls, over groups of at least two calls with server timings.
+
+    Parameters
+    ----------
+    groups : list of list
+        Groups in dispatch order, as returned by :func:`group_order`.
+    rows : dict
+        Work item key to its result row (missing for calls never made).
+
+    Returns
+    -------
+    dict
+        Group and call counts, mean prompt evaluation of first and later
+        calls in milliseconds, the estimated saving, and the share of
+        latency spent in prompt evaluation.
+    """
+    first, later = [], []
+    for group in groups:
+        timed = [rows[key] for key in group if _prompt_eval_ms(rows.get(key)) is not None]
+        if len(timed) >= 2:
+            first.append(timed[0])
+            later.extend(timed[1:])
+    first_ms = [_prompt_eval_ms(row) for row in first]
+    later_ms = [_prompt_eval_ms(row) for row in later]
+    timed_rows = first + later
+    report = {
+        "groups": len(first),
+        "grouped_calls": len(timed_rows),
+        "first_prompt_eval_ms": sum(first_ms) / len(first_ms) if first_ms else None,
+        "later_prompt_eval_ms": sum(later_ms) / len(later_ms) if later_ms else None,
+        "prompt_eval_saved_ms": 0.0,
+        "prompt_eval_share": None,
+    }
+    if first_ms and later_ms:
+        saved = (report["first_prompt_eval_ms"] - report["later_prompt_eval_ms"]) * len(later_ms)
+        report["prompt_eval_saved_ms"] = max(0.0, saved)
+    latency = sum(row["latency_ms"] for row in timed_rows)
+    if latency:
+        report["prompt_eval_share"] = (sum(first_ms) + sum(later_ms)) / latency
+    return report
+
+
+def report_prefix_cache(technique_name: str, groups: list[list], rows: dict) -> dict:
+    """Compute a technique's :func:`prefix_cache_report`, then log and print it."""
+    report = prefix_cache_report(groups, rows)
+    logger.info(f"Prefix cache report for {technique_name}: {report}")
+    if report["later_prompt_eval_ms"] is not None:
+        print(
+            f"  Prefix cache ({technique_name}): prompt eval "
+            f"{report['first_prompt_eval_ms']:.0f}ms first in group vs "
+            f"{report['later_prompt_eval_ms']:.0f}ms after, "
+            f"~{report['prompt_eval_saved_ms'] / 1000:.1f}s saved over "
+            f"{report['grouped_calls']} calls"
+        )
+    return report
+
+
+def _prompt_eval_ms(row: dict | None) -> float | None:
+    """Server prompt evaluation time of a row in milliseconds, if reported."""
+    if row is None or not row.get("success"):
+        return None
+    duration = row.get("prompt_eval_duration")
+    if duration is None or pd.isna(duration):
+        return None
+    return duration / 1e6
@@ -0,0 +1,324 @@
+"""Live progress tracking with constant-cost incremental statistics."""
+
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, TextIO
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with constant memory.
+
+    Buckets grow by ``ratio`` from ``min_ms``, so any percentile is known to
+    within ``ratio - 1`` relative error however many samples are added.
+
+    Parameters
+    ----------
+    min_ms : float
+        Upper edge of the first bucket.
+    max_ms : float
+        Latencies above this land in the last bucket.
+    ratio : float
+        Growth factor between bucket edges.
+    """
+
+    def __init__(
+        self, min_ms: float = 1.0, max_ms: float = 3_600_000.0, ratio: float = 1.05
+    ) -> None:
+        """Create empty buckets."""
+        self.min_ms = min_ms
+        self.log_ratio = math.log(ratio)
+        self.counts = [0] * (int(math.log(max_ms / min_ms) / self.log_ratio) + 2)
+        self.total = 0
+
+    def _bucket(self, value_ms: float) -> int:
+        if value_ms <= self.min_ms:
+            return 0
+        index = int(math.log(value_ms / self.min_ms) / self.log_ratio) + 1
+        return min(index, len(self.counts) - 1)
+
+    def add(self, value_ms: float) -> None:
+        """Count one latency."""
+        self.counts[self._bucket(value_ms)] += 1
+        self.total += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Return the ``q`` percentile (0-100) as a bucket's upper edge."""
+        if not self.total:
+            return None
+        rank = q / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.min_ms * math.exp(self.log_ratio * index)
+        return self.min_ms * math.exp(self.log_ratio * (len(self.counts) - 1))
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Snapshot of a run's progress.
+
+    Attributes
+    ----------
+    label : str
+        What is running, e.g. the technique name.
+    completed, total : int
+        Calls finished and planned (including calls loaded on resume).
+    accuracy : float
+        Fraction of finished calls answered correctly.
+    error_rate : float
+        Fraction of finished calls that failed.
+    latency_ewma_ms : float, optional
+        Exponentially weighted moving average of call latency.
+    latency_p50_ms, latency_p95_ms : float, optional
+        Latency percentiles of the calls made in this session.
+    throughput_rps : float
+        Calls finished per second since the first call of this session.
+    eta_s : float, optional
+        Seconds until all calls are finished at the measured throughput.
+    elapsed_s : float
+        Seconds since the tracker started.
+    final : bool
+        Whether this is the closing event sent by
+        :meth:`ProgressTracker.finish`, also when the run stopped early.
+    """
+
+    label: str
+    completed: int
+    total: int
+    accuracy: float
+    error_rate: float
+    latency_ewma_ms: float | None
+    latency_p50_ms: float | None
+    latency_p95_ms: float | None
+    throughput_rps: float
+    eta_s: float | None
+    elapsed_s: float
+    final: bool = False
+
+
+ProgressListener = Callable[[ProgressEvent], None]
+
+
+class ProgressTracker:
+    """
+    Incremental counters for a run, safe to update from worker threads.
+
+    Each :meth:`record` is O(1); listeners receive a :class:`ProgressEvent`
+    at most every ``interval`` seconds, and once more from :meth:`finish`.
+
+    Parameters
+    ----------
+    total : int
+        Number of calls planned.
+    label : str
+        Name shown in the display and events.
+    listeners : list of callable, optional
+        Functions receiving progress events.
+    interval : float
+        Minimum seconds between events.
+    ewma_alpha : float
+        Weight of the newest latency in the EWMA.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        label: str = "",
+        listeners: list[ProgressListener] | None = None,
+        interval: float = 0.5,
+        ewma_alpha: float = 0.1,
+    ) -> None:
+        """Initialize the counters."""
+        self.total = total
+        self.label = label
+        self.listeners = list(listeners or [])
+        self.interval = interval
+        self.ewma_alpha = ewma_alpha
+        self.completed = 0
+        self.correct = 0
+        self.errors = 0
+        self.session_calls = 0
+        self.latency_ewma_ms: float | None = None
+        self.histogram = LatencyHistogram()
+        self.started = time.monotonic()
+        self._first_call: float | None = None
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def preload(self, correct: int, errors: int, count: int) -> None:
+        """Count calls finished in an earlier session (e.g. loaded on resume)."""
+        with self._lock:
+            self.completed += count
+            self.correct += correct
+            self.errors += errors
+
+    def extend(self, count: int) -> None:
+        """Add planned calls (e.g. extra runs chosen while running)."""
+        with self._lock:
+            self.total += count
+
+    def skip(self, count: int = 1) -> None:
+        """Drop planned calls that will not be made (e.g. retired by a race)."""
+        with self._lock:
+            self.total -= count
+
+    def record(self, correct: bool, success: bool, latency_ms: float) -> None:
+        """Count one finished call and notify listeners if an event is due."""
+        now = time.monotonic()
+        with self._lock:
+            if self._first_call is None:
+                # Throughput is measured from the first call's start, roughly its latency ago
+                self._first_call = now - latency_ms / 1000
+            self.completed += 1
+            self.session_calls += 1
+            self.correct += int(correct)
+            if not success:
+                self.errors += 1
+            else:
+                self.histogram.add(latency_ms)
+                if self.latency_ewma_ms is None:
+                    self.latency_ewma_ms = latency_ms
+                else:
+                    self.latency_ewma_ms += self.ewma_alpha * (latency_ms - self.latency_ewma_ms)
+            due = now - self._last_emit >= self.interval
+            if due:
+                self._last_emit = now
+                event = self._snapshot(now)
+        if due:
+            self._emit(event)
+
+    def _snapshot(self, now: float) -> ProgressEvent:
+        """Build an event from the counters (lock held)."""
+        done = self.completed
+        busy_s = now - self._first_call if self._first_call is not None else 0.0
+        throughput = self.session_calls / busy_s if busy_s > 0 else 0.0
+        remaining = self.total - done
+        return ProgressEvent(
+            label=self.label,
+            completed=done,
+            total=self.total,
+            accuracy=self.correct / done if done else 0.0,
+            error_rate=self.errors / done if done else 0.0,
+            latency_ewma_ms=self.latency_ewma_ms,
+            latency_p50_ms=self.histogram.percentile(50),
+            latency_p95_ms=self.histogram.percentile(95),
+            throughput_rps=throughput,
+            eta_s=remaining / throughput if throughput > 0 else (0.0 if not remaining else None),
+            elapsed_s=now - self.started,
+        )
+
+    def snapshot(self) -> ProgressEvent:
+        """Return the current progress."""
+        with self._lock:
+            return self._snapshot(time.monotonic())
+
+    def finish(self) -> ProgressEvent:
+        """Send a final event (even if one was just sent, or calls are left) and return it."""
+        event = replace(self.snapshot(), final=True)
+        self._emit(event)
+        return event
+
+    def _emit(self, event: ProgressEvent) -> None:
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Progress listener failed: {e}")
+
+
+def format_duration(seconds: float | None) -> str:
+    """Format seconds as ``H:MM:SS`` (or ``?`` when unknown)."""
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_event(event: ProgressEvent) -> str:
+    """Render an event as one human-readable line."""
+    latency = ""
+    if event.latency_p50_ms is not None:
+        latency = f" | p50 {event.latency_p50_ms:.0f}ms p95 {event.latency_p95_ms:.0f}ms"
+    label = f"{event.label} " if event.label else ""
+    return (
+        f"  {label}[{event.completed}/{event.total}] "
+        f"acc {event.accuracy:.1%} err {event.error_rate:.1%}{latency} | "
+        f"{event.throughput_rps:.2f} calls/s | ETA {format_duration(event.eta_s)}"
+    )
+
+
+class LineDisplay:
+    """
+    Listener that keeps one progress line updated in place.
+
+    On a terminal the line is redrawn with a carriage return and ended with
+    a newline once all calls are done or the tracker finishes (e.g. a run
+    stopped or out of time); otherwise (e.g. output piped to a log file) a
+    new line is written at most every ``log_interval`` seconds.
+
+    Parameters
+    ----------
+    stream : TextIO, optional
+        Output stream. Defaults to ``sys.stdout``.
+    log_interval : float
+        Minimum seconds between lines when not writing to a terminal.
+    """
+
+    def __init__(self, stream: TextIO | None = None, log_interval: float = 10.0) -> None:
+        """Attach to ``stream``."""
+        self.stream = stream or sys.stdout
+        self.log_interval = log_interval
+        self.interactive = self.stream.isatty()
+        self._last_line = 0.0
+        self._finished: tuple[str, int] | None = None
+
+    def __call__(self, event: ProgressEvent) -> None:
+        """Draw the event."""
+        finished = event.final or event.completed >= event.total
+        if finished:
+            # The last call's event and the closing one from finish() show the same state
+            if self._finished == (event.label, event.total):
+                return
+            self._finished = (event.label, event.total)
+        line = format_event(event)
+        if self.interactive:
+            self.stream.write("\r" + line.ljust(100) + ("\n" if finished else ""))
+        elif finished or time.monotonic() - self._last_line >= self.log_interval:
+            self._last_line = time.monotonic()
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+class JsonlEventWriter:
+    """
+    Listener appending each progress event as one JSON line.
+
+    Parameters
+    ----------
+    path : str
+        JSONL file to append to.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open ``path`` for appending."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        """Append the event with a wall-clock timestamp."""
+        line = json.dumps({"time": time.time(), **asdict(event)})
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
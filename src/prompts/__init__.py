@@ -6,7 +6,17 @@ from .few_shot import FewShotPromptGenerator
 from .chain_of_thought import ChainOfThoughtPromptGenerator
 from .role_based import RoleBasedPromptGenerator
 
+# Technique name (as used in results file names) to its generator class
+GENERATORS: dict[str, type[BasePromptGenerator]] = {
+    "baseline": BaselinePromptGenerator,
+    "improved": ImprovedPromptGenerator,
+    "few_shot": FewShotPromptGenerator,
+    "cot": ChainOfThoughtPromptGenerator,
+    "role_based": RoleBasedPromptGenerator,
+}
+
 __all__ = [
+    "GENERATORS",
     "BasePromptGenerator",
     "BaselinePromptGenerator",
     "ImprovedPromptGenerator",
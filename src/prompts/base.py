@@ -2,15 +2,65 @@
 
 from abc import ABC, abstractmethod
 
+from ..answer_detector import AnswerDetector
+
 
 class BasePromptGenerator(ABC):
     """
     Abstract base class for prompt generators.
 
     All prompt technique implementations should inherit from this class
-    and implement the generate method.
+    and implement the generate method. Subclasses may set
+    ``GENERATION_OPTIONS`` to the Ollama options (output budget, stop
+    sequences, ...) that suit their expected answer length, and
+    ``ANSWER_MARKER`` or ``ANSWER_TERMINATOR`` so a streamed generation can
+    be closed as soon as the final answer has been written.
     """
 
+    # Default Ollama generation options for this technique
+    GENERATION_OPTIONS: dict = {}
+
+    # Text introducing the final answer; completeness follows the answer type
+    ANSWER_MARKER: str | None = None
+
+    # Regex matching a complete final answer; takes precedence over the marker
+    ANSWER_TERMINATOR: str | None = None
+
+    def generation_options(self) -> dict:
+        """
+        Return the default generation options for this technique.
+
+        Returns
+        -------
+        dict
+            Copy of ``GENERATION_OPTIONS`` that callers may modify.
+        """
+        return {
+            name: list(value) if isinstance(value, list) else value
+            for name, value in self.GENERATION_OPTIONS.items()
+        }
+
+    def answer_detector(self, test_case: dict) -> AnswerDetector | None:
+        """
+        Build a detector for a complete final answer in a streamed response.
+
+        Parameters
+        ----------
+        test_case : dict
+            Test case dictionary; its ``answer_type`` decides when an answer
+            after ``ANSWER_MARKER`` is complete.
+
+        Returns
+        -------
+        AnswerDetector or None
+            None if the technique has no recognisable final-answer line.
+        """
+        if self.ANSWER_TERMINATOR:
+            return AnswerDetector(self.ANSWER_TERMINATOR)
+        if self.ANSWER_MARKER:
+            return AnswerDetector.for_answer_type(test_case["answer_type"], self.ANSWER_MARKER)
+        return None
+
     @abstractmethod
     def generate(self, test_case: dict) -> str:
         """
@@ -44,6 +94,9 @@ class BaselinePromptGenerator(BasePromptGenerator):
     # Suffix to ensure concise responses
     CONCISE_SUFFIX = "\n\nAnswer concisely with just the answer, no explanation."
 
+    # A short answer fits well within 48 tokens
+    GENERATION_OPTIONS = {"num_predict": 48}
+
     def generate(self, test_case: dict) -> str:
         """
         Generate a minimal baseline prompt.
@@ -11,6 +11,12 @@ class ChainOfThoughtPromptGenerator(BasePromptGenerator):
     logical problem-solving steps.
     """
 
+    # Step-by-step reasoning needs room before the final answer line
+    GENERATION_OPTIONS = {"num_predict": 512}
+
+    # Anything after the final answer line is discarded, so stop streaming there
+    ANSWER_MARKER = "Final Answer:"
+
     def generate(self, test_case: dict) -> str:
         """
         Generate a chain-of-thought prompt.
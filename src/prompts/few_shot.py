@@ -14,6 +14,9 @@ class FewShotPromptGenerator(BasePromptGenerator):
     based on the test case category.
     """
 
+    # The prompt ends with "Answer:"; stop before the model invents another example
+    GENERATION_OPTIONS = {"num_predict": 32, "stop": ["\nQuestion:", "\nExample"]}
+
     DEFAULT_EXAMPLES = {
         "sentiment": [
             {"question": "The service was terrible and the food was cold.", "answer": "negative"},
@@ -20,6 +20,9 @@ class ImprovedPromptGenerator(BasePromptGenerator):
         "code": "Respond with only what the code prints.",
     }
 
+    # Format hints ask for a single word or number; stop at the first blank line
+    GENERATION_OPTIONS = {"num_predict": 32, "stop": ["\n\n"]}
+
     def generate(self, test_case: dict) -> str:
         """
         Generate an improved prompt with format constraints.
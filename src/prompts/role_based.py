@@ -11,6 +11,9 @@ class RoleBasedPromptGenerator(BasePromptGenerator):
     domain-specific knowledge and reasoning.
     """
 
+    # Personas can make the model chattier than the baseline; keep the same cap
+    GENERATION_OPTIONS = {"num_predict": 48}
+
     ROLES = {
         "sentiment": (
             "You are an expert sentiment analyst with years of experience "
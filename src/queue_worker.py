@@ -0,0 +1,180 @@
+"""Worker leasing items from a WorkQueue and committing their result rows."""
+
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import pandas as pd
+
+from .config import Config
+from .experiment_runner import ExperimentRunner, LLMClient
+from .prompts import GENERATORS
+from .retry_scheduler import backoff_delay
+from .work_item import WorkItem
+from .work_queue import Lease, WorkQueue
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Identify this process as ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class QueueWorker:
+    """
+    Run the queued items of one model until none are left.
+
+    Each of ``threads`` loops leases one item of ``config.model_name``,
+    makes the call through ``client``, scores it like
+    :class:`~src.experiment_runner.ExperimentRunner` and commits the row.
+    A failed call goes back to the queue after a jittered backoff until
+    ``config.queue_max_attempts`` attempts are used; the last failure is then
+    committed as the item's (failed) row. A call that raises instead
+    (a malformed item, an unknown technique) is retried the same way and
+    then failed through :meth:`WorkQueue.fail`, so it never holds its
+    lease until it lapses. When no item is ready but some are still
+    leased by other workers, the worker polls every ``poll_s`` seconds, so
+    it takes over items whose worker died once their lease lapses; it
+    exits once every item of the model has a result.
+
+    Parameters
+    ----------
+    queue : WorkQueue
+        Queue to work on.
+    config : Config
+        Configuration; ``model_name`` selects the items to lease.
+    client : LLMClient
+        Client for the calls, shared by the threads.
+    worker_id : str, optional
+        Name recorded with leases and results (``host:pid`` by default).
+    threads : int
+        Calls in flight at once.
+    poll_s : float
+        Wait between lease attempts when no item is ready.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        config: Config,
+        client: LLMClient,
+        worker_id: str | None = None,
+        threads: int = 1,
+        poll_s: float = 5.0,
+    ) -> None:
+        """Bind the worker to a queue and client."""
+        self.queue = queue
+        self.config = config
+        self.worker_id = worker_id or default_worker_id()
+        self.threads = max(1, threads)
+        self.poll_s = poll_s
+        self.runner = ExperimentRunner(
+            config, client=client, results_dir=str(queue.path.parent), progress_listeners=[]
+        )
+        self.committed = 0
+        self.lost = 0
+        self.retried = 0
+        self.failed = 0
+        self._templates: dict[tuple[str, str], WorkItem] = {}
+        self._lock = threading.Lock()
+
+    def _work_item(self, lease: Lease) -> WorkItem:
+        """Build the leased call's prompt and options, once per (technique, case)."""
+        key = (lease.technique, str(lease.case["id"]))
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                if lease.technique not in GENERATORS:
+                    raise ValueError(
+                        f"Unknown technique {lease.technique!r}; choose from {sorted(GENERATORS)}"
+                    )
+                generator = GENERATORS[lease.technique]()
+                template = self._templates[key] = self.runner.case_templates(
+                    pd.DataFrame([lease.case]), generator
+                )[0]
+        return replace(template, run=lease.run)
+
+    def process(self, lease: Lease) -> None:
+        """Run one leased item and commit, requeue or fail it."""
+        try:
+            response, row = self.runner.run_single_case(self._work_item(lease))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Item {lease.item_id} raised {error}")
+            if not self._requeue(lease, error):
+                failed = self.queue.fail(lease, self.worker_id, error)
+                with self._lock:
+                    self.failed += failed
+            return
+        if not response.success and self._requeue(lease, str(response.error), response.retry_after):
+            return
+        row.update(
+            technique=lease.technique, model=lease.model, attempts=lease.attempts,
+            worker=self.worker_id,
+        )
+        committed = self.queue.complete(lease, row, self.worker_id)
+        with self._lock:
+            if committed:
+                self.committed += 1
+            else:
+                self.lost += 1
+
+    def _requeue(self, lease: Lease, error: str, retry_after: float | None = None) -> bool:
+        """Release a failed item for a retry after a backoff, unless its attempts are used up."""
+        if lease.attempts >= self.config.queue_max_attempts:
+            return False
+        delay = backoff_delay(
+            lease.attempts, self.config.retry_delay, self.config.max_backoff, retry_after
+        )
+        logger.info(f"Item {lease.item_id} failed ({error[:50]}); requeued for {delay:.1f}s")
+        self.queue.release(lease, delay)
+        with self._lock:
+            self.retried += 1
+        return True
+
+    def _loop(self, stop: threading.Event) -> None:
+        """Lease and process items until the model's items are all done or ``stop`` is set."""
+        model = self.config.model_name
+        while not stop.is_set():
+            leases = self.queue.lease(self.worker_id, model)
+            if not leases:
+                if self.queue.remaining(model) == 0:
+                    return
+                stop.wait(self.poll_s)
+                continue
+            self.process(leases[0])
+
+    def run(self, stop: threading.Event | None = None) -> dict:
+        """
+        Work until the model's items are done or ``stop`` is set.
+
+        Calls in flight when ``stop`` is set still finish and are committed.
+
+        Returns
+        -------
+        dict
+            Rows committed, results discarded because a lease was lost,
+            calls requeued for a retry, items failed after raising, and the
+            queue counts afterwards.
+        """
+        stop = stop or threading.Event()
+        logger.info(
+            f"Worker {self.worker_id} starting on {self.config.model_name} "
+            f"with {self.threads} threads"
+        )
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            for future in [pool.submit(self._loop, stop) for _ in range(self.threads)]:
+                future.result()
+        return {
+            "worker": self.worker_id,
+            "committed": self.committed,
+            "lost": self.lost,
+            "retried": self.retried,
+            "failed": self.failed,
+            "queue": self.queue.counts(self.config.model_name),
+        }
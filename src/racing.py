@@ -0,0 +1,232 @@
+"""Sequential racing: retire techniques whose accuracy is settled or out of contention."""
+
+import logging
+import math
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from .config import Config
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+RACING_METHODS = ("hoeffding", "beta")
+
+
+def hoeffding_interval(correct: int, n: int, delta: float) -> tuple[float, float]:
+    """
+    Anytime-valid Hoeffding interval for an accuracy.
+
+    The failure probability is spread over every sample size as
+    ``delta / (n (n + 1))``, so the interval may be checked after each
+    result without inflating the error rate.
+
+    Parameters
+    ----------
+    correct : int
+        Correct answers.
+    n : int
+        Answers scored.
+    delta : float
+        Allowed probability that the true accuracy ever leaves the interval.
+
+    Returns
+    -------
+    tuple of float
+        Lower and upper bound, clipped to [0, 1].
+    """
+    if n == 0:
+        return 0.0, 1.0
+    mean = correct / n
+    eps = math.sqrt(math.log(2 * n * (n + 1) / delta) / (2 * n))
+    return max(0.0, mean - eps), min(1.0, mean + eps)
+
+
+def beta_interval(
+    correct: int, n: int, delta: float, draws: int = 4000, rng: np.random.Generator | None = None
+) -> tuple[float, float]:
+    """
+    Central credible interval of a Beta(1 + correct, 1 + wrong) posterior.
+
+    Tighter than :func:`hoeffding_interval` but not corrected for repeated
+    looks, so it retires techniques sooner at a higher risk of error.
+
+    Parameters
+    ----------
+    correct : int
+        Correct answers.
+    n : int
+        Answers scored.
+    delta : float
+        Posterior mass left outside the interval.
+    draws : int
+        Posterior samples used to estimate the quantiles.
+    rng : np.random.Generator, optional
+        Random source.
+
+    Returns
+    -------
+    tuple of float
+        Lower and upper bound.
+    """
+    rng = rng or np.random.default_rng(0)
+    samples = rng.beta(1 + correct, 1 + n - correct, size=draws)
+    low, high = np.quantile(samples, [delta / 2, 1 - delta / 2])
+    return float(low), float(high)
+
+
+@dataclass
+class RaceEntry:
+    """
+    State of one technique in a race.
+
+    Attributes
+    ----------
+    technique : str
+        Technique name.
+    calls, correct : int
+        Scored answers and how many were correct.
+    low, high : float
+        Current confidence bounds of the accuracy.
+    retired : bool
+        Whether the technique gets no more calls.
+    retired_after : int, optional
+        Answers scored across all techniques when it was retired.
+    reason : str, optional
+        Why it was retired.
+    """
+
+    technique: str
+    calls: int = 0
+    correct: int = 0
+    low: float = 0.0
+    high: float = 1.0
+    retired: bool = False
+    retired_after: int | None = None
+    reason: str | None = None
+
+    @property
+    def accuracy(self) -> float:
+        """Observed accuracy."""
+        return self.correct / self.calls if self.calls else 0.0
+
+
+class Race:
+    """
+    Track per-technique accuracy bounds and retire techniques as results arrive.
+
+    A technique with at least ``min_calls`` scored answers is retired when
+    its upper bound falls below the lower bound of the leader (the technique
+    with the highest lower bound), or when its interval is narrower than
+    ``2 * precision`` so more calls would not change its estimate much.
+    ``confidence`` is split over the techniques (Bonferroni), so it bounds
+    the chance of any wrong elimination. Each call counts as one sample;
+    repeated runs of a case are correlated, so prefer a high confidence.
+
+    Parameters
+    ----------
+    techniques : list of str
+        Techniques taking part.
+    method : str
+        ``"hoeffding"`` or ``"beta"``.
+    confidence : float
+        Joint confidence of the bounds.
+    min_calls : int
+        Scored answers a technique needs before it can be retired.
+    precision : float
+        Interval half-width at which a technique counts as settled; 0
+        disables this rule.
+    """
+
+    def __init__(
+        self,
+        techniques: list[str],
+        method: str = "hoeffding",
+        confidence: float = 0.95,
+        min_calls: int = 20,
+        precision: float = 0.0,
+    ) -> None:
+        """Start a race with no results."""
+        if method not in RACING_METHODS:
+            raise ValueError(f"Unknown racing method {method!r}; choose from {RACING_METHODS}")
+        self.method = method
+        self.delta = (1 - confidence) / max(1, len(techniques))
+        self.min_calls = min_calls
+        self.precision = precision
+        self.entries = {name: RaceEntry(name) for name in techniques}
+        self.scored = 0
+
+    @classmethod
+    def from_config(cls, config: Config, techniques: list[str]) -> "Race":
+        """Build a race from the racing settings."""
+        return cls(
+            techniques,
+            method=config.racing_method,
+            confidence=config.racing_confidence,
+            min_calls=config.racing_min_calls,
+            precision=config.racing_precision,
+        )
+
+    def is_retired(self, technique: str) -> bool:
+        """Return True if ``technique`` should get no more calls."""
+        return self.entries[technique].retired
+
+    def update(self, technique: str, correct: bool) -> list[str]:
+        """
+        Score one answer and retire techniques that are out of the race.
+
+        Returns
+        -------
+        list of str
+            Techniques retired by this update.
+        """
+        entry = self.entries[technique]
+        entry.calls += 1
+        entry.correct += int(correct)
+        self.scored += 1
+        interval = hoeffding_interval if self.method == "hoeffding" else beta_interval
+        entry.low, entry.high = interval(entry.correct, entry.calls, self.delta)
+        return self._retire()
+
+    def _retire(self) -> list[str]:
+        """Apply the elimination rules to every active technique."""
+        ready = [e for e in self.entries.values() if e.calls >= self.min_calls]
+        if not ready:
+            return []
+        leader = max(ready, key=lambda e: e.low)
+        retired = []
+        for entry in ready:
+            if entry.retired:
+                continue
+            if entry is not leader and entry.high < leader.low:
+                reason = (
+                    f"out of contention: upper bound {entry.high:.1%} < "
+                    f"{leader.technique} lower bound {leader.low:.1%}"
+                )
+            elif self.precision > 0 and (entry.high - entry.low) / 2 <= self.precision:
+                reason = f"settled at {entry.accuracy:.1%} +/- {(entry.high - entry.low) / 2:.1%}"
+            else:
+                continue
+            entry.retired, entry.retired_after, entry.reason = True, self.scored, reason
+            logger.info(f"Race: retired {entry.technique} after {entry.calls} calls ({reason})")
+            retired.append(entry.technique)
+        return retired
+
+    def leader(self) -> str | None:
+        """Technique with the highest lower bound, once any has ``min_calls``."""
+        ready = [e for e in self.entries.values() if e.calls >= self.min_calls]
+        return max(ready, key=lambda e: e.low).technique if ready else None
+
+    def report(self) -> dict:
+        """Per-technique bounds, and when and why each was retired."""
+        return {
+            "method": self.method,
+            "confidence_per_technique": 1 - self.delta,
+            "scored": self.scored,
+            "leader": self.leader(),
+            "techniques": {
+                name: {**asdict(entry), "accuracy": entry.accuracy}
+                for name, entry in self.entries.items()
+            },
+        }
@@ -0,0 +1,206 @@
+"""Shared token-bucket rate limiter with adaptive backoff for API calls."""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from .config import Config
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean the server wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse an HTTP ``Retry-After`` header.
+
+    Parameters
+    ----------
+    value : str, optional
+        Header value: either delay seconds or an HTTP date.
+
+    Returns
+    -------
+    float or None
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket that paces calls and backs off when the server throttles.
+
+    Tokens refill at the current rate up to ``burst``; each call takes one.
+    On HTTP 429/503 the limiter pauses all callers (for ``Retry-After`` or an
+    exponential backoff) and halves its rate. Each success then raises the
+    rate by a tenth of the base rate, so throughput recovers gradually
+    instead of hammering a server that just pushed back. One instance can be
+    shared by threads, coroutines and several clients.
+
+    Without pacing (an infinite base rate) the same applies from the rate
+    calls were starting at when the server pushed back: the limiter paces
+    at half of it, recovers in tenths of it, and stops pacing once it is
+    reached again.
+
+    Parameters
+    ----------
+    rate : float
+        Base calls per second. ``math.inf`` disables pacing until the
+        server throttles.
+    burst : int
+        Maximum number of calls that may start back to back.
+    backoff : float
+        Initial pause in seconds after a throttling response.
+    max_backoff : float
+        Upper bound of the pause in seconds.
+    """
+
+    # Never slow below this fraction of the base rate
+    MIN_RATE_FRACTION = 1 / 16
+    # Fraction of the base rate regained per successful call
+    RECOVERY_STEP = 0.1
+    # Call starts used to estimate the rate when pacing is off
+    RATE_SAMPLES = 20
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        backoff: float = 15.0,
+        max_backoff: float = 120.0,
+    ) -> None:
+        """Initialize a full bucket at the base rate."""
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.initial_backoff = backoff
+        self.max_backoff = max_backoff
+        self._backoff = backoff
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._starts: deque[float] = deque(maxlen=self.RATE_SAMPLES)
+        self._throttled_rate = math.inf
+        self._lock = threading.Lock()
+        self.throttle_events = 0
+        self.total_wait_s = 0.0
+
+    @classmethod
+    def from_config(cls, config: Config) -> "TokenBucketLimiter":
+        """Build a limiter from ``request_delay`` and the backoff settings."""
+        rate = 1.0 / config.request_delay if config.request_delay > 0 else math.inf
+        return cls(
+            rate=rate,
+            burst=config.rate_limit_burst,
+            backoff=config.rate_limit_backoff,
+            max_backoff=config.max_backoff,
+        )
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if math.isinf(self.rate):
+                self._starts.append(now)
+                return 0.0
+            elapsed = now - self._last_refill
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._starts.append(now)
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def _observed_rate(self, now: float) -> float:
+        """Calls per second started over the recent samples (lock held)."""
+        span = now - self._starts[0] if self._starts else 0.0
+        return len(self._starts) / span if len(self._starts) > 1 and span > 0 else math.inf
+
+    def _full_rate(self) -> float:
+        """Rate to recover to: the base rate, or the throttled one without pacing."""
+        return self.base_rate if not math.isinf(self.base_rate) else self._throttled_rate
+
+    def acquire(self) -> float:
+        """Block until a call may start; return the seconds spent waiting."""
+        waited = 0.0
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+            waited += wait
+        self._record_wait(waited)
+        return waited
+
+    async def aacquire(self) -> float:
+        """Await until a call may start; return the seconds spent waiting."""
+        waited = 0.0
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        self._record_wait(waited)
+        return waited
+
+    def _record_wait(self, waited: float) -> None:
+        if waited:
+            with self._lock:
+                self.total_wait_s += waited
+
+    def penalize(self, retry_after: float | None = None) -> float:
+        """
+        React to a throttling response by pausing and slowing down.
+
+        Parameters
+        ----------
+        retry_after : float, optional
+            Server-requested delay in seconds; overrides the backoff.
+
+        Returns
+        -------
+        float
+            The pause applied, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = min(retry_after if retry_after is not None else self._backoff, self.max_backoff)
+            self._paused_until = max(self._paused_until, now + pause)
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            if math.isinf(self.rate):
+                # Pacing is off: slow down from the rate the server pushed back on
+                self._throttled_rate = self.rate = self._observed_rate(now)
+            full_rate = self._full_rate()
+            if not math.isinf(full_rate):
+                self.rate = max(self.rate / 2, full_rate * self.MIN_RATE_FRACTION)
+            self._tokens = 0.0
+            self._last_refill = now
+            self.throttle_events += 1
+        logger.warning(f"Server throttled; pausing {pause:.1f}s, rate now {self.rate:.2f}/s")
+        return pause
+
+    def reward(self) -> None:
+        """Record a successful call and recover the rate gradually."""
+        with self._lock:
+            self._backoff = self.initial_backoff
+            full_rate = self._full_rate()
+            if self.rate < full_rate:
+                self.rate = min(full_rate, self.rate + full_rate * self.RECOVERY_STEP)
+            if self.rate >= full_rate:
+                self.rate = self.base_rate
@@ -0,0 +1,164 @@
+"""Single-flight coalescing of identical in-flight LLM requests."""
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass, replace
+
+from .client_utils import aquery_client
+from .ollama_client import APIResponse
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def is_deterministic(options: dict | None) -> bool:
+    """
+    Check whether generation options make sampling deterministic.
+
+    Greedy decoding (``temperature`` 0 or ``top_k`` 1) always yields the same
+    tokens for the same prompt, so identical requests can share one call.
+
+    Parameters
+    ----------
+    options : dict, optional
+        Generation options of the request.
+
+    Returns
+    -------
+    bool
+        True if repeated calls are expected to return identical text.
+    """
+    options = options or {}
+    return options.get("temperature") == 0 or options.get("top_k") == 1
+
+
+@dataclass
+class CoalescingStats:
+    """
+    Counters for a coalescing client.
+
+    Attributes
+    ----------
+    upstream_calls : int
+        Requests actually sent to the wrapped client.
+    coalesced : int
+        Requests answered by sharing another request's response.
+    """
+
+    upstream_calls: int = 0
+    coalesced: int = 0
+
+
+class _Flight:
+    """An upstream call that other identical requests can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: APIResponse | None = None
+
+
+class CoalescingClient:
+    """
+    ``LLMClient`` wrapper sharing one upstream call among identical requests.
+
+    When ``fan_out`` is enabled and a request's options are deterministic,
+    concurrent requests with the same (prompt, options) wait for the first
+    one's response instead of calling the model again. The copies handed to
+    waiting runs are marked ``coalesced``. Non-deterministic requests, and
+    all requests while ``fan_out`` is off, pass straight through.
+
+    Parameters
+    ----------
+    client : LLMClient
+        The client to send upstream calls to.
+    fan_out : bool
+        Opt in to sharing responses between identical deterministic requests.
+    """
+
+    def __init__(self, client, fan_out: bool = False) -> None:
+        """Wrap ``client``."""
+        self.client = client
+        self.fan_out = fan_out
+        self.stats = CoalescingStats()
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._async_flights: dict[str, asyncio.Future] = {}
+
+    def __getattr__(self, name: str):
+        """Delegate unknown attributes to the wrapped client."""
+        return getattr(self.client, name)
+
+    def _flight_key(self, prompt: str, options: dict | None) -> str | None:
+        """Return the coalescing key, or None if the request must not be shared."""
+        if not self.fan_out or not is_deterministic(options):
+            return None
+        return json.dumps({"prompt": prompt, "options": options or {}}, sort_keys=True)
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        """Send the request, or wait for an identical one already in flight."""
+        key = self._flight_key(prompt, options)
+        if key is None:
+            return self.client.query(prompt, options=options, run=run, **kwargs)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.upstream_calls += 1
+
+        if is_leader:
+            try:
+                flight.response = self.client.query(prompt, options=options, run=run, **kwargs)
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+            return flight.response
+
+        flight.done.wait()
+        if flight.response is None:
+            # The leader raised; make our own call rather than propagating its error
+            return self.client.query(prompt, options=options, run=run, **kwargs)
+        with self._lock:
+            self.stats.coalesced += 1
+        logger.debug(f"Coalesced run {run} onto an in-flight identical request")
+        return replace(flight.response, coalesced=True)
+
+    async def aquery(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        """Async variant of :meth:`query` for use on a single event loop."""
+        key = self._flight_key(prompt, options)
+        if key is None:
+            return await aquery_client(self.client, prompt, options=options, run=run, **kwargs)
+
+        future = self._async_flights.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._async_flights[key] = future
+            self.stats.upstream_calls += 1
+            try:
+                response = await aquery_client(
+                    self.client, prompt, options=options, run=run, **kwargs
+                )
+                future.set_result(response)
+                return response
+            except BaseException as e:
+                future.set_exception(e)
+                # Waiters fall back to their own call; nobody may be left to retrieve this
+                future.exception()
+                raise
+            finally:
+                del self._async_flights[key]
+
+        try:
+            response = await asyncio.shield(future)
+        except Exception:
+            return await aquery_client(self.client, prompt, options=options, run=run, **kwargs)
+        self.stats.coalesced += 1
+        return replace(response, coalesced=True)
@@ -0,0 +1,302 @@
+"""Persistent, content-addressed cache of LLM responses backed by SQLite."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .client_utils import aquery_client
+from .ollama_client import APIResponse, StopCondition
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit/miss counters for a response cache.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups answered from the cache.
+    misses : int
+        Lookups that had to go to the model (or failed in replay mode).
+    writes : int
+        Responses stored in the cache.
+    evictions : int
+        Entries removed to stay under the size cap.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cache_key(
+    model_id: str, prompt: str, options: dict | None, run: int, early_stop: bool = False
+) -> str:
+    """
+    Compute the content address of a generation request.
+
+    Parameters
+    ----------
+    model_id : str
+        Model digest, or the model name when no digest is known.
+    prompt : str
+        The prompt text.
+    options : dict, optional
+        Generation options, including the sampling seed.
+    run : int
+        Run index of the call, so repeated runs stay distinct samples.
+    early_stop : bool
+        Whether the generation may be cut short once the answer is
+        complete. Only added to the request when set, so the keys of full
+        generations are the same as before.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 of the canonical JSON encoding of the request.
+    """
+    request = {"model": model_id, "prompt": prompt, "options": options or {}, "run": run}
+    if early_stop:
+        request["early_stop"] = True
+    canonical = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite store of successful responses with size-capped LRU eviction.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database file.
+    max_bytes : int
+        Total size of stored responses above which least recently used
+        entries are evicted.
+    read_only : bool
+        Replay mode: never write, evict, or touch access times.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 512 * 1024 * 1024, read_only: bool = False
+    ) -> None:
+        """Open (and create if needed) the cache database."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+            CREATE TABLE IF NOT EXISTS model_digests (
+                model TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        logger.info(f"ResponseCache opened: path={self.path}, read_only={read_only}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> APIResponse | None:
+        """Return the cached response for ``key``, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            if not self.read_only:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+        response = APIResponse(**json.loads(row[0]))
+        response.cached = True
+        return response
+
+    def put(self, key: str, model: str, response: APIResponse) -> None:
+        """Store a successful response and evict old entries past the size cap."""
+        if self.read_only or not response.success:
+            return
+        data = json.dumps(asdict(response))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, data, len(data), time.time()),
+            )
+            self.stats.writes += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under ``max_bytes``."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
+            self.stats.evictions += 1
+
+    def remember_digest(self, model: str, digest: str) -> None:
+        """Record the digest last seen for a model name."""
+        if self.read_only:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO model_digests (model, digest) VALUES (?, ?)",
+                (model, digest),
+            )
+            self._conn.commit()
+
+    def known_digest(self, model: str) -> str | None:
+        """Return the digest last recorded for a model name."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM model_digests WHERE model = ?", (model,)
+            ).fetchone()
+        return row[0] if row else None
+
+
+class CachedLLMClient:
+    """
+    ``LLMClient`` wrapper that answers repeated requests from a ResponseCache.
+
+    Any attribute not defined here is delegated to the wrapped client, so the
+    wrapper can stand in for an ``OllamaClient`` in the CLI. Whether a
+    ``stop_when`` condition is given is part of the cache key, so answers
+    cut short by early stop are never replayed as full generations. Other
+    extra keyword arguments are forwarded on a miss and do not take part
+    in the key.
+
+    Parameters
+    ----------
+    client : LLMClient
+        The client to call on a cache miss.
+    cache : ResponseCache
+        Cache to read from and (unless read-only) write to.
+    """
+
+    def __init__(self, client, cache: ResponseCache) -> None:
+        """Wrap ``client`` with ``cache``."""
+        self.client = client
+        self.cache = cache
+        self._model_id: str | None = None
+
+    def __getattr__(self, name: str):
+        """Delegate unknown attributes to the wrapped client."""
+        return getattr(self.client, name)
+
+    @property
+    def model_id(self) -> str:
+        """Model digest used in cache keys, resolved once per wrapper."""
+        if self._model_id is None:
+            model = getattr(self.client, "model", "unknown")
+            digest_fn = getattr(self.client, "model_digest", None)
+            digest = digest_fn() if digest_fn else None
+            if digest:
+                self.cache.remember_digest(model, digest)
+            else:
+                # Server unreachable (e.g. replaying offline): reuse the last digest seen
+                digest = self.cache.known_digest(model)
+            self._model_id = digest or model
+        return self._model_id
+
+    def _lookup(self, key: str, early_stop: bool) -> APIResponse | None:
+        """Return the cached response, serving answers cut short only to early-stop calls."""
+        cached = self.cache.get(key)
+        if cached is not None and cached.early_stopped and not early_stop:
+            # Stored under a plain key before early stop became part of it
+            return None
+        return cached
+
+    def _miss_response(self) -> APIResponse:
+        return APIResponse(
+            text="", latency_ms=0.0, success=False, error="Cache miss in replay mode"
+        )
+
+    def query(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+        **kwargs,
+    ) -> APIResponse:
+        """Return a cached response, or query the wrapped client and store it."""
+        key = cache_key(self.model_id, prompt, options, run, stop_when is not None)
+        cached = self._lookup(key, stop_when is not None)
+        if cached is not None:
+            return cached
+        if self.cache.read_only:
+            return self._miss_response()
+        response = self.client.query(
+            prompt, options=options, run=run, stop_when=stop_when, **kwargs
+        )
+        self.cache.put(key, self.model_id, response)
+        return response
+
+    async def aquery(
+        self,
+        prompt: str,
+        *,
+        options: dict | None = None,
+        run: int = 1,
+        stop_when: StopCondition | None = None,
+        **kwargs,
+    ) -> APIResponse:
+        """Async variant of :meth:`query`; falls back to a thread for sync clients."""
+        key = cache_key(self.model_id, prompt, options, run, stop_when is not None)
+        cached = self._lookup(key, stop_when is not None)
+        if cached is not None:
+            return cached
+        if self.cache.read_only:
+            return self._miss_response()
+        response = await aquery_client(
+            self.client, prompt, options=options, run=run, stop_when=stop_when, **kwargs
+        )
+        self.cache.put(key, self.model_id, response)
+        return response
@@ -0,0 +1,151 @@
+"""Deferred retry queue with jittered exponential backoff for work items."""
+
+import heapq
+import logging
+import random
+import time
+
+from .config import Config
+from .ollama_client import APIResponse
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    retry_after: float | None = None,
+    rng: random.Random | None = None,
+) -> float:
+    """
+    Compute the wait before retrying a failed call.
+
+    Uses "equal jitter": half of the exponential step is fixed and half is
+    random, so retries of many items that failed together spread out
+    instead of hitting the server again in lockstep.
+
+    Parameters
+    ----------
+    attempt : int
+        Number of attempts made so far (1 after the first failure).
+    base : float
+        Backoff step in seconds after the first failure.
+    cap : float
+        Maximum delay in seconds.
+    retry_after : float, optional
+        Server-requested delay; the result is never shorter than this
+        (but still capped at ``cap``).
+    rng : random.Random, optional
+        Random source, for reproducible tests.
+
+    Returns
+    -------
+    float
+        Delay in seconds.
+    """
+    rng = rng or random
+    ceiling = min(cap, base * 2 ** (attempt - 1))
+    delay = rng.uniform(ceiling / 2, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return min(delay, cap)
+
+
+class RetryScheduler:
+    """
+    Track attempts of work items and hold failed ones until their retry time.
+
+    Items are identified by their index in the runner's work list. Failed
+    items wait in a heap ordered by the time they become ready, so the
+    runner can keep dispatching other work in the meantime.
+
+    Parameters
+    ----------
+    max_attempts : int
+        Total attempts allowed per item, including the first.
+    base_delay : float
+        Backoff step in seconds after the first failure.
+    max_delay : float
+        Maximum backoff in seconds.
+    rng : random.Random, optional
+        Random source for the jitter.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize an empty schedule."""
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+        self.attempts: dict[int, int] = {}
+        self.backoff_s: dict[int, float] = {}
+        self._heap: list[tuple[float, int]] = []
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RetryScheduler":
+        """
+        Build a scheduler from ``max_retries``, ``retry_delay`` and ``max_backoff``.
+
+        Without ``retry_in_runner`` the client already retries each call, so
+        the scheduler allows a single attempt rather than multiplying them.
+        """
+        attempts = config.max_retries if config.retry_in_runner else 1
+        return cls(attempts, config.retry_delay, config.max_backoff)
+
+    def __len__(self) -> int:
+        """Number of items waiting for a retry."""
+        return len(self._heap)
+
+    def start(self, index: int) -> int:
+        """Record that an attempt of ``index`` is starting; return its number."""
+        self.attempts[index] = self.attempts.get(index, 0) + 1
+        return self.attempts[index]
+
+    def should_retry(self, index: int, response: APIResponse) -> bool:
+        """Return True if the response failed and attempts remain."""
+        return not response.success and self.attempts.get(index, 0) < self.max_attempts
+
+    def backoff(self, index: int, retry_after: float | None = None) -> float:
+        """Compute and record the backoff before the next attempt of ``index``."""
+        delay = backoff_delay(
+            self.attempts.get(index, 1), self.base_delay, self.max_delay, retry_after, self.rng
+        )
+        self.backoff_s[index] = self.backoff_s.get(index, 0.0) + delay
+        return delay
+
+    def defer(self, index: int, retry_after: float | None = None) -> float:
+        """Queue ``index`` for a retry after its backoff; return the delay."""
+        delay = self.backoff(index, retry_after)
+        heapq.heappush(self._heap, (time.monotonic() + delay, index))
+        return delay
+
+    def clear(self) -> None:
+        """Drop every deferred item, e.g. when the run is being stopped."""
+        self._heap.clear()
+
+    def pop_ready(self) -> int | None:
+        """Return the next item whose backoff has elapsed, if any."""
+        if self._heap and self._heap[0][0] <= time.monotonic():
+            return heapq.heappop(self._heap)[1]
+        return None
+
+    def time_until_next(self) -> float | None:
+        """Seconds until the earliest deferred item is ready, or None if empty."""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+    def summary(self, index: int) -> dict:
+        """Result columns recording the attempts and backoff of ``index``."""
+        return {
+            "attempts": self.attempts.get(index, 0),
+            "backoff_s": round(self.backoff_s.get(index, 0.0), 3),
+        }
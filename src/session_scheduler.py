@@ -0,0 +1,253 @@
+"""Session-level scheduling of every technique's calls over one work queue."""
+
+import json
+import logging
+import math
+import time
+from dataclasses import replace
+from itertools import groupby
+from typing import TYPE_CHECKING, Callable
+
+import pandas as pd
+
+from .checkpoint import RunInterrupted
+from .racing import Race
+from .stratification import interleave, stratified_indices
+from .work_item import WorkItem
+
+if TYPE_CHECKING:
+    from .experiment_runner import ExperimentRunner
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# (technique, index into that technique's work list)
+Slot = tuple[str, int]
+Ordering = Callable[[dict[str, list[WorkItem]]], list[Slot]]
+
+ORDERINGS: dict[str, Ordering] = {}
+
+
+def register_ordering(name: str) -> Callable[[Ordering], Ordering]:
+    """Register an ordering of the session's work under ``name``."""
+    def decorator(ordering: Ordering) -> Ordering:
+        ORDERINGS[name] = ordering
+        return ordering
+    return decorator
+
+
+@register_ordering("sequential")
+def order_sequential(work: dict[str, list[WorkItem]]) -> list[Slot]:
+    """Every call of one technique before the next (the classic loop)."""
+    return [(name, index) for name, items in work.items() for index in range(len(items))]
+
+
+@register_ordering("round_robin")
+def order_round_robin(work: dict[str, list[WorkItem]]) -> list[Slot]:
+    """One call of each technique in turn, in (case, run) order."""
+    return interleave([
+        [(name, index) for index in range(len(items))] for name, items in work.items()
+    ])
+
+
+@register_ordering("stratified")
+def order_stratified(work: dict[str, list[WorkItem]]) -> list[Slot]:
+    """
+    Round-robin across techniques and, within each, across strata.
+
+    Any prefix of the queue then holds about as many calls of every
+    technique, spread evenly over the category x difficulty strata.
+    """
+    return interleave([
+        [(name, index) for index in stratified_indices(items)] for name, items in work.items()
+    ])
+
+
+class SessionScheduler:
+    """
+    Run several techniques as one work queue over a shared runner.
+
+    The technique x case x run matrix is expanded once, put in the order
+    chosen from :data:`ORDERINGS`, and dispatched through the runner's
+    worker pool and retry queue. Every call is tagged with its technique,
+    so clients keeping per-technique state (hedging latency windows,
+    adaptive concurrency baselines) keep the techniques apart however
+    they interleave. Each technique keeps its own checkpoint, so
+    ``resume`` works as with :meth:`ExperimentRunner.run_technique`. If
+    the session is stopped, the rows finished so far are still saved for
+    every technique (and compared) before ``RunInterrupted`` is raised, and
+    kept in :attr:`results`; with an interleaved ordering they form a
+    representative sample of each. The same holds when
+    ``config.time_budget`` runs out: no new call starts and the session
+    returns the rows finished so far, with ``runner.budget_exhausted`` set.
+
+    With a :class:`~src.racing.Race`, every scored answer updates the
+    technique's accuracy bounds, and calls of techniques the race retires
+    are dropped from the queue. The race report is written to
+    ``stats/race_report.json``.
+
+    With ``config.lpt_scheduling`` (and no time budget) the calls of each
+    round of the ordering (see :meth:`rounds`) are re-sorted longest
+    predicted latency first, which keeps the interleaving that partial
+    results and racing rely on, and ``runner.schedule_report`` compares
+    the makespan with the ordering's own order. With
+    ``config.prefix_grouping`` calls sharing a prompt prefix are then
+    gathered to run back to back (giving up the ordering's interleaving),
+    each group's first call on its own before the rest fan out, and
+    ``runner.prefix_report`` holds each technique's estimated prompt
+    evaluation saving.
+
+    Parameters
+    ----------
+    runner : ExperimentRunner
+        Runner providing the client, evaluator, workers and output paths.
+    ordering : str
+        Name of a registered ordering.
+    race : Race, optional
+        Race deciding which techniques keep getting calls.
+    """
+
+    def __init__(
+        self, runner: "ExperimentRunner", ordering: str = "round_robin", race: Race | None = None
+    ) -> None:
+        """Bind the scheduler to ``runner``."""
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering {ordering!r}; choose from {sorted(ORDERINGS)}")
+        self.runner = runner
+        self.ordering = ordering
+        self.race = race
+        self.results: dict[str, pd.DataFrame] = {}
+
+    def plan(
+        self, technique_generators: dict[str, Callable[[dict], str]], test_cases: pd.DataFrame
+    ) -> tuple[dict[str, list[WorkItem]], list[Slot]]:
+        """Build every technique's work items, tagged with it, and the order to run them in."""
+        work = {
+            name: [
+                replace(item, technique=name)
+                for item in self.runner.build_work_items(test_cases, generator)
+            ]
+            for name, generator in technique_generators.items()
+        }
+        return work, ORDERINGS[self.ordering](work)
+
+    def rounds(self, slots: list[Slot], techniques: int) -> list[list[Slot]]:
+        """
+        Split ordered ``slots`` into the rounds longest-first may reorder.
+
+        A sequential session is split per technique. Interleaved orderings
+        are split into blocks of whole rounds (one call per technique),
+        enough of them to fill the runner's workers, so any prefix of the
+        queue still holds about as many calls of every technique.
+        """
+        if self.ordering == "sequential":
+            return [list(group) for _, group in groupby(slots, key=lambda slot: slot[0])]
+        size = max(1, techniques) * math.ceil(self.runner.max_workers / max(1, techniques))
+        return [slots[start:start + size] for start in range(0, len(slots), size)]
+
+    def run(
+        self,
+        technique_generators: dict[str, Callable[[dict], str]],
+        test_cases: pd.DataFrame | None = None,
+        resume: bool = False,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Run all techniques from one queue.
+
+        Parameters
+        ----------
+        technique_generators : dict
+            Technique name to prompt generator.
+        test_cases : pd.DataFrame, optional
+            Cases to run; loaded from the runner's data path by default.
+        resume : bool
+            Skip calls already recorded in the techniques' checkpoints.
+
+        Returns
+        -------
+        dict
+            Technique name to its ordered results DataFrame.
+        """
+        runner = self.runner
+        if runner.config.adaptive_runs:
+            logger.warning(
+                "Adaptive runs apply to single-technique runs; the session uses runs_per_case"
+            )
+        if test_cases is None:
+            test_cases = runner.load_test_cases()
+        # Each call carries its technique, for clients keeping per-technique state
+        runner.reset_reports()
+        work, order = self.plan(technique_generators, test_cases)
+        total_calls = len(order)
+        logger.info(
+            f"Session plan: {len(work)} techniques x {len(test_cases)} cases x "
+            f"{runner.config.runs_per_case} runs = {total_calls} calls ({self.ordering} order)"
+        )
+
+        stores, results, pending = {}, {}, set()
+        for name, items in work.items():
+            stores[name], results[name], indices = runner.open_checkpoint(name, items, resume)
+            pending.update((name, index) for index in indices)
+        slots = [slot for slot in order if slot in pending]
+        progress = runner.start_progress(
+            "session", [row for rows in results.values() for row in rows]
+        )
+        runner.start_budget()
+        slots = runner.plan_dispatch(
+            slots, lambda slot: (slot[0], work[slot[0]][slot[1]]), self.rounds(slots, len(work))
+        )
+
+        race = self.race
+        if race is not None:
+            for name, rows in results.items():
+                for row in rows:
+                    if row is not None:
+                        race.update(name, row["correct"])
+
+        def record(position: int, result: dict) -> None:
+            name, index = slots[position]
+            results[name][index] = result
+            stores[name].append(result)
+            progress.record(result["correct"], result["success"], result["latency_ms"])
+            if race is not None and result["success"]:
+                for retired in race.update(name, result["correct"]):
+                    logger.info(f"Race: retired {retired} ({race.entries[retired].reason})")
+
+        def skip(position: int) -> bool:
+            if race is None or not race.is_retired(slots[position][0]):
+                return False
+            progress.skip()
+            return True
+
+        started = time.monotonic()
+        try:
+            with runner.graceful_stop():
+                runner.dispatch([work[name][index] for name, index in slots], record, skip=skip)
+        finally:
+            for store in stores.values():
+                store.close()
+            runner.finish_progress(progress)
+            runner.report_dispatch(
+                {(name, index): results[name][index] for name, index in slots},
+                runner.max_workers, time.monotonic() - started, lambda slot: slot[0],
+            )
+
+        all_results = self.results = {
+            name: runner.save_results(name, [row for row in rows if row is not None])
+            for name, rows in results.items()
+            if any(row is not None for row in rows)
+        }
+        runner.save_comparison(all_results)
+        if race is not None:
+            report = race.report()
+            report["calls_skipped"] = total_calls - progress.total
+            with open(runner.results_dir / "stats" / "race_report.json", "w") as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Race skipped {report['calls_skipped']} of {total_calls} calls")
+        if runner.stop_requested and progress.completed < progress.total:
+            raise RunInterrupted(
+                f"Session stopped after {progress.completed}/{progress.total} calls; partial "
+                f"results were saved for {len(all_results)} techniques; "
+                f"rerun with resume to continue"
+            )
+        return all_results
@@ -0,0 +1,51 @@
+"""Stratification of test cases by category and difficulty."""
+
+from itertools import zip_longest
+
+# Columns defining a stratum of the test set
+STRATA_KEYS = ("category", "difficulty")
+
+
+def stratum_of(case: dict, keys: tuple[str, ...] = STRATA_KEYS) -> str:
+    """Label of the stratum a case belongs to, e.g. ``"math/2"``."""
+    return "/".join(str(case.get(key)) for key in keys)
+
+
+def interleave(sequences: list[list]) -> list:
+    """Take one element of each sequence in turn until all are exhausted."""
+    return [item for group in zip_longest(*sequences) for item in group if item is not None]
+
+
+def stratified_indices(
+    work: list, indices: list[int] | None = None, keys: tuple[str, ...] = STRATA_KEYS
+) -> list[int]:
+    """
+    Order work items so every prefix is spread evenly over the strata.
+
+    Items are grouped by case (the runs of a case stay together, so a case
+    that was started is finished) and the cases of each stratum are taken
+    in turn, in file order within the stratum.
+
+    Parameters
+    ----------
+    work : list of WorkItem
+        Work items, each with a ``case`` dict.
+    indices : list of int, optional
+        Subset of ``work`` to order (all items by default).
+    keys : tuple of str
+        Case fields defining the strata.
+
+    Returns
+    -------
+    list of int
+        ``indices`` in stratified order.
+    """
+    indices = range(len(work)) if indices is None else indices
+    cases: dict = {}
+    for index in indices:
+        case = work[index].case
+        cases.setdefault(case.get("id", ("index", index)), []).append(index)
+    strata: dict[str, list[list[int]]] = {}
+    for case_indices in cases.values():
+        strata.setdefault(stratum_of(work[case_indices[0]].case, keys), []).append(case_indices)
+    return [index for case_indices in interleave(list(strata.values())) for index in case_indices]
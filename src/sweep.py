@@ -0,0 +1,179 @@
+"""Sweeps of several models x techniques, loading one model at a time."""
+
+import json
+import logging
+import re
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Type
+
+import pandas as pd
+
+from .checkpoint import RunInterrupted
+from .cli_runner import run_session
+from .config import Config
+from .host_pool import create_ollama_client
+from .prompts.base import BasePromptGenerator
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Server load time above which a call is counted as having reloaded the model
+RELOAD_THRESHOLD_MS = 500.0
+
+
+def model_slug(model: str) -> str:
+    """Directory name for a model tag, e.g. ``"llama3.2_1b"`` for ``"llama3.2:1b"``."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+
+
+def load_report(results_df: pd.DataFrame) -> dict:
+    """
+    Separate model load time from the latency of a technique's calls.
+
+    Ollama reports ``load_duration`` on every call; a call that found the
+    model evicted carries the whole reload in it. Such calls are counted,
+    and the median latency is also given without the load time so models
+    and runs stay comparable.
+
+    Returns
+    -------
+    dict
+        ``reloads`` (calls over :data:`RELOAD_THRESHOLD_MS`), their
+        ``reload_ms``, and the median latency with and without load time.
+    """
+    ok = results_df[results_df["success"].astype(bool)]
+    if "load_duration" in ok:
+        load_ms = pd.to_numeric(ok["load_duration"], errors="coerce").fillna(0.0) / 1e6
+    else:
+        load_ms = pd.Series(0.0, index=ok.index)
+    reloads = load_ms > RELOAD_THRESHOLD_MS
+    return {
+        "reloads": int(reloads.sum()),
+        "reload_ms": float(load_ms[reloads].sum()),
+        "median_latency_ms": float(ok["latency_ms"].median()) if len(ok) else None,
+        "median_latency_excl_load_ms": (
+            float((ok["latency_ms"] - load_ms).median()) if len(ok) else None
+        ),
+    }
+
+
+def summarize_model(model: str, stats: dict[str, dict], partition: Path, wall_s: float) -> dict:
+    """Collect a model's load time and per-technique results from its partition."""
+    session_path = partition / "session_stats.json"
+    warmup = {}
+    if session_path.exists():
+        with open(session_path) as f:
+            warmup = json.load(f).get("warmup", {})
+    techniques = {}
+    for name, technique_stats in stats.items():
+        results_path = partition / f"{name}_results.csv"
+        loads = load_report(pd.read_csv(results_path)) if results_path.exists() else {}
+        techniques[name] = {
+            "accuracy": technique_stats["overall"]["accuracy"],
+            "calls": technique_stats["overall"]["count"],
+            "partial": technique_stats.get("partial", False),
+            **loads,
+        }
+    return {
+        "model": model,
+        "results_dir": str(partition),
+        "model_load_ms": warmup.get("load_duration_ms"),
+        "warmup_ms": warmup.get("latency_ms"),
+        "wall_s": wall_s,
+        "techniques": techniques,
+    }
+
+
+def evict(config: Config) -> bool:
+    """Unload ``config.model_name`` from Ollama now (``keep_alive=0``)."""
+    with create_ollama_client(config) as client:
+        return client.unload()
+
+
+def run_sweep(
+    models: list[str],
+    techniques: list[tuple[str, Type[BasePromptGenerator], str, int]],
+    results_dir: str | Path = "results/sweep",
+    **session_options,
+) -> dict[str, dict]:
+    """
+    Run every technique on every model, one model at a time.
+
+    All calls of a model run as one session (see
+    :func:`~src.cli_runner.run_session`) while the model is kept resident
+    with ``keep_alive=-1``; it is then unloaded before the next model is
+    loaded, so each model is loaded exactly once and never competes with
+    another for memory. The warm-up's load time is recorded separately
+    from per-call latency. Results go to ``<results_dir>/<model>/`` and a
+    summary to ``<results_dir>/sweep_summary.json`` and
+    ``sweep_comparison.csv``.
+
+    Parameters
+    ----------
+    models : list of str
+        Ollama model tags, run in this order.
+    techniques : list of tuple
+        (name, generator class, display name, time factor) per technique.
+    results_dir : str or Path
+        Root of the per-model result directories.
+    **session_options
+        Passed on to ``run_session`` (ordering, max_workers, resume, ...).
+
+    Returns
+    -------
+    dict
+        Model tag to its summary.
+    """
+    results_dir = Path(results_dir)
+    summary: dict[str, dict] = {}
+    for position, model in enumerate(models, 1):
+        print("\n" + "#" * 60)
+        print(f"# Model {position}/{len(models)}: {model}")
+        print("#" * 60)
+        partition = results_dir / model_slug(model)
+        started = time.monotonic()
+        interrupted = None
+        try:
+            stats = run_session(
+                techniques, keep_alive=-1, model=model, results_dir=partition, **session_options
+            )
+        except RunInterrupted as e:
+            interrupted = e
+            stats = _saved_stats(partition, techniques)
+        finally:
+            if evict(replace(Config.from_env(), model_name=model)):
+                print(f"\n  Unloaded {model} from Ollama")
+            else:
+                logger.warning(f"Could not unload {model}")
+        summary[model] = summarize_model(model, stats, partition, time.monotonic() - started)
+        _save_summary(results_dir, summary)
+        if interrupted is not None:
+            raise interrupted
+    return summary
+
+
+def _saved_stats(partition: Path, techniques: list[tuple]) -> dict[str, dict]:
+    """Read the stats a stopped session saved for each technique."""
+    stats = {}
+    for name, *_ in techniques:
+        path = partition / f"{name}_stats.json"
+        if path.exists():
+            with open(path) as f:
+                stats[name] = json.load(f)
+    return stats
+
+
+def _save_summary(results_dir: Path, summary: dict[str, dict]) -> None:
+    """Write the sweep summary JSON and a model x technique comparison CSV."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    with open(results_dir / "sweep_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    rows = [
+        {"model": model, "technique": name, "model_load_ms": entry["model_load_ms"], **technique}
+        for model, entry in summary.items()
+        for name, technique in entry["techniques"].items()
+    ]
+    pd.DataFrame(rows).to_csv(results_dir / "sweep_comparison.csv", index=False)
+    logger.info(f"Sweep summary saved for {len(summary)} models in {results_dir}")
@@ -0,0 +1,51 @@
+"""Wall-clock budget of a run: stop starting calls before it runs out."""
+
+import logging
+import time
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class TimeBudget:
+    """
+    Deadline after which a run starts no new call.
+
+    A call is only started if the p95 latency measured so far still fits
+    before the deadline, so the calls in flight finish inside it. Once
+    that no longer holds the budget is :attr:`exhausted` for the rest of
+    the run.
+    """
+
+    def __init__(self) -> None:
+        """Create a budget that is not running."""
+        self.deadline: float | None = None
+        self.exhausted = False
+
+    @property
+    def running(self) -> bool:
+        """Whether a budget was started for the current run."""
+        return self.deadline is not None
+
+    def start(self, seconds: float | None) -> bool:
+        """Start a budget of ``seconds`` (none if unset or 0); return whether one runs."""
+        self.exhausted = False
+        if not seconds:
+            self.deadline = None
+            return False
+        self.deadline = time.monotonic() + seconds
+        logger.info(f"Time budget: {seconds:.0f}s")
+        return True
+
+    def out_of_time(self, p95_ms: float | None) -> bool:
+        """Return True once a call of ``p95_ms`` would no longer finish within the budget."""
+        if self.deadline is None:
+            return False
+        if not self.exhausted:
+            if time.monotonic() + (p95_ms or 0.0) / 1000 < self.deadline:
+                return False
+            self.exhausted = True
+            logger.warning(
+                "Time budget nearly spent; finishing calls in flight, results will be partial"
+            )
+        return True
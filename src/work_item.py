@@ -0,0 +1,36 @@
+"""A single (case, run) call of a technique, as dispatched by the runners."""
+
+from dataclasses import dataclass, field
+
+from .ollama_client import StopCondition
+
+
+@dataclass
+class WorkItem:
+    """
+    A single (case, run) call of a technique.
+
+    Attributes
+    ----------
+    case : dict
+        Test case row.
+    prompt : str
+        Prompt generated for the case.
+    run : int
+        Run index, starting at 1.
+    options : dict
+        Generation options sent with the call.
+    stop_when : StopCondition, optional
+        Detector that ends the streamed generation once the final answer
+        is complete.
+    technique : str, optional
+        Technique the call belongs to, for clients keeping per-technique
+        state; set when techniques are interleaved in one session.
+    """
+
+    case: dict
+    prompt: str
+    run: int
+    options: dict = field(default_factory=dict)
+    stop_when: StopCondition | None = None
+    technique: str | None = None
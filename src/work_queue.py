@@ -0,0 +1,373 @@
+"""Durable SQLite work queue of technique x case x run items shared by worker processes."""
+
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import pandas as pd
+
+from .config import Config
+from .stratification import interleave
+from .sweep import model_slug
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# SQLite journal modes accepted by ``WorkQueue``
+JOURNAL_MODES = ("wal", "delete")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    technique TEXT NOT NULL,
+    case_id TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    case_json TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    UNIQUE (model, technique, case_id, run)
+);
+CREATE INDEX IF NOT EXISTS items_by_state ON items (model, state, not_before);
+CREATE TABLE IF NOT EXISTS results (
+    item_id INTEGER PRIMARY KEY REFERENCES items (id),
+    worker TEXT NOT NULL,
+    committed_at REAL NOT NULL,
+    row_json TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class Lease:
+    """
+    A work item leased to one worker.
+
+    Attributes
+    ----------
+    item_id : int
+        Row id of the item in the queue.
+    token : str
+        Secret identifying this lease; completing or releasing the item
+        requires it, so a worker whose lease expired cannot commit.
+    model, technique : str
+        Model and technique to run.
+    case : dict
+        Test case row.
+    run : int
+        Run index, starting at 1.
+    attempts : int
+        Attempts of the item including this one.
+    expires : float
+        Wall-clock time (``time.time()``) at which the lease lapses.
+    """
+
+    item_id: int
+    token: str
+    model: str
+    technique: str
+    case: dict
+    run: int
+    attempts: int
+    expires: float
+
+
+def _failed_row(lease: Lease, worker: str, error: str) -> dict:
+    """Result row recording that an item was given up on."""
+    case = lease.case
+    return {
+        "id": case["id"],
+        "category": case.get("category"),
+        "difficulty": case.get("difficulty"),
+        "run": lease.run,
+        "expected": case.get("expected_answer"),
+        "correct": 0,
+        "confidence": 0.0,
+        "success": False,
+        "error": error,
+        "technique": lease.technique,
+        "model": lease.model,
+        "attempts": lease.attempts,
+        "worker": worker,
+    }
+
+
+class WorkQueue:
+    """
+    File-backed queue of (model, technique, case, run) items with leases.
+
+    Any number of processes may open the same file: enqueueing is
+    idempotent, a worker leases items for ``lease_s`` seconds, and an item
+    whose lease lapses (its worker died or hung) is handed out again, up
+    to ``max_attempts`` leases; an item that still has no result after
+    that (one that keeps killing its workers) is marked ``failed`` with a
+    failed result row, so the queue always drains.
+    Completing an item marks it done and stores its result row in one
+    transaction that only succeeds while the worker still holds the
+    lease, so each item's result is committed exactly once even if a slow
+    worker and its replacement both finish the call.
+
+    The database uses WAL journaling, so readers never block the writer;
+    WAL needs every process on the same host. For workers on several
+    machines sharing the file over a network filesystem use
+    ``journal_mode="delete"``, which relies on the filesystem's locks.
+
+    Parameters
+    ----------
+    path : str or Path
+        Database file, created if missing.
+    lease_s : float
+        Seconds a worker may hold an item before it is handed out again;
+        should exceed the slowest call including client retries.
+    journal_mode : str
+        ``"wal"`` or ``"delete"``.
+    busy_timeout : float
+        Seconds to wait for another process's write lock.
+    max_attempts : int, optional
+        Leases per item before it is failed; unlimited by default.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_s: float = 600.0,
+        journal_mode: str = "wal",
+        busy_timeout: float = 30.0,
+        max_attempts: int | None = None,
+    ) -> None:
+        """Open the queue, creating its tables if needed."""
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal mode {journal_mode!r}; choose from {JOURNAL_MODES}")
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self.busy_timeout = busy_timeout
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(f"PRAGMA journal_mode={journal_mode}")
+            db.executescript(SCHEMA)
+        logger.info(f"WorkQueue opened: {self.path} (journal={journal_mode}, lease={lease_s:.0f}s)")
+
+    @classmethod
+    def from_config(cls, config: Config) -> "WorkQueue":
+        """Open the queue named by the work queue settings."""
+        return cls(
+            config.queue_path, config.queue_lease_s, config.queue_journal_mode,
+            max_attempts=config.queue_max_attempts,
+        )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection in autocommit mode (one per call, so threads never share one)."""
+        db = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block as one write transaction, taking the write lock up front."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def enqueue(
+        self, models: list[str], techniques: list[str], test_cases: pd.DataFrame, runs: int
+    ) -> int:
+        """
+        Add every model x technique x case x run item not already queued.
+
+        Items are numbered model by model and, within a model, one call of
+        each technique in turn, which is the order workers lease them in.
+
+        Returns
+        -------
+        int
+            Items added.
+        """
+        cases = test_cases.to_dict("records")
+        added = 0
+        with self._transaction() as db:
+            for model in models:
+                per_technique = [
+                    [(technique, case, run) for case in cases for run in range(1, runs + 1)]
+                    for technique in techniques
+                ]
+                for technique, case, run in interleave(per_technique):
+                    cursor = db.execute(
+                        "INSERT OR IGNORE INTO items (model, technique, case_id, run, case_json) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (model, technique, str(case["id"]), run, json.dumps(case, default=str)),
+                    )
+                    added += cursor.rowcount
+        logger.info(f"Enqueued {added} items")
+        return added
+
+    def lease(self, worker: str, model: str, limit: int = 1) -> list[Lease]:
+        """
+        Lease up to ``limit`` ready items of ``model`` to ``worker``.
+
+        Ready items are pending ones whose retry delay has passed and
+        leased ones whose lease has lapsed, oldest first. A lapsed item
+        that already used ``max_attempts`` leases is failed instead.
+        """
+        now = time.time()
+        leases = []
+        with self._transaction() as db:
+            while len(leases) < limit:
+                rows = db.execute(
+                    "SELECT id, technique, case_json, run, attempts FROM items WHERE model = ? AND "
+                    "((state = 'pending' AND not_before <= ?) "
+                    "OR (state = 'leased' AND lease_expires <= ?)) ORDER BY id LIMIT ?",
+                    (model, now, now, limit - len(leases)),
+                ).fetchall()
+                if not rows:
+                    break
+                for item_id, technique, case_json, run, attempts in rows:
+                    lease = Lease(
+                        item_id, uuid.uuid4().hex, model, technique, json.loads(case_json), run,
+                        attempts + 1, now + self.lease_s,
+                    )
+                    if self.max_attempts is not None and attempts >= self.max_attempts:
+                        error = f"No result after {attempts} leases"
+                        logger.warning(f"Item {item_id} failed: {error}")
+                        db.execute(
+                            "UPDATE items SET state = 'failed', lease_expires = NULL WHERE id = ?",
+                            (item_id,),
+                        )
+                        row = _failed_row(replace(lease, attempts=attempts), worker, error)
+                        self._insert_result(db, item_id, worker, row)
+                        continue
+                    db.execute(
+                        "UPDATE items SET state = 'leased', lease_owner = ?, lease_token = ?, "
+                        "lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                        (worker, lease.token, lease.expires, item_id),
+                    )
+                    leases.append(lease)
+        return leases
+
+    def complete(self, lease: Lease, row: dict, worker: str) -> bool:
+        """
+        Commit the result row of a leased item.
+
+        Returns
+        -------
+        bool
+            False if the lease was lost to another worker; the row is then
+            discarded and the other worker's result counts.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = 'done', lease_expires = NULL "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (lease.item_id, lease.token),
+            )
+            if cursor.rowcount != 1:
+                logger.warning(f"Lease on item {lease.item_id} was lost; discarding its result")
+                return False
+            self._insert_result(db, lease.item_id, worker, row)
+        return True
+
+    def fail(self, lease: Lease, worker: str, error: str) -> bool:
+        """
+        Give up on a leased item, committing a failed row carrying ``error``.
+
+        Returns
+        -------
+        bool
+            False if the lease was lost to another worker.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = 'failed', lease_expires = NULL "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (lease.item_id, lease.token),
+            )
+            if cursor.rowcount != 1:
+                logger.warning(f"Lease on item {lease.item_id} was lost; not failing it")
+                return False
+            self._insert_result(db, lease.item_id, worker, _failed_row(lease, worker, error))
+        return True
+
+    @staticmethod
+    def _insert_result(db, item_id: int, worker: str, row: dict) -> None:
+        """Store the result row of an item."""
+        db.execute(
+            "INSERT INTO results (item_id, worker, committed_at, row_json) VALUES (?, ?, ?, ?)",
+            (item_id, worker, time.time(), json.dumps(row, default=str)),
+        )
+
+    def release(self, lease: Lease, delay: float = 0.0) -> bool:
+        """Return a leased item to the queue, to be leased again after ``delay`` seconds."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = 'pending', not_before = ?, lease_token = NULL, "
+                "lease_expires = NULL WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (time.time() + delay, lease.item_id, lease.token),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self, model: str | None = None) -> dict[str, int]:
+        """Items per state (``pending``, ``leased``, ``expired``, ``done``, ``failed``)."""
+        query = (
+            "SELECT CASE WHEN state = 'leased' AND lease_expires <= ? THEN 'expired' "
+            "ELSE state END, COUNT(*) FROM items"
+            + (" WHERE model = ?" if model else "")
+            + " GROUP BY 1"
+        )
+        params = (time.time(), model) if model else (time.time(),)
+        counts = {"pending": 0, "leased": 0, "expired": 0, "done": 0, "failed": 0}
+        with self._connect() as db:
+            counts.update(dict(db.execute(query, params).fetchall()))
+        return counts
+
+    def remaining(self, model: str | None = None) -> int:
+        """Items of ``model`` (or all models) without a committed result."""
+        counts = self.counts(model)
+        return counts["pending"] + counts["leased"] + counts["expired"]
+
+    def models(self) -> list[str]:
+        """Models with items in the queue, in enqueue order."""
+        with self._connect() as db:
+            rows = db.execute("SELECT model FROM items GROUP BY model ORDER BY MIN(id)")
+            return [row[0] for row in rows]
+
+    def results(self, model: str, technique: str) -> pd.DataFrame:
+        """Committed result rows of a model and technique, in enqueue ((case, run) file) order."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT r.row_json FROM results r JOIN items i ON i.id = r.item_id "
+                "WHERE i.model = ? AND i.technique = ? ORDER BY i.id",
+                (model, technique),
+            ).fetchall()
+        return pd.DataFrame([json.loads(row_json) for (row_json,) in rows])
+
+    def export(self, results_dir: str | Path) -> list[Path]:
+        """Write each model and technique's results to ``<model>/<technique>_results.csv``."""
+        with self._connect() as db:
+            pairs = db.execute(
+                "SELECT i.model, i.technique FROM results r JOIN items i ON i.id = r.item_id "
+                "GROUP BY i.model, i.technique ORDER BY MIN(i.id)"
+            ).fetchall()
+        paths = []
+        for model, technique in pairs:
+            path = Path(results_dir) / model_slug(model) / f"{technique}_results.csv"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.results(model, technique).to_csv(path, index=False)
+            paths.append(path)
+        return paths
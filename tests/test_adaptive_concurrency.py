@@ -0,0 +1,141 @@
+"""Tests for the adaptive (AIMD) concurrency limiter."""
+
+import asyncio
+import threading
+import time
+
+from src.adaptive_concurrency import AdaptiveConcurrencyClient, AIMDLimiter
+from src.config import Config
+from src.ollama_client import APIResponse
+
+
+def _ok(latency_ms: float) -> APIResponse:
+    return APIResponse(text="ok", latency_ms=latency_ms, success=True)
+
+
+FAILED = APIResponse(text="", latency_ms=0.0, success=False, error="Request timed out")
+
+
+def _window(limiter: AIMDLimiter, latency_ms: float, technique: str = "default") -> None:
+    """Run exactly one saturated decision window of calls at the given latency."""
+    size = max(limiter.min_samples, limiter.limit)
+    for _ in range(limiter.limit):
+        limiter.acquire()
+    for i in range(size):
+        limiter.release(_ok(latency_ms), technique)
+        if i < size - limiter.limit:
+            limiter.acquire()
+
+
+class QueueingServer:
+    """Fake server whose latency grows once more than ``capacity`` calls overlap."""
+
+    def __init__(self, capacity: int, service_s: float = 0.01) -> None:
+        self.capacity = capacity
+        self.service_s = service_s
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            overload = max(self.active - self.capacity, 0)
+        start = time.perf_counter()
+        time.sleep(self.service_s * (1 + 3 * overload))
+        with self._lock:
+            self.active -= 1
+        return _ok((time.perf_counter() - start) * 1000)
+
+
+class TestAIMDLimiter:
+    """Tests for AIMDLimiter class."""
+
+    def test_from_config(self) -> None:
+        """Test bounds and tolerance come from the configuration."""
+        config = Config(adaptive_max_concurrency=6, adaptive_latency_tolerance=1.5)
+        limiter = AIMDLimiter.from_config(config)
+        assert (limiter.limit, limiter.max_limit, limiter.tolerance) == (1, 6, 1.5)
+
+    def test_grows_additively_while_latency_flat(self) -> None:
+        """Test saturated windows with flat latency raise the limit by one."""
+        limiter = AIMDLimiter(max_limit=4)
+        for expected in (2, 3, 4, 4):
+            _window(limiter, 100.0)
+            assert limiter.limit == expected
+
+    def test_cuts_on_latency_spike(self) -> None:
+        """Test a p50 above tolerance x baseline halves the limit."""
+        limiter = AIMDLimiter(initial=8, max_limit=16, min_samples=8)
+        _window(limiter, 100.0)
+        assert limiter.limit == 9
+        _window(limiter, 300.0)
+        assert limiter.limit == 4
+
+    def test_cuts_on_error(self) -> None:
+        """Test a failed call cuts the limit immediately."""
+        limiter = AIMDLimiter(initial=6)
+        limiter.acquire()
+        limiter.release(FAILED)
+        assert limiter.limit == 3
+        assert [limit for _, limit in limiter.telemetry()["history"]] == [6, 3]
+
+    def test_unsaturated_window_does_not_grow(self) -> None:
+        """Test the limit only grows when calls actually used it."""
+        limiter = AIMDLimiter(initial=4)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(_ok(100.0))
+        assert limiter.limit == 4
+
+    def test_reset_baseline(self) -> None:
+        """Test a slower technique starts from a fresh baseline."""
+        limiter = AIMDLimiter(initial=4, max_limit=8)
+        _window(limiter, 100.0)
+        limiter.reset_baseline()
+        _window(limiter, 1000.0)
+        assert limiter.limit == 6
+
+
+    def test_baselines_are_per_technique(self) -> None:
+        """Test an interleaved slower technique is judged against its own baseline."""
+        limiter = AIMDLimiter(max_limit=8)
+        for _ in range(2):
+            _window(limiter, 100.0, "fast")
+            _window(limiter, 1000.0, "slow")
+        assert limiter.limit == 5
+        assert limiter.baselines_ms == {"fast": 100.0, "slow": 1000.0}
+
+
+class TestAdaptiveConcurrencyClient:
+    """Tests for AdaptiveConcurrencyClient class."""
+
+    def test_converges_near_server_capacity(self) -> None:
+        """Test the limit settles around the server's parallel capacity."""
+        server = QueueingServer(capacity=3)
+        limiter = AIMDLimiter(max_limit=12, min_samples=3)
+        client = AdaptiveConcurrencyClient(server, limiter)
+        threads = [
+            threading.Thread(target=lambda: [client.query("p") for _ in range(15)])
+            for _ in range(12)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert limiter.in_flight == 0
+        assert 2 <= limiter.telemetry()["peak_limit"] <= 8
+        assert limiter.limit <= 6
+
+    def test_aquery_respects_limit(self) -> None:
+        """Test coroutines never exceed the current limit."""
+        server = QueueingServer(capacity=100)
+        client = AdaptiveConcurrencyClient(server, AIMDLimiter(initial=2, max_limit=2))
+
+        async def run_all() -> None:
+            await asyncio.gather(*(client.aquery(f"p{i}") for i in range(8)))
+
+        asyncio.run(run_all())
+        assert server.peak <= 2
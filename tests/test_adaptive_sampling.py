@@ -0,0 +1,148 @@
+"""Tests for adaptive runs per case."""
+
+import threading
+
+import pandas as pd
+
+from src.adaptive_sampling import AdaptiveSampler
+from src.config import Config
+from src.experiment_runner import ExperimentRunner
+from src.ollama_client import APIResponse
+
+
+def _row(correct: int, confidence: float = 1.0, success: bool = True) -> dict:
+    return {"correct": correct, "confidence": confidence, "success": success}
+
+
+class TestAdaptiveSampler:
+    """Tests for AdaptiveSampler decisions."""
+
+    def test_consistent_case_is_settled(self) -> None:
+        """Test agreeing, confidently scored runs need no more samples."""
+        sampler = AdaptiveSampler()
+        assert not sampler.needs_more([_row(1), _row(1)])
+        assert not sampler.needs_more([_row(0, 0.0), _row(0, 0.0)])
+
+    def test_disagreement_and_borderline(self) -> None:
+        """Test flipping or borderline semantic cases get more runs up to max_runs."""
+        sampler = AdaptiveSampler(max_runs=4, semantic_threshold=0.8)
+        assert sampler.needs_more([_row(1), _row(0, 0.0)])
+        assert sampler.needs_more([_row(1, 0.82), _row(0, 0.78)], "semantic")
+        assert not sampler.needs_more([_row(1), _row(0, 0.0)] * 2)
+
+    def test_fuzzy_matches_are_not_borderline(self) -> None:
+        """Test a consistently verbose but correct answer (confidence 0.9) is settled."""
+        sampler = AdaptiveSampler()
+        assert not sampler.needs_more([_row(1, 0.9), _row(1, 0.9)], "exact")
+        assert not sampler.needs_more([_row(1, 0.85), _row(1, 0.85)], "numeric")
+        assert not sampler.needs_more([_row(1, 0.9), _row(1, 0.9)], "semantic")
+
+    def test_one_borderline_run_does_not_outweigh_agreement(self) -> None:
+        """Test agreeing semantic runs stay settled unless most of them are borderline."""
+        sampler = AdaptiveSampler(semantic_threshold=0.8)
+        assert not sampler.needs_more([_row(1, 0.95), _row(1, 0.81)], "semantic")
+        assert sampler.needs_more([_row(1, 0.81), _row(1, 0.83)], "semantic")
+
+    def test_failed_runs_do_not_count_toward_agreement(self) -> None:
+        """Test a case whose only run failed is sampled again."""
+        sampler = AdaptiveSampler(initial_runs=1)
+        assert sampler.agreement_of([_row(0, 0.0, success=False)]) == 0.0
+        assert sampler.needs_more([_row(0, 0.0, success=False)])
+
+    def test_budget_goes_to_least_consistent(self) -> None:
+        """Test the call budget prefers the cases that disagree most."""
+        sampler = AdaptiveSampler(max_runs=10, call_budget=9)
+        rows = {
+            "a": [_row(1), _row(1), _row(1), _row(0, 0.0)],
+            "b": [_row(1), _row(0, 0.0)],
+            "c": [_row(1), _row(1)],
+        }
+        assert sampler.plan_round(rows, calls_used=8) == ["b"]
+        assert sampler.plan_round(rows, calls_used=9) == []
+
+
+class FlipClient:
+    """Answers even-numbered cases inconsistently (correct on odd runs only)."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    def query(self, prompt: str, *, run: int = 1, **kwargs) -> APIResponse:
+        number = int(prompt.split("What is ")[1].split(" +")[0])
+        with self._lock:
+            self.calls.append((number, run))
+        answer = str(number) if number % 2 or run % 2 else "wrong"
+        return APIResponse(text=answer, latency_ms=1.0, success=True)
+
+
+def _cases(count: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": range(1, count + 1),
+        "category": ["math"] * count,
+        "difficulty": [1] * count,
+        "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+        "expected_answer": [str(i) for i in range(1, count + 1)],
+        "answer_type": ["numeric"] * count,
+    })
+
+
+class TestAdaptiveRuns:
+    """Tests for ExperimentRunner with adaptive runs."""
+
+    def _config(self, **overrides) -> Config:
+        return Config(adaptive_runs=True, adaptive_initial_runs=2, adaptive_max_runs=5, **overrides)
+
+    def test_extra_runs_only_for_inconsistent_cases(self, tmp_path) -> None:
+        """Test stable cases keep their initial runs and flipping cases get more."""
+        client = FlipClient()
+        runner = ExperimentRunner(
+            self._config(), client=client, results_dir=str(tmp_path), progress_listeners=[]
+        )
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", _cases(4))
+
+        runs = df.groupby("id")["run"].max().to_dict()
+        assert runs == {1: 2, 2: 5, 3: 2, 4: 5}
+        assert list(zip(df["id"], df["run"])) == sorted(zip(df["id"], df["run"]))
+        assert len(client.calls) == len(df) == 14
+        assert runner.progress.total == 14
+
+    def test_verbose_exact_answers_keep_initial_runs(self, tmp_path) -> None:
+        """Test stable answers scored 0.9 for extra wording are not resampled."""
+        class VerboseClient:
+            def query(self, prompt: str, **kwargs) -> APIResponse:
+                return APIResponse(text="The sentiment is negative.", latency_ms=1.0, success=True)
+
+        cases = _cases(3).assign(expected_answer="negative", answer_type="exact")
+        runner = ExperimentRunner(
+            self._config(), client=VerboseClient(), results_dir=str(tmp_path), progress_listeners=[]
+        )
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", cases)
+
+        assert len(df) == 6
+        assert (df["confidence"] == 0.9).all()
+
+    def test_call_budget(self, tmp_path) -> None:
+        """Test extra runs stop once the budget is spent."""
+        client = FlipClient()
+        runner = ExperimentRunner(
+            self._config(adaptive_call_budget=10), client=client, results_dir=str(tmp_path),
+            progress_listeners=[],
+        )
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", _cases(4))
+        assert len(df) == 10
+
+    def test_resume_reuses_rows(self, tmp_path) -> None:
+        """Test a resumed adaptive run only calls for rows not yet recorded."""
+        config = self._config()
+        generator = lambda case: f"Q: {case['question']}"
+        ExperimentRunner(
+            config, client=FlipClient(), results_dir=str(tmp_path), progress_listeners=[]
+        ).run_technique("fake", generator, _cases(4))
+        client = FlipClient()
+        df = ExperimentRunner(
+            config, client=client, results_dir=str(tmp_path), progress_listeners=[]
+        ).run_technique("fake", generator, _cases(4), resume=True)
+        # Every call succeeded the first time, so each round is served from the checkpoint
+        assert client.calls == []
+        assert len(df) == 14
@@ -0,0 +1,67 @@
+"""Tests for the answer detector module."""
+
+import pytest
+
+from src.answer_detector import AnswerDetector
+from src.prompts.chain_of_thought import ChainOfThoughtPromptGenerator
+from src.prompts.improved import ImprovedPromptGenerator
+
+
+class TestAnswerDetector:
+    """Tests for AnswerDetector class."""
+
+    @pytest.mark.parametrize(
+        "text, complete",
+        [
+            ("Reasoning: 12 * 3\nFinal Answer: 3", False),
+            ("Reasoning: 12 * 3\nFinal Answer: 36", False),
+            ("Reasoning: 12 * 3\nFinal Answer: 36\n", True),
+            ("final answer: $1,200.50 total", True),
+            ("Final Answer: 3.", False),
+            ("Final Answer: 3.14\n", True),
+            ("Final Answer: 1/", False),
+            ("Final Answer: 1/2 apples", True),
+        ],
+    )
+    def test_numeric_answers(self, text: str, complete: bool) -> None:
+        """Test numeric answers are complete only after the number ends."""
+        detector = AnswerDetector.for_answer_type("numeric", "Final Answer:")
+
+        assert detector(text) is complete
+
+    def test_exact_answer_needs_word_boundary(self) -> None:
+        """Test one-word answers are complete after the word ends."""
+        detector = AnswerDetector.for_answer_type("exact", "Final Answer:")
+
+        assert not detector("Final Answer: negat")
+        assert detector("Final Answer: **negative**")
+
+    def test_exact_answer_waits_past_inner_punctuation(self) -> None:
+        """Test a prefix ending in "." or "/" is not taken as the whole answer."""
+        detector = AnswerDetector.for_answer_type("exact", "Final Answer:")
+
+        assert not detector("Final Answer: 3.")
+        assert not detector("Final Answer: 3.14")
+        assert detector("Final Answer: 3.14\n")
+        assert detector("Final Answer: negative. The")
+
+    def test_free_text_answer_waits_for_line_end(self) -> None:
+        """Test contains/semantic answers are complete at the end of the line."""
+        detector = AnswerDetector.for_answer_type("contains", "Final Answer:")
+
+        assert not detector("Final Answer: the hot water")
+        assert detector("Final Answer: the hot water tap\nExplanation")
+
+
+class TestGeneratorDetectors:
+    """Tests for per-technique answer detectors."""
+
+    def test_cot_has_detector(self) -> None:
+        """Test CoT builds a detector from its final-answer marker."""
+        detector = ChainOfThoughtPromptGenerator().answer_detector({"answer_type": "numeric"})
+
+        assert detector("Step 1...\nFinal Answer: 42\n")
+
+    def test_short_answer_techniques_have_no_detector(self) -> None:
+        """Test techniques without a final-answer line are not streamed early."""
+        assert ImprovedPromptGenerator().answer_detector({"answer_type": "exact"}) is None
@@ -1,5 +1,9 @@
 """Tests for the answer evaluator module."""
 
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 
 from src.answer_evaluator import AnswerEvaluator, AnswerType
@@ -126,3 +130,33 @@ class TestAnswerTypes:
         assert AnswerType.NUMERIC.value == "numeric"
         assert AnswerType.CONTAINS.value == "contains"
         assert AnswerType.SEMANTIC.value == "semantic"
+
+
+class TestAnswerEvaluatorThreadSafety:
+    """Tests for sharing an AnswerEvaluator between threads."""
+
+    def test_embedder_created_once_across_threads(self) -> None:
+        """Test concurrent semantic evaluations build a single embedder."""
+        created = []
+
+        class SlowEmbedder:
+            def __init__(self, name: str) -> None:
+                time.sleep(0.05)
+                created.append(name)
+
+            def encode(self, texts: list) -> list:
+                return [[1.0, 0.0], [1.0, 0.0]]
+
+        evaluator = AnswerEvaluator()
+        fake_module = type("M", (), {"SentenceTransformer": SlowEmbedder})
+        with patch.dict("sys.modules", {"sentence_transformers": fake_module}):
+            threads = [
+                threading.Thread(target=evaluator.evaluate, args=("a", "a", "semantic"))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(created) == 1
@@ -0,0 +1,96 @@
+"""Tests for the throughput calibration module."""
+
+import threading
+import time
+
+import pandas as pd
+
+from src.calibration import CalibrationProfile, calibrate, probe_cases
+from src.config import Config
+from src.ollama_client import APIResponse
+from src.prompts import BaselinePromptGenerator, ChainOfThoughtPromptGenerator
+
+
+class ParallelServer:
+    """Fake server serving ``capacity`` calls in parallel and queueing the rest."""
+
+    def __init__(self, capacity: int, service_s: float = 0.02) -> None:
+        self.service_s = service_s
+        self.slots = threading.Semaphore(capacity)
+        self.calls = 0
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        start = time.perf_counter()
+        self.calls += 1
+        with self.slots:
+            time.sleep(self.service_s)
+        return APIResponse(text="42", latency_ms=(time.perf_counter() - start) * 1000, success=True)
+
+
+def _cases() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": list(range(1, 9)),
+            "category": ["math", "logic", "facts", "code"] * 2,
+            "difficulty": [1] * 8,
+            "question": [f"Question {i}?" for i in range(1, 9)],
+            "expected_answer": ["42"] * 8,
+            "answer_type": ["numeric"] * 8,
+        }
+    )
+
+
+class TestProbeCases:
+    """Tests for probe case selection."""
+
+    def test_covers_categories_first(self) -> None:
+        """Test the probe set spans categories before repeating one."""
+        assert set(probe_cases(_cases(), 4)["category"]) == {"math", "logic", "facts", "code"}
+        assert len(probe_cases(_cases(), 6)) == 6
+
+
+class TestCalibrate:
+    """Tests for the calibration sweep."""
+
+    def test_recommends_server_capacity(self) -> None:
+        """Test the knee of the throughput curve is the server's parallelism."""
+        server = ParallelServer(capacity=2, service_s=0.05)
+        techniques = {"baseline": BaselinePromptGenerator, "cot": ChainOfThoughtPromptGenerator}
+        profile = calibrate(
+            server, Config(), _cases(), techniques, [1, 2, 4], cases_per_technique=4
+        )
+
+        assert profile.recommended_concurrency == 2
+        assert set(profile.curves) == {"baseline", "cot"}
+        assert [level["concurrency"] for level in profile.curves["cot"]] == [1, 2, 4]
+        assert profile.techniques["baseline"]["p50_ms"] > 0
+        assert profile.recommended_read_timeout >= 10.0
+
+
+class TestCalibrationProfile:
+    """Tests for CalibrationProfile class."""
+
+    def _profile(self) -> CalibrationProfile:
+        curve = [
+            {"concurrency": 1, "throughput_rps": 0.5},
+            {"concurrency": 4, "throughput_rps": 1.6},
+        ]
+        return CalibrationProfile(
+            model="llama3.2:3b", host="http://localhost:11434", created="2026-01-01T00:00:00",
+            recommended_concurrency=4, recommended_read_timeout=30.0, curves={"cot": curve},
+        )
+
+    def test_estimate_uses_matching_level(self) -> None:
+        """Test the estimate uses the highest calibrated level not above the workers."""
+        profile = self._profile()
+        assert profile.estimate_seconds("cot", 200, 1) == 400.0
+        assert profile.estimate_seconds("cot", 200, 8) == 125.0
+        assert profile.estimate_seconds("baseline", 200, 1) is None
+
+    def test_save_and_load(self, tmp_path) -> None:
+        """Test a profile survives a JSON round trip."""
+        path = tmp_path / "nested" / "profile.json"
+        self._profile().save(str(path))
+
+        assert CalibrationProfile.load(str(path)) == self._profile()
+        assert CalibrationProfile.load(str(tmp_path / "missing.json")) is None
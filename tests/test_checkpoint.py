@@ -0,0 +1,40 @@
+"""Tests for the checkpoint module."""
+
+import numpy as np
+
+from src.checkpoint import CheckpointStore, checkpoint_key
+
+
+def _row(case_id, run: int = 1, success: bool = True) -> dict:
+    return {"id": case_id, "run": run, "success": success, "correct": 1}
+
+
+class TestCheckpointStore:
+    """Tests for CheckpointStore class."""
+
+    def test_numpy_values_round_trip_as_numbers(self, tmp_path) -> None:
+        """Test numpy scalars are stored as numbers, not their string form."""
+        store = CheckpointStore(str(tmp_path / "fake.jsonl"), "fake", "m1")
+        store.append(
+            {**_row(np.int64(12)), "success": np.bool_(True), "latency_ms": np.float64(1.5)}
+        )
+        store.close()
+
+        row = store.completed()[checkpoint_key(12, 1)]
+        assert row["id"] == 12 and isinstance(row["id"], int)
+        assert row["success"] is True and row["latency_ms"] == 1.5
+
+    def test_reset_keeps_other_models_rows(self, tmp_path) -> None:
+        """Test a fresh run of one model leaves another model's checkpoint resumable."""
+        path = str(tmp_path / "fake.jsonl")
+        other = CheckpointStore(path, "fake", "m1")
+        other.append(_row(1))
+        other.close()
+        store = CheckpointStore(path, "fake", "m2")
+        store.append(_row(1))
+        store.close()
+
+        store.reset()
+
+        assert store.completed() == {}
+        assert list(other.completed()) == [checkpoint_key(1, 1)]
@@ -64,3 +64,45 @@ class TestConfig:
         assert config.max_retries == 10
         assert config.retry_delay == 5.0
         assert config.runs_per_case == 7
+
+    def test_config_connection_pool_defaults(self) -> None:
+        """Test connection pool and timeout defaults."""
+        config = Config()
+
+        assert config.pool_maxsize == 8
+        assert config.pool_block is True
+        assert config.connect_timeout == 5.0
+        assert config.read_timeout == 120.0
+
+    @patch.dict(
+        os.environ,
+        {"POOL_MAXSIZE": "16", "POOL_BLOCK": "false", "READ_TIMEOUT": "300"},
+    )
+    def test_config_connection_pool_from_env(self) -> None:
+        """Test connection pool settings are read from the environment."""
+        config = Config.from_env()
+
+        assert config.pool_maxsize == 16
+        assert config.pool_block is False
+        assert config.read_timeout == 300.0
+
+    def test_generation_options_only_include_set_values(self) -> None:
+        """Test unset generation options are left to the technique/server."""
+        assert Config().generation_options() == {}
+        assert Config(temperature=0.0, seed=7).generation_options() == {
+            "temperature": 0.0,
+            "seed": 7,
+        }
+
+    @patch.dict(
+        os.environ,
+        {"NUM_PREDICT": "64", "TEMPERATURE": "0", "STOP": '["\\n\\n", "Question:"]'},
+    )
+    def test_generation_options_from_env(self) -> None:
+        """Test generation options are parsed from the environment."""
+        config = Config.from_env()
+
+        assert config.num_predict == 64
+        assert config.temperature == 0.0
+        assert config.stop == ["\n\n", "Question:"]
+        assert config.num_ctx is None
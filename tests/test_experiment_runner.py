@@ -0,0 +1,398 @@
+"""Tests for the experiment runner module."""
+
+import asyncio
+import json
+import os
+import random
+import signal
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.checkpoint import RunInterrupted
+from src.config import Config
+from src.experiment_runner import ExperimentRunner
+from src.ollama_client import APIResponse
+from src.prompts.improved import ImprovedPromptGenerator
+
+
+def _make_cases(count: int) -> pd.DataFrame:
+    """Build a small test case frame with numeric answers."""
+    return pd.DataFrame(
+        {
+            "id": list(range(1, count + 1)),
+            "category": ["math"] * count,
+            "difficulty": [1] * count,
+            "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+            "expected_answer": [str(i) for i in range(1, count + 1)],
+            "answer_type": ["numeric"] * count,
+        }
+    )
+
+
+def _answer_for(prompt: str) -> str:
+    """Answer the synthetic ``What is N + 0?`` question."""
+    return prompt.split("What is ")[1].split(" +")[0]
+
+
+class FakeClient:
+    """Synchronous client answering the synthetic questions correctly."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.prompts: list[str] = []
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        self.prompts.append(prompt)
+        time.sleep(self.delay)
+        return APIResponse(text=_answer_for(prompt), latency_ms=self.delay * 1000, success=True)
+
+
+class FakeAsyncClient(FakeClient):
+    """Async client with random per-call delays that tracks peak concurrency."""
+
+    def __init__(self, delay: float = 0.02) -> None:
+        super().__init__(delay)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def aquery(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.uniform(0, self.delay))
+        finally:
+            self.in_flight -= 1
+        return APIResponse(text=_answer_for(prompt), latency_ms=1.0, success=True)
+
+
+class FlakyClient(FakeClient):
+    """Client whose first ``failures`` calls per prompt fail with Retry-After 0."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        key = f"{prompt}#{run}"
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            failed = self.calls[key] <= self.failures
+        if failed:
+            return APIResponse(
+                text="", latency_ms=1.0, success=False, error="HTTP 503: busy",
+                status_code=503, retry_after=0.0,
+            )
+        return super().query(prompt, options=options, run=run)
+
+    async def aquery(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        return self.query(prompt, options=options, run=run)
+
+
+class DownClient(FakeClient):
+    """Client whose server always fails; it retries itself as ``client_attempts()`` says."""
+
+    def __init__(self, config: Config) -> None:
+        super().__init__()
+        self.client_attempts = config.client_attempts()
+        self.posts = 0
+        self._lock = threading.Lock()
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        with self._lock:
+            self.posts += self.client_attempts
+        return APIResponse(text="", latency_ms=0.0, success=False, error="HTTP 500")
+
+
+def _prompt(case: dict) -> str:
+    return f"Q: {case['question']}"
+
+
+@pytest.fixture
+def config() -> Config:
+    return Config(runs_per_case=2)
+
+
+class TestExperimentRunner:
+    """Tests for ExperimentRunner class."""
+
+    def test_run_technique_sequential(self, config: Config, tmp_path) -> None:
+        """Test the sequential path evaluates and saves every call."""
+        runner = ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path))
+        df = runner.run_technique("fake", _prompt, _make_cases(3))
+
+        assert len(df) == 6
+        assert df["correct"].all()
+        assert (tmp_path / "raw" / "fake_results.csv").exists()
+
+    def test_arun_technique_order_and_bound(self, config: Config, tmp_path) -> None:
+        """Test async rows keep (id, run) order and respect the concurrency bound."""
+        client = FakeAsyncClient()
+        runner = ExperimentRunner(config, client=client, results_dir=str(tmp_path))
+        df = asyncio.run(runner.arun_technique("fake", _prompt, _make_cases(10), concurrency=4))
+
+        assert list(zip(df["id"], df["run"])) == [(i, r) for i in range(1, 11) for r in (1, 2)]
+        assert df["correct"].all()
+        assert 1 < client.peak_in_flight <= 4
+
+    def test_arun_technique_matches_sequential(self, config: Config, tmp_path) -> None:
+        """Test async and sequential runs produce identical rows."""
+        cases = _make_cases(5)
+        sequential = ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path))
+        concurrent = ExperimentRunner(config, client=FakeAsyncClient(), results_dir=str(tmp_path))
+
+        seq_df = sequential.run_technique("seq", _prompt, cases)
+        async_df = asyncio.run(concurrent.arun_technique("async", _prompt, cases, concurrency=3))
+
+        columns = ["id", "run", "prompt", "response", "correct"]
+        pd.testing.assert_frame_equal(seq_df[columns], async_df[columns])
+
+    def test_run_technique_thread_pool(self, config: Config, tmp_path) -> None:
+        """Test the thread-pool path keeps row order and overlaps calls."""
+        client = FakeClient(delay=0.05)
+        runner = ExperimentRunner(
+            config, client=client, results_dir=str(tmp_path), max_workers=4
+        )
+        start = time.perf_counter()
+        df = runner.run_technique("fake", _prompt, _make_cases(8))
+        elapsed = time.perf_counter() - start
+
+        assert list(zip(df["id"], df["run"])) == [(i, r) for i in range(1, 9) for r in (1, 2)]
+        assert df["correct"].all()
+        assert elapsed < 16 * 0.05
+
+    def test_progress_events(self, config: Config, tmp_path) -> None:
+        """Test listeners get a final event counting resumed and new calls."""
+        ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path)).run_technique(
+            "fake", _prompt, _make_cases(2)
+        )
+        events = []
+        runner = ExperimentRunner(
+            config, client=FakeClient(), results_dir=str(tmp_path), max_workers=2,
+            progress_listeners=[events.append],
+        )
+        runner.run_technique("fake", _prompt, _make_cases(3), resume=True)
+
+        final = events[-1]
+        assert (final.label, final.completed, final.total) == ("fake", 6, 6)
+        assert final.accuracy == 1.0 and final.error_rate == 0.0
+        assert runner.progress.session_calls == 2
+
+    def test_technique_options_sent_with_config_overrides(self, tmp_path) -> None:
+        """Test technique defaults are sent and explicit Config values win."""
+        class RecordingClient(FakeClient):
+            def __init__(self) -> None:
+                super().__init__()
+                self.options: list[dict] = []
+
+            def query(
+                self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+            ) -> APIResponse:
+                self.options.append(options)
+                return APIResponse(text="1", latency_ms=1.0, success=True)
+
+        client = RecordingClient()
+        config = Config(runs_per_case=1, num_predict=8, temperature=0.0)
+        runner = ExperimentRunner(config, client=client, results_dir=str(tmp_path))
+        runner.run_technique("improved", ImprovedPromptGenerator().generate, _make_cases(2))
+
+        assert client.options == [{"num_predict": 8, "stop": ["\n\n"], "temperature": 0.0}] * 2
+
+
+class TestRunnerRetries:
+    """Tests for the runner's deferred retry queue."""
+
+    @pytest.fixture
+    def retry_config(self) -> Config:
+        return Config(runs_per_case=2, max_retries=3, retry_delay=0.01, max_backoff=0.05)
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_failed_calls_are_retried(
+        self, retry_config: Config, tmp_path, max_workers: int
+    ) -> None:
+        """Test failed calls are re-queued and rows record attempts and backoff."""
+        runner = ExperimentRunner(
+            retry_config, client=FlakyClient(failures=2), results_dir=str(tmp_path),
+            max_workers=max_workers,
+        )
+        df = runner.run_technique("flaky", _prompt, _make_cases(4))
+
+        assert list(zip(df["id"], df["run"])) == [(i, r) for i in range(1, 5) for r in (1, 2)]
+        assert df["success"].all() and df["correct"].all()
+        assert (df["attempts"] == 3).all()
+        assert (df["backoff_s"] > 0).all()
+
+    def test_gives_up_after_max_retries(self, retry_config: Config, tmp_path) -> None:
+        """Test a call failing on every attempt is recorded as a failure."""
+        client = FlakyClient(failures=10)
+        runner = ExperimentRunner(retry_config, client=client, results_dir=str(tmp_path))
+        df = runner.run_technique("flaky", _prompt, _make_cases(2))
+
+        assert not df["success"].any()
+        assert (df["attempts"] == 3).all()
+        assert set(client.calls.values()) == {3}
+
+    @pytest.mark.parametrize("retry_in_runner", [True, False])
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_runner_and_client_retries_do_not_multiply(
+        self, tmp_path, retry_in_runner: bool, use_async: bool
+    ) -> None:
+        """Test a failing call is posted max_retries times whichever side retries."""
+        config = Config(
+            runs_per_case=1, max_retries=3, retry_delay=0.01, max_backoff=0.05,
+            retry_in_runner=retry_in_runner,
+        )
+        client = DownClient(config)
+        runner = ExperimentRunner(config, client=client, results_dir=str(tmp_path))
+        if use_async:
+            df = asyncio.run(runner.arun_technique("down", _prompt, _make_cases(2)))
+        else:
+            df = runner.run_technique("down", _prompt, _make_cases(2))
+
+        assert client.posts == 2 * 3
+        assert list(df["attempts"]) == ([3, 3] if retry_in_runner else [1, 1])
+
+    def test_arun_technique_retries(self, retry_config: Config, tmp_path) -> None:
+        """Test the async path retries without blocking other items."""
+        runner = ExperimentRunner(
+            retry_config, client=FlakyClient(failures=1), results_dir=str(tmp_path)
+        )
+        df = asyncio.run(runner.arun_technique("flaky", _prompt, _make_cases(5), concurrency=2))
+
+        assert df["success"].all()
+        assert (df["attempts"] == 2).all()
+
+    def test_healthy_calls_not_delayed(self, tmp_path) -> None:
+        """Test successful calls record a single attempt and no backoff."""
+        runner = ExperimentRunner(
+            Config(runs_per_case=1), client=FakeClient(), results_dir=str(tmp_path)
+        )
+        df = runner.run_technique("ok", _prompt, _make_cases(3))
+
+        assert (df["attempts"] == 1).all()
+        assert (df["backoff_s"] == 0).all()
+
+
+class StoppingClient(FakeClient):
+    """Client that asks the runner to stop after ``stop_after`` calls."""
+
+    def __init__(self, stop_after: int) -> None:
+        super().__init__()
+        self.stop_after = stop_after
+        self.runner: ExperimentRunner | None = None
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        response = super().query(prompt, options=options, run=run)
+        if len(self.prompts) >= self.stop_after:
+            self.runner.request_stop()
+        return response
+
+
+class TestCheckpointing:
+    """Tests for incremental checkpoints, resume and graceful stop."""
+
+    def _checkpoint_lines(self, tmp_path, technique: str = "fake") -> list[dict]:
+        path = tmp_path / "checkpoints" / f"{technique}.jsonl"
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_rows_are_checkpointed(self, config: Config, tmp_path) -> None:
+        """Test every row is appended to the technique's JSONL checkpoint."""
+        runner = ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path))
+        runner.run_technique("fake", _prompt, _make_cases(3))
+
+        lines = self._checkpoint_lines(tmp_path)
+        assert len(lines) == 6
+        owners = {(line["technique"], line["model"]) for line in lines}
+        assert owners == {("fake", config.model_name)}
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_stop_then_resume(self, config: Config, tmp_path, max_workers: int) -> None:
+        """Test a stopped run drains, raises, and a resumed run only does the rest."""
+        client = StoppingClient(stop_after=4)
+        runner = ExperimentRunner(
+            config, client=client, results_dir=str(tmp_path), max_workers=max_workers
+        )
+        client.runner = runner
+        with pytest.raises(RunInterrupted):
+            runner.run_technique("fake", _prompt, _make_cases(5))
+        recorded = len(self._checkpoint_lines(tmp_path))
+        assert recorded == len(client.prompts) < 10
+
+        fresh = FakeClient()
+        resumed = ExperimentRunner(
+            config, client=fresh, results_dir=str(tmp_path), max_workers=max_workers
+        )
+        df = resumed.run_technique("fake", _prompt, _make_cases(5), resume=True)
+
+        assert len(fresh.prompts) == 10 - recorded
+        assert list(zip(df["id"], df["run"])) == [(i, r) for i in range(1, 6) for r in (1, 2)]
+        assert df["correct"].all()
+
+    def test_resume_retries_failed_rows(self, tmp_path) -> None:
+        """Test rows that failed before are run again on resume."""
+        config = Config(runs_per_case=1, max_retries=1)
+        ExperimentRunner(
+            config, client=FlakyClient(failures=1), results_dir=str(tmp_path)
+        ).run_technique("fake", _prompt, _make_cases(2))
+        client = FakeClient()
+        df = ExperimentRunner(config, client=client, results_dir=str(tmp_path)).run_technique(
+            "fake", _prompt, _make_cases(2), resume=True
+        )
+
+        assert len(client.prompts) == 2
+        assert df["success"].all()
+
+    def test_fresh_run_discards_checkpoint(self, config: Config, tmp_path) -> None:
+        """Test a run without resume starts a new checkpoint."""
+        for _ in range(2):
+            ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path)).run_technique(
+                "fake", _prompt, _make_cases(2)
+            )
+        assert len(self._checkpoint_lines(tmp_path)) == 4
+
+    def test_sigint_drains_instead_of_aborting(self, config: Config, tmp_path) -> None:
+        """Test Ctrl-C during a run stops it gracefully with rows recorded."""
+        class InterruptingClient(FakeClient):
+            def query(self, prompt: str, **kwargs) -> APIResponse:
+                response = super().query(prompt)
+                if len(self.prompts) == 3:
+                    os.kill(os.getpid(), signal.SIGINT)
+                return response
+
+        runner = ExperimentRunner(config, client=InterruptingClient(), results_dir=str(tmp_path))
+        with pytest.raises(RunInterrupted):
+            runner.run_technique("fake", _prompt, _make_cases(5))
+
+        assert len(self._checkpoint_lines(tmp_path)) == 3
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+    def test_arun_technique_resume(self, config: Config, tmp_path) -> None:
+        """Test the async path also resumes from the checkpoint."""
+        ExperimentRunner(config, client=FakeClient(), results_dir=str(tmp_path)).run_technique(
+            "fake", _prompt, _make_cases(3)
+        )
+        client = FakeAsyncClient()
+        runner = ExperimentRunner(config, client=client, results_dir=str(tmp_path))
+        df = asyncio.run(
+            runner.arun_technique("fake", _prompt, _make_cases(4), concurrency=2, resume=True)
+        )
+
+        assert len(df) == 8 and df["correct"].all()
+        # Only the new case's two runs were appended to the checkpoint
+        assert len(self._checkpoint_lines(tmp_path)) == 8
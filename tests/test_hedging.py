@@ -0,0 +1,182 @@
+"""Tests for the hedged request client."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.config import Config
+from src.hedging import HedgingClient, HedgingStats, LatencyWindow
+from src.ollama_client import APIResponse
+
+ANSWER = "the answer is 42 " * 10
+
+
+class StreamingClient:
+    """Client emitting a fake token every 5ms until done or told to stop."""
+
+    def __init__(self, slow_prompts: tuple = (), fast: float = 0.01, slow: float = 2.0) -> None:
+        self.slow_prompts = slow_prompts
+        self.fast = fast
+        self.slow = slow
+        self.calls = 0
+        self.cancelled = 0
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, stop_when=None, **kwargs
+    ) -> APIResponse:
+        self.calls += 1
+        duration = self.slow if prompt in self.slow_prompts else self.fast
+        start = time.perf_counter()
+        text = ""
+        while time.perf_counter() - start < duration:
+            time.sleep(0.005)
+            text += "x"
+            if stop_when is not None and stop_when(text):
+                self.cancelled += 1
+                break
+        latency_ms = (time.perf_counter() - start) * 1000
+        return APIResponse(text=ANSWER, latency_ms=latency_ms, success=True, ttft_ms=1.0)
+
+
+def _config(**overrides) -> Config:
+    settings = {"hedge": True, "hedge_min_samples": 5, "hedge_max_extra": 0.5}
+    return Config(**{**settings, **overrides})
+
+
+def _warm_up(client: HedgingClient, calls: int = 8) -> None:
+    for i in range(calls):
+        client.query(f"fast {i}")
+
+
+class TestLatencyWindow:
+    """Tests for LatencyWindow class."""
+
+    def test_quantile_needs_min_samples(self) -> None:
+        """Test no threshold is reported until enough samples arrive."""
+        window = LatencyWindow(size=10, min_samples=3)
+        window.add(10.0)
+        window.add(20.0)
+        assert window.quantile(0.5) is None
+        window.add(30.0)
+        assert window.quantile(0.5) == 20.0
+
+    def test_window_rolls(self) -> None:
+        """Test old samples fall out of the window."""
+        window = LatencyWindow(size=3, min_samples=1)
+        for value in (1000.0, 1.0, 2.0, 3.0):
+            window.add(value)
+        assert window.quantile(1.0) == 3.0
+
+
+class TestHedgingClient:
+    """Tests for HedgingClient class."""
+
+    def test_no_hedge_before_warm_up(self) -> None:
+        """Test calls pass straight through until the window has samples."""
+        primary = StreamingClient()
+        client = HedgingClient(primary, _config())
+        response = client.query("fast")
+
+        assert not response.hedged
+        assert client.report()["hedges"] == 0
+
+    def test_slow_call_is_hedged_and_loser_cancelled(self) -> None:
+        """Test a slow call is duplicated, the duplicate wins and the original is cancelled."""
+        primary = StreamingClient(slow_prompts=("slow",))
+        secondary = StreamingClient()
+        client = HedgingClient(primary, _config(), secondary=secondary)
+        _warm_up(client)
+        # A jittery warm-up call may itself have been hedged; count from here
+        secondary_calls, cancelled = secondary.calls, primary.cancelled
+        hedges, wins = client.report()["hedges"], client.report()["hedge_wins"]
+
+        start = time.perf_counter()
+        response = client.query("slow")
+        elapsed = time.perf_counter() - start
+
+        assert response.hedged and response.success
+        assert elapsed < 1.0
+        assert response.latency_ms > secondary.fast * 1000
+        assert secondary.calls == secondary_calls + 1
+        # The loser notices the cancellation at its next token
+        deadline = time.monotonic() + 1.0
+        while primary.cancelled == cancelled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert primary.cancelled == cancelled + 1
+        report = client.report()
+        assert report["hedges"] == hedges + 1 and report["hedge_wins"] == wins + 1
+
+    def test_caller_does_not_wait_for_a_queued_original(self) -> None:
+        """Test a win returns at once and the row holds the time the caller waited."""
+        class QueueingClient(StreamingClient):
+            def query(self, prompt: str, **kwargs) -> APIResponse:
+                if prompt == "slow":
+                    # Queued on the server: no token, so no chance to notice the cancel
+                    time.sleep(2.0)
+                return super().query(prompt, **kwargs)
+
+        client = HedgingClient(QueueingClient(), _config(), secondary=StreamingClient())
+        _warm_up(client)
+
+        start = time.perf_counter()
+        response = client.query("slow")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert response.hedged and elapsed_ms < 1000
+        assert response.latency_ms == pytest.approx(elapsed_ms, abs=20)
+        assert client.report()["p99_ms"] <= elapsed_ms
+
+    def test_extra_load_is_capped(self) -> None:
+        """Test no duplicate is fired once the budget is spent."""
+        primary = StreamingClient(slow_prompts=("slow",), slow=0.1)
+        client = HedgingClient(primary, _config(hedge_max_extra=0.0))
+        _warm_up(client)
+        response = client.query("slow")
+
+        assert not response.hedged
+        assert client.report()["hedges"] == 0
+        assert primary.calls == 9
+
+    def test_windows_are_per_technique(self) -> None:
+        """Test each technique keeps its own latency window and counters."""
+        client = HedgingClient(StreamingClient(), _config())
+        client.begin_technique("baseline")
+        _warm_up(client, calls=3)
+        client.begin_technique("cot")
+        client.query("fast")
+
+        assert client.report("baseline")["calls"] == 3
+        assert client.report("cot")["calls"] == 1
+
+    def test_aquery_hedges(self) -> None:
+        """Test the async path hedges and cancels the slow original."""
+        primary = StreamingClient(slow_prompts=("slow",))
+        client = HedgingClient(primary, _config(), secondary=StreamingClient())
+
+        async def run() -> APIResponse:
+            for i in range(8):
+                await client.aquery(f"fast {i}")
+            return await client.aquery("slow")
+
+        start = time.perf_counter()
+        response = asyncio.run(run())
+
+        assert response.hedged
+        assert time.perf_counter() - start < 1.5
+
+
+class TestHedgingStats:
+    """Tests for the hedging report."""
+
+    def test_report_estimates_tail_removed(self) -> None:
+        """Test the unhedged tail adds back the estimated savings."""
+        stats = HedgingStats(calls=100, hedges=5, hedge_wins=4)
+        stats.latencies_ms = [100.0] * 100
+        stats.saved_ms = [0.0] * 96 + [900.0] * 4
+        report = stats.report()
+
+        assert report["extra_load_pct"] == 5.0
+        assert report["p99_ms"] == 100.0
+        assert report["unhedged_p99_ms"] == pytest.approx(1000.0)
+        assert report["tail_removed_ms"] == pytest.approx(900.0)
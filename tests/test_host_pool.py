@@ -0,0 +1,146 @@
+"""Tests for the multi-host Ollama pool client."""
+
+import threading
+import time
+
+import pytest
+
+from src.config import Config
+from src.host_pool import OllamaPoolClient, create_ollama_client
+from src.ollama_client import APIResponse, OllamaClient
+
+HOSTS = "http://node-a:11434, http://node-b:11434,http://node-c:11434"
+
+
+class FakeHostClient:
+    """Stand-in for an OllamaClient bound to one host."""
+
+    def __init__(self, host: str, latency_ms: float = 10.0, healthy: bool = True) -> None:
+        self.host = host
+        self.latency_ms = latency_ms
+        self.healthy = healthy
+        self.fail = False
+        self.calls = 0
+        self.hold: threading.Event | None = None
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        self.calls += 1
+        if self.hold is not None:
+            self.hold.wait()
+        if self.fail:
+            return APIResponse(text="", latency_ms=0.0, success=False, error="Connection error")
+        return APIResponse(text="ok", latency_ms=self.latency_ms, success=True)
+
+    def is_healthy(self) -> bool:
+        return self.healthy
+
+    def close(self) -> None:
+        pass
+
+
+def _pool(config: Config, latencies: tuple = (10.0, 10.0, 10.0)) -> OllamaPoolClient:
+    pool = OllamaPoolClient(config)
+    for member, latency in zip(pool.members, latencies):
+        member.client = FakeHostClient(member.client.host, latency)
+    return pool
+
+
+class TestHostList:
+    """Tests for host configuration."""
+
+    def test_comma_list(self) -> None:
+        """Test OLLAMA_HOST-style comma lists are split and trimmed."""
+        assert Config(ollama_host=HOSTS).hosts() == [
+            "http://node-a:11434", "http://node-b:11434", "http://node-c:11434",
+        ]
+
+    def test_factory_picks_client(self) -> None:
+        """Test one host gives a plain client and several give a pool."""
+        assert isinstance(create_ollama_client(Config()), OllamaClient)
+        pool = create_ollama_client(Config(ollama_host=HOSTS))
+        assert isinstance(pool, OllamaPoolClient)
+        assert pool.hosts == Config(ollama_host=HOSTS).hosts()
+
+    def test_unknown_policy_rejected(self) -> None:
+        """Test a misspelt balancing policy fails fast."""
+        with pytest.raises(ValueError):
+            OllamaPoolClient(Config(ollama_host=HOSTS, load_balancing="random"))
+
+
+class TestOllamaPoolClient:
+    """Tests for OllamaPoolClient class."""
+
+    def test_response_records_host(self) -> None:
+        """Test each response names the host that served it."""
+        pool = _pool(Config(ollama_host=HOSTS))
+        hosts = {pool.query(f"p{i}").host for i in range(3)}
+        assert hosts <= set(pool.hosts)
+
+    def test_least_outstanding_spreads_concurrent_calls(self) -> None:
+        """Test in-flight calls go to the least loaded hosts."""
+        pool = _pool(Config(ollama_host=HOSTS))
+        release = threading.Event()
+        for member in pool.members:
+            member.client.hold = release
+        threads = [threading.Thread(target=pool.query, args=(f"p{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        in_flight = [member.outstanding for member in pool.members]
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert in_flight == [1, 1, 1]
+        assert all(member.outstanding == 0 for member in pool.members)
+
+    def test_latency_policy_prefers_fast_host(self) -> None:
+        """Test latency-weighted balancing sends most calls to the fastest host."""
+        pool = _pool(Config(ollama_host=HOSTS, load_balancing="latency"), (50.0, 5.0, 80.0))
+        for i in range(20):
+            pool.query(f"p{i}")
+
+        served = [member.served for member in pool.members]
+        assert served[1] >= 17
+
+    def test_breaker_ejects_and_readmits(self) -> None:
+        """Test a failing host is ejected, then readmitted after a health check."""
+        config = Config(ollama_host=HOSTS, breaker_failures=2, breaker_cooldown=0.05)
+        pool = _pool(config)
+        bad = pool.members[0].client
+        bad.fail = True
+        for i in range(12):
+            pool.query(f"p{i}")
+
+        assert bad.calls == 2
+        assert pool.host_stats()[bad.host]["ejected"]
+
+        bad.fail = False
+        time.sleep(0.06)
+        for i in range(6):
+            pool.query(f"q{i}")
+        assert bad.calls > 2
+        assert not pool.host_stats()[bad.host]["ejected"]
+
+    def test_unhealthy_host_stays_ejected(self) -> None:
+        """Test a host failing its health check is not readmitted."""
+        config = Config(ollama_host=HOSTS, breaker_cooldown=0.01)
+        pool = _pool(config)
+        down = pool.members[2].client
+        down.healthy = False
+
+        assert pool.check_health()[down.host] is False
+        time.sleep(0.02)
+        for i in range(6):
+            pool.query(f"p{i}")
+        assert down.calls == 0
+
+    def test_prefix_affinity_keeps_shared_prompts_on_one_host(self) -> None:
+        """Test prompts sharing a long prefix follow the host that served it."""
+        pool = _pool(Config(ollama_host=HOSTS, prefix_grouping=True), (50.0, 5.0, 80.0))
+        persona = "You are a meticulous mathematician who checks every step twice. "
+        for i in range(6):
+            pool.query(f"{persona}Question {i}")
+
+        served = [member.served for member in pool.members]
+        assert sorted(served) == [0, 0, 6]
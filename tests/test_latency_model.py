@@ -0,0 +1,207 @@
+"""Tests for latency prediction and longest-first dispatch."""
+
+import time
+
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.experiment_runner import ExperimentRunner
+from src.latency_model import (
+    LatencyModel,
+    LongestFirstPlan,
+    lpt_order,
+    makespan_report,
+    simulate_makespan,
+)
+from src.ollama_client import APIResponse
+from src.session_scheduler import SessionScheduler
+
+
+def _history() -> pd.DataFrame:
+    """Past cot rows: math cases take 9s, logic cases 1s; case 1 is slower still."""
+    rows = [("cot", i, "math", 2, 9000.0, True) for i in range(2, 6)]
+    rows += [("cot", i, "logic", 1, 1000.0, True) for i in range(6, 10)]
+    rows += [("cot", 1, "math", 2, 20000.0, True), ("cot", 10, "logic", 1, 99999.0, False)]
+    return pd.DataFrame(
+        rows, columns=["technique", "id", "category", "difficulty", "latency_ms", "success"]
+    )
+
+
+def _cases(count: int) -> pd.DataFrame:
+    """Cases alternating between a slow and a fast category."""
+    return pd.DataFrame({
+        "id": range(1, count + 1),
+        "category": ["slow" if i % 2 else "fast" for i in range(1, count + 1)],
+        "difficulty": [1] * count,
+        "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+        "expected_answer": [str(i) for i in range(1, count + 1)],
+        "answer_type": ["numeric"] * count,
+    })
+
+
+class CategoryClient:
+    """Client whose latency depends on the case category in the prompt."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        self.prompts.append(prompt)
+        delay = 0.04 if "[slow]" in prompt else 0.01
+        time.sleep(delay)
+        answer = prompt.split("What is ")[1].split(" +")[0]
+        return APIResponse(text=answer, latency_ms=delay * 1000, success=True)
+
+
+def _prompt(case: dict) -> str:
+    return f"[{case['category']}] {case['question']}"
+
+
+class TestLatencyModel:
+    """Tests for LatencyModel class."""
+
+    def test_falls_back_from_case_to_stratum_to_technique(self) -> None:
+        """Test the most specific group with history is used."""
+        model = LatencyModel(_history())
+
+        assert model.predict("cot", {"id": 1, "category": "math", "difficulty": 2}) == 20000.0
+        assert model.predict("cot", {"id": 42, "category": "math", "difficulty": 2}) == 9000.0
+        assert model.predict("cot", {"id": 42, "category": "code", "difficulty": 3}) == 9000.0
+        assert model.predict("baseline", {"id": 42, "category": "math"}) == model.global_ms
+
+    def test_failed_calls_are_ignored(self) -> None:
+        """Test timeouts do not count as latency history."""
+        model = LatencyModel(_history())
+        assert model.predict("cot", {"id": 10, "category": "logic", "difficulty": 1}) == 1000.0
+
+    def test_cached_rows_are_ignored(self, tmp_path) -> None:
+        """Test replayed cache hits do not count as latency history."""
+        history = _history().assign(cached=False)
+        history.loc[history["id"] == 1, ["latency_ms", "cached"]] = [1.0, True]
+        history.drop(columns="technique").to_csv(tmp_path / "cot_results.csv", index=False)
+        model = LatencyModel.from_results(tmp_path)
+
+        assert model.predict("cot", {"id": 1, "category": "math", "difficulty": 2}) == 9000.0
+
+    def test_from_results_reads_both_layouts(self, tmp_path) -> None:
+        """Test history is read from results/ and results/raw/, named by technique."""
+        (tmp_path / "raw").mkdir()
+        history = _history().drop(columns="technique")
+        history.to_csv(tmp_path / "cot_results.csv", index=False)
+        history.assign(latency_ms=history["latency_ms"] / 10).to_csv(
+            tmp_path / "raw" / "few_shot_results.csv", index=False
+        )
+        (tmp_path / "broken_results.csv").write_text("not,a\nresults,file\n")
+        model = LatencyModel.from_results(tmp_path)
+
+        assert model.predict("cot", {"id": 3, "category": "math", "difficulty": 2}) == 9000.0
+        assert model.predict("few_shot", {"id": 3, "category": "math", "difficulty": 2}) == 900.0
+
+    def test_empty_history_uses_default(self, tmp_path) -> None:
+        """Test a model without history predicts the same for every call."""
+        model = LatencyModel.from_results(tmp_path)
+        assert model.predict("cot", {"id": 1}) == model.global_ms > 0
+
+
+class TestMakespan:
+    """Tests for the LPT order and makespan simulation."""
+
+    def test_lpt_beats_fifo_when_long_calls_come_last(self) -> None:
+        """Test starting long calls first shortens the tail."""
+        durations = {i: 1.0 for i in range(6)} | {6: 6.0}
+        fifo = list(range(7))
+        order = lpt_order(fifo, durations)
+
+        assert order[0] == 6
+        assert simulate_makespan([durations[i] for i in fifo], 2) == 9.0
+        assert simulate_makespan([durations[i] for i in order], 2) == 6.0
+
+    def test_report_replays_measured_latencies(self) -> None:
+        """Test the report replays only the calls that ran, in both orders."""
+        predicted = {0: 1000.0, 1: 1000.0, 2: 4000.0}
+        actual = {0: 1000.0, 1: 1000.0, 2: 2000.0}
+        report = makespan_report([0, 1, 2], [2, 0, 1], predicted, actual, workers=2, wall_s=2.1)
+
+        assert report["predicted_fifo_s"] == 5.0 and report["predicted_s"] == 4.0
+        assert report["replayed_fifo_s"] == 3.0 and report["replayed_s"] == 2.0
+        assert report["replayed_saving_pct"] == pytest.approx(100 / 3)
+
+    def test_plan_reorders_only_within_rounds(self) -> None:
+        """Test a plan keeps the FIFO order to report against and sorts each round."""
+        predicted = {0: 1.0, 1: 3.0, 2: 2.0, 3: 4.0}
+        plan = LongestFirstPlan([0, 1, 2, 3], predicted, rounds=[[0, 1], [2, 3]])
+
+        assert plan.order == [1, 0, 3, 2] and plan.fifo == [0, 1, 2, 3]
+        report = plan.report({0: 1.0, 1: 3.0, 2: 2.0, 3: 4.0}, workers=1, wall_s=0.01)
+        assert report["replayed_s"] == report["replayed_fifo_s"]
+
+
+class TestLongestFirstRuns:
+    """Tests for LPT dispatch in the runner."""
+
+    def test_run_technique_dispatches_longest_first(self, tmp_path) -> None:
+        """Test slow cases start first, rows keep their order and the report is stored."""
+        pd.DataFrame({
+            "id": range(101, 107), "category": ["slow", "fast"] * 3, "difficulty": [1] * 6,
+            "latency_ms": [40.0, 10.0] * 3, "success": [True] * 6,
+        }).to_csv(tmp_path / "fake_results.csv", index=False)
+        client = CategoryClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, lpt_scheduling=True), client=client,
+            results_dir=str(tmp_path), max_workers=2, progress_listeners=[],
+        )
+        df = runner.run_technique("fake", _prompt, _cases(8))
+
+        assert list(df["id"]) == list(range(1, 9))
+        assert all("[slow]" in prompt for prompt in client.prompts[:4])
+        report = runner.schedule_report
+        assert report["workers"] == 2
+        assert report["predicted_s"] < report["predicted_fifo_s"]
+        assert report["replayed_s"] <= report["replayed_fifo_s"]
+
+    def test_no_report_without_lpt(self, tmp_path) -> None:
+        """Test FIFO runs leave the schedule report empty."""
+        runner = ExperimentRunner(
+            Config(runs_per_case=1), client=CategoryClient(), results_dir=str(tmp_path),
+            progress_listeners=[],
+        )
+        runner.run_technique("fake", _prompt, _cases(2))
+        assert runner.schedule_report is None
+
+    def test_session_rounds_keep_the_interleaving(self, tmp_path) -> None:
+        """Test LPT only reorders whole rounds of an interleaving, or one technique at a time."""
+        runner = ExperimentRunner(
+            Config(), client=CategoryClient(), results_dir=str(tmp_path), max_workers=3,
+            progress_listeners=[],
+        )
+        slots = [(name, index) for index in range(3) for name in ("a", "b")]
+
+        rounds = SessionScheduler(runner, "round_robin").rounds(slots, techniques=2)
+        assert [len(r) for r in rounds] == [4, 2]
+        assert all({name for name, _ in r} == {"a", "b"} for r in rounds)
+        sequential = SessionScheduler(runner, "sequential").rounds(sorted(slots), techniques=2)
+        assert [{name for name, _ in r} for r in sequential] == [{"a"}, {"b"}]
+
+    def test_sequential_session_is_longest_first_per_technique(self, tmp_path) -> None:
+        """Test slow calls go first within each technique and techniques stay in order."""
+        for technique in ("a", "b"):
+            pd.DataFrame({
+                "id": range(101, 107), "category": ["slow", "fast"] * 3, "difficulty": [1] * 6,
+                "latency_ms": [40.0, 10.0] * 3, "success": [True] * 6,
+            }).to_csv(tmp_path / f"{technique}_results.csv", index=False)
+        client = CategoryClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, lpt_scheduling=True), client=client,
+            results_dir=str(tmp_path), progress_listeners=[],
+        )
+        generators = {tag: (lambda case, tag=tag: f"<{tag}> {_prompt(case)}") for tag in ("a", "b")}
+        SessionScheduler(runner, "sequential").run(generators, _cases(4))
+
+        assert [prompt[:10] for prompt in client.prompts] == [
+            "<a> [slow]", "<a> [slow]", "<a> [fast]", "<a> [fast]",
+            "<b> [slow]", "<b> [slow]", "<b> [fast]", "<b> [fast]",
+        ]
+        assert runner.schedule_report["workers"] == 1
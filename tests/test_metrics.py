@@ -123,3 +123,34 @@ class TestTechniqueMetrics:
         assert metrics.variance == 0.1875
         assert metrics.std_dev == 0.433
         assert metrics.count == 100
+
+
+class TestCaseWeighting:
+    """Tests for case-weighted metrics and consistency."""
+
+    def setup_method(self) -> None:
+        self.calculator = MetricsCalculator()
+
+    def test_uniform_runs_match_unweighted(self) -> None:
+        """Test equal runs per case give the plain metrics."""
+        df = pd.DataFrame({"id": [1, 1, 2, 2], "correct": [1, 0, 1, 1]})
+        weighted = self.calculator.calculate_case_metrics(df)
+        plain = self.calculator.calculate_metrics(df["correct"].tolist())
+        assert weighted.accuracy == plain.accuracy
+        assert weighted.variance == pytest.approx(plain.variance)
+
+    def test_extra_runs_do_not_dominate(self) -> None:
+        """Test a case sampled more often still counts once."""
+        df = pd.DataFrame({"id": [1, 1, 2, 2, 2, 2], "correct": [1, 1, 0, 1, 0, 1]})
+        metrics = self.calculator.calculate_case_metrics(df)
+        assert metrics.accuracy == pytest.approx(0.75)
+        assert metrics.count == 6
+
+    def test_consistency(self) -> None:
+        """Test flip rate and pooled within-case variance."""
+        df = pd.DataFrame({"id": [1, 1, 2, 2, 2, 2, 3], "correct": [1, 1, 0, 1, 0, 1, 1]})
+        consistency = self.calculator.calculate_consistency(df)
+        assert consistency["cases"] == 3
+        assert consistency["flip_rate"] == 0.5
+        # Case 2: unbiased variance 1/3 with 3 degrees of freedom; case 1: 0 with 1
+        assert consistency["within_case_variance"] == pytest.approx((3 * 1 / 3) / 4)
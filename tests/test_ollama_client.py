@@ -0,0 +1,296 @@
+"""Tests for the Ollama client module."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.config import Config
+from src.ollama_client import ConnectionStats, OllamaClient, StreamAccumulator
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive HTTP handler imitating the Ollama API."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, payload: dict) -> None:
+        self._send_body(json.dumps(payload).encode())
+
+    def _send_body(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        self.server.requests.append(request)
+        if self.server.throttle > 0:
+            self.server.throttle -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        timings = {"total_duration": 3_000_000, "eval_count": 4, "eval_duration": 2_000_000}
+        if request.get("stream"):
+            words = ["echo:", f" {request['prompt']}"]
+            chunks = [{"response": w, "done": False} for w in words]
+            chunks.append({"response": "", "done": True, **timings})
+            self._send_body("\n".join(json.dumps(c) for c in chunks).encode() + b"\n")
+        else:
+            self._send_json({"response": f" echo: {request['prompt']} ", "done": True, **timings})
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._send_json({"models": [{"name": "llama3.2:3b"}]})
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_ollama():
+    """Run a fake Ollama server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllamaHandler)
+    server.requests = []
+    server.throttle = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def ollama_server(fake_ollama) -> str:
+    """URL of the fake Ollama server."""
+    return f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+
+
+class TestOllamaClient:
+    """Tests for OllamaClient class."""
+
+    def test_timeouts_come_from_config(self) -> None:
+        """Test connect/read timeouts are taken from Config."""
+        client = OllamaClient(Config(connect_timeout=3.0, read_timeout=45.0))
+
+        assert client.timeout == (3.0, 45.0)
+
+    def test_query_success(self, ollama_server: str) -> None:
+        """Test a successful query returns stripped text."""
+        with OllamaClient(Config(), host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert response.success
+        assert response.text == "echo: hello"
+        assert response.latency_ms > 0
+        assert response.host == ollama_server
+
+    def test_query_reports_server_timings(self, ollama_server: str) -> None:
+        """Test server-side timing fields are carried into the response."""
+        with OllamaClient(Config(), host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert response.eval_count == 4
+        assert response.tokens_per_sec == pytest.approx(2000.0)
+        assert response.ttft_ms is None
+        assert response.timings()["total_duration"] == 3_000_000
+
+    def test_query_streaming(self, ollama_server: str) -> None:
+        """Test streamed chunks are joined and time-to-first-token recorded."""
+        with OllamaClient(Config(stream=True), host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert response.success
+        assert response.text == "echo: hello"
+        assert response.host == ollama_server
+        assert 0 < response.ttft_ms <= response.latency_ms
+        assert response.inter_token_ms is not None
+        assert response.eval_count == 4
+
+    def test_query_stops_when_answer_complete(self, ollama_server: str) -> None:
+        """Test a stop condition closes the stream and reports the unused budget."""
+        with OllamaClient(Config(), host=ollama_server) as client:
+            response = client.query(
+                "hello", options={"num_predict": 10}, stop_when=lambda text: "echo:" in text
+            )
+
+        assert response.success
+        assert response.early_stopped
+        assert response.text == "echo:"
+        assert response.budget_unused == 9
+
+    def test_warm_up_sends_empty_prompt_with_keep_alive(
+        self, fake_ollama, ollama_server: str
+    ) -> None:
+        """Test warm-up preloads the model and reports its timing separately."""
+        with OllamaClient(Config(keep_alive="10m"), host=ollama_server) as client:
+            warmup = client.warm_up(keep_alive=-1)
+            client.query("hello")
+
+        sent = fake_ollama.requests
+        assert warmup.success and warmup.latency_ms > 0
+        assert sent[0]["prompt"] == "" and sent[0]["keep_alive"] == -1
+        assert sent[1]["keep_alive"] == "10m"
+
+    def test_query_backs_off_when_throttled(self, fake_ollama, ollama_server: str) -> None:
+        """Test a 429 penalizes the limiter and the retry then succeeds."""
+        fake_ollama.throttle = 1
+        config = Config(request_delay=0, retry_in_runner=False)
+        with OllamaClient(config, host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert response.success
+        assert len(fake_ollama.requests) == 2
+        assert client.limiter.throttle_events == 1
+
+    def test_query_reports_throttle_status(self, fake_ollama, ollama_server: str) -> None:
+        """Test the final failure carries the HTTP status and Retry-After."""
+        fake_ollama.throttle = 2
+        config = Config(request_delay=0, max_retries=2, retry_in_runner=False)
+        with OllamaClient(config, host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert not response.success
+        assert response.status_code == 429
+        assert response.retry_after == 0.0
+
+    def test_single_attempt_when_runner_retries(self, fake_ollama, ollama_server: str) -> None:
+        """Test the client leaves retries to the runner by default."""
+        fake_ollama.throttle = 1
+        with OllamaClient(Config(request_delay=0), host=ollama_server) as client:
+            response = client.query("hello")
+
+        assert not response.success
+        assert len(fake_ollama.requests) == 1
+
+    def test_list_models(self, ollama_server: str) -> None:
+        """Test listing models through the pooled session."""
+        with OllamaClient(Config(), host=ollama_server) as client:
+            assert client.list_models() == ["llama3.2:3b"]
+
+    def test_health_check(self, ollama_server: str) -> None:
+        """Test the health check succeeds against a live server and fails otherwise."""
+        with OllamaClient(Config(), host=ollama_server) as client:
+            assert client.is_healthy()
+        with OllamaClient(Config(connect_timeout=0.5), host="http://127.0.0.1:9") as client:
+            assert not client.is_healthy()
+
+    def test_connections_are_reused(self, ollama_server: str) -> None:
+        """Test sequential calls share one keep-alive connection."""
+        with OllamaClient(Config(request_delay=0), host=ollama_server) as client:
+            for i in range(5):
+                client.query(f"prompt {i}")
+            stats = client.connection_stats()
+
+        assert stats.requests == 5
+        assert stats.connections_opened == 1
+        assert stats.connections_reused == 4
+
+    def test_pool_is_bounded_across_threads(self, ollama_server: str) -> None:
+        """Test concurrent callers never open more than pool_maxsize connections."""
+        config = Config(pool_maxsize=2, pool_block=True, request_delay=0)
+        with OllamaClient(config, host=ollama_server) as client:
+            threads = [
+                threading.Thread(target=client.query, args=(f"prompt {i}",))
+                for i in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = client.connection_stats()
+
+        assert stats.requests == 8
+        assert stats.connections_opened <= 2
+
+
+class TestStreamAccumulator:
+    """Tests for StreamAccumulator class."""
+
+    def test_token_timing(self) -> None:
+        """Test TTFT and inter-token latency from chunk arrival times."""
+        accumulator = StreamAccumulator(start_time=0.0)
+        accumulator.feed({"response": "a"}, 0.5)
+        accumulator.feed({"response": "b"}, 0.6)
+        accumulator.feed({"response": "c"}, 0.7)
+        accumulator.feed({"response": "", "done": True}, 0.7)
+        response = accumulator.to_response(0.8)
+
+        assert response.text == "abc"
+        assert response.ttft_ms == pytest.approx(500.0)
+        assert response.inter_token_ms == pytest.approx(100.0)
+        assert response.tokens_per_sec == pytest.approx(10.0)
+        assert response.latency_ms == pytest.approx(800.0)
+
+    def test_error_chunk(self) -> None:
+        """Test an error chunk marks the response as failed."""
+        accumulator = StreamAccumulator(start_time=0.0)
+        accumulator.feed({"error": "model not found"}, 0.1)
+
+        response = accumulator.to_response(0.1)
+
+        assert not response.success
+        assert response.error == "model not found"
+
+
+class TestConnectionStats:
+    """Tests for ConnectionStats dataclass."""
+
+    def test_reuse_ratio(self) -> None:
+        """Test reuse ratio is derived from the counters."""
+        stats = ConnectionStats(requests=10, connections_opened=2)
+
+        assert stats.connections_reused == 8
+        assert stats.reuse_ratio == pytest.approx(0.8)
+
+    def test_reuse_ratio_without_requests(self) -> None:
+        """Test reuse ratio is zero before any request."""
+        assert ConnectionStats(requests=0, connections_opened=0).reuse_ratio == 0.0
+
+
+class TestAsyncOllamaClient:
+    """Tests for AsyncOllamaClient class."""
+
+    def test_query_success(self, ollama_server: str) -> None:
+        """Test the blocking wrapper runs the async request."""
+        pytest.importorskip("aiohttp")
+        from src.async_ollama_client import AsyncOllamaClient
+
+        response = AsyncOllamaClient(Config(), host=ollama_server).query("hello")
+
+        assert response.success
+        assert response.text == "echo: hello"
+        assert response.host == ollama_server
+
+    def test_query_streaming(self, ollama_server: str) -> None:
+        """Test the async client consumes the NDJSON stream."""
+        pytest.importorskip("aiohttp")
+        from src.async_ollama_client import AsyncOllamaClient
+
+        response = AsyncOllamaClient(Config(stream=True), host=ollama_server).query("hi")
+
+        assert response.text == "echo: hi"
+        assert response.ttft_ms is not None
+
+    def test_aquery_concurrent(self, ollama_server: str) -> None:
+        """Test many awaited queries share one session."""
+        pytest.importorskip("aiohttp")
+        from src.async_ollama_client import AsyncOllamaClient
+
+        client = AsyncOllamaClient(Config(request_delay=0), host=ollama_server, concurrency=3)
+
+        async def run_all() -> list:
+            try:
+                return await asyncio.gather(*(client.aquery(f"p{i}") for i in range(6)))
+            finally:
+                await client.aclose()
+
+        responses = asyncio.run(run_all())
+
+        assert [r.text for r in responses] == [f"echo: p{i}" for i in range(6)]
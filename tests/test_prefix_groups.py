@@ -0,0 +1,184 @@
+"""Tests for shared-prefix grouping of prompts."""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.experiment_runner import ExperimentRunner
+from src.ollama_client import APIResponse
+from src.prefix_groups import PrefixGate, group_order, prefix_cache_report, prefix_groups
+from src.prompts.few_shot import FewShotPromptGenerator
+
+PERSONA = "You are an expert who answers every question precisely and concisely. " * 2
+
+
+def _cases() -> pd.DataFrame:
+    """Six cases alternating between two categories."""
+    categories = ["math", "logic"] * 3
+    return pd.DataFrame({
+        "id": range(1, 7),
+        "category": categories,
+        "difficulty": [1] * 6,
+        "question": [f"What is {i} + 0?" for i in range(1, 7)],
+        "expected_answer": [str(i) for i in range(1, 7)],
+        "answer_type": ["numeric"] * 6,
+    })
+
+
+class CacheClient:
+    """Client that evaluates a prompt faster when the previous one shared its prefix."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        cached = bool(self.prompts) and self.prompts[-1][:120] == prompt[:120]
+        self.prompts.append(prompt)
+        answer = prompt.split("What is ")[1].split(" +")[0]
+        eval_ns = 10_000_000 if cached else 200_000_000
+        return APIResponse(
+            text=answer, latency_ms=eval_ns / 1e6 + 50, success=True, prompt_eval_duration=eval_ns
+        )
+
+
+class TimingClient(CacheClient):
+    """CacheClient whose calls take a while, recording when each started and ended."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.spans: list[tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        start = time.monotonic()
+        time.sleep(0.02)
+        with self._lock:
+            response = super().query(prompt, **kwargs)
+            self.spans.append((prompt, start, time.monotonic()))
+        return response
+
+
+class TestPrefixGroups:
+    """Tests for prefix_groups and group_order."""
+
+    def test_few_shot_prompts_group_by_category(self) -> None:
+        """Test few-shot prompts of a category share their examples and form one group."""
+        generator = FewShotPromptGenerator()
+        cases = _cases().to_dict("records")
+        groups = prefix_groups({i: generator.generate(case) for i, case in enumerate(cases)})
+
+        assert sorted(sorted(group) for group in groups) == [[0, 2, 4], [1, 3, 5]]
+
+    def test_short_common_prefix_does_not_group(self) -> None:
+        """Test prompts sharing only a few characters stay apart."""
+        groups = prefix_groups({0: "Question: a", 1: "Question: b"})
+        assert len(groups) == 2
+
+    def test_group_order_follows_first_member(self) -> None:
+        """Test groups start where their first member was and keep the given order inside."""
+        prompts = {0: PERSONA + "a", 1: "other " * 20, 2: PERSONA + "b", 3: PERSONA + "c"}
+        groups = group_order([3, 1, 0, 2], prompts)
+
+        assert groups == [[3, 0, 2], [1]]
+
+
+class TestPrefixGate:
+    """Tests for PrefixGate class."""
+
+    def test_holds_group_until_first_call_returns(self) -> None:
+        """Test later calls of a group wait for the first; ungrouped calls never do."""
+        gate = PrefixGate({0: "a", 1: "a", 2: None, 3: "a"}.get)
+
+        assert [gate.admit(key) for key in range(4)] == [True, False, True, False]
+        assert gate.release(2) == []
+        assert gate.release(0) == [1, 3]
+        assert gate.admit(4) is True
+
+
+class TestPrefixCacheReport:
+    """Tests for prefix_cache_report."""
+
+    def test_saving_from_first_and_later_calls(self) -> None:
+        """Test the saving is the first-vs-later difference times the later calls."""
+        rows = {
+            i: {"success": True, "latency_ms": 300.0, "prompt_eval_duration": ns}
+            for i, ns in enumerate([200e6, 20e6, 20e6, 100e6])
+        }
+        report = prefix_cache_report([[0, 1, 2], [3]], rows)
+
+        assert report["groups"] == 1 and report["grouped_calls"] == 3
+        assert report["first_prompt_eval_ms"] == 200.0
+        assert report["later_prompt_eval_ms"] == 20.0
+        assert report["prompt_eval_saved_ms"] == 360.0
+        assert report["prompt_eval_share"] == 240.0 / 900.0
+
+    def test_rows_without_server_timings_are_skipped(self) -> None:
+        """Test failed calls and rows without prompt_eval_duration are ignored."""
+        rows = {
+            0: {"success": True, "latency_ms": 1.0, "prompt_eval_duration": None},
+            1: {"success": False, "latency_ms": 1.0, "prompt_eval_duration": 5e6},
+        }
+        report = prefix_cache_report([[0, 1]], rows)
+
+        assert report["groups"] == 0 and report["prompt_eval_saved_ms"] == 0.0
+
+
+class TestGroupedRuns:
+    """Tests for prefix grouping in the runner."""
+
+    def _run(self, tmp_path, grouping: bool) -> tuple[ExperimentRunner, CacheClient]:
+        client = CacheClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=2, prefix_grouping=grouping), client=client,
+            results_dir=str(tmp_path), progress_listeners=[],
+        )
+        df = runner.run_technique("few_shot", FewShotPromptGenerator(), _cases())
+        assert list(zip(df["id"], df["run"])) == [(i, r) for i in range(1, 7) for r in (1, 2)]
+        return runner, client
+
+    def test_grouped_run_dispatches_categories_back_to_back(self, tmp_path) -> None:
+        """Test every category's calls run together and the saving is reported."""
+        runner, client = self._run(tmp_path, grouping=True)
+
+        categories = [
+            "math" if "If a book costs" in prompt else "logic" for prompt in client.prompts
+        ]
+        assert categories in (["math"] * 6 + ["logic"] * 6, ["logic"] * 6 + ["math"] * 6)
+        report = runner.prefix_report["few_shot"]
+        assert report["groups"] == 2
+        assert report["prompt_eval_saved_ms"] == 2 * 5 * 190.0
+
+    def test_no_report_without_grouping(self, tmp_path) -> None:
+        """Test file-order runs leave the prefix report empty."""
+        runner, _ = self._run(tmp_path, grouping=False)
+        assert runner.prefix_report == {}
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_group_first_call_runs_alone(self, tmp_path, use_async: bool) -> None:
+        """Test with several workers a group's later calls start after its first returned."""
+        client = TimingClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=2, prefix_grouping=True), client=client,
+            results_dir=str(tmp_path), max_workers=3, progress_listeners=[],
+        )
+        if use_async:
+            asyncio.run(runner.arun_technique(
+                "few_shot", FewShotPromptGenerator(), _cases(), concurrency=3
+            ))
+        else:
+            runner.run_technique("few_shot", FewShotPromptGenerator(), _cases())
+
+        for marker in (True, False):
+            spans = sorted(
+                (start, end) for prompt, start, end in client.spans
+                if ("If a book costs" in prompt) == marker
+            )
+            assert len(spans) == 6
+            first_end = spans[0][1]
+            assert all(start >= first_end for start, _ in spans[1:])
@@ -0,0 +1,155 @@
+"""Tests for the live progress tracker."""
+
+import io
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from src.progress import (
+    JsonlEventWriter,
+    LatencyHistogram,
+    LineDisplay,
+    ProgressTracker,
+    format_duration,
+)
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_within_bucket_error(self) -> None:
+        """Test percentiles match exact ones to within the bucket ratio."""
+        rng = np.random.default_rng(0)
+        samples = rng.lognormal(mean=7, sigma=0.8, size=20_000)
+        histogram = LatencyHistogram()
+        for value in samples:
+            histogram.add(value)
+
+        for q in (50, 95, 99):
+            exact = np.percentile(samples, q)
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.06)
+
+    def test_empty_and_out_of_range(self) -> None:
+        """Test an empty histogram has no percentile and extremes are clamped."""
+        histogram = LatencyHistogram(max_ms=1000)
+        assert histogram.percentile(50) is None
+        histogram.add(0.1)
+        histogram.add(10**9)
+        assert histogram.percentile(0) == histogram.min_ms
+        assert histogram.percentile(100) >= 1000
+        assert len(histogram.counts) < 200
+
+
+class TestProgressTracker:
+    """Tests for ProgressTracker."""
+
+    def test_counters(self) -> None:
+        """Test accuracy, error rate, EWMA and ETA from recorded calls."""
+        tracker = ProgressTracker(total=10, label="t")
+        tracker.preload(correct=2, errors=0, count=2)
+        tracker.record(correct=True, success=True, latency_ms=100)
+        tracker.record(correct=False, success=True, latency_ms=200)
+        tracker.record(correct=False, success=False, latency_ms=5000)
+        event = tracker.snapshot()
+
+        assert (event.completed, event.total) == (5, 10)
+        assert event.accuracy == pytest.approx(3 / 5)
+        assert event.error_rate == pytest.approx(1 / 5)
+        # Failed calls do not move the latency statistics
+        assert event.latency_ewma_ms == pytest.approx(100 + 0.1 * (200 - 100))
+        assert event.throughput_rps > 0
+        # Only the calls of this session count toward throughput
+        assert event.eta_s == pytest.approx(5 / event.throughput_rps)
+
+    def test_listeners_throttled_and_finished(self) -> None:
+        """Test events are rate-limited and finish always sends one."""
+        events = []
+        tracker = ProgressTracker(total=100, listeners=[events.append], interval=60)
+        for _ in range(100):
+            tracker.record(True, True, 1.0)
+        assert len(events) == 1
+        final = tracker.finish()
+        assert events[-1] is final and final.completed == 100 and final.eta_s == 0.0
+
+    def test_failing_listener_does_not_break_run(self) -> None:
+        """Test a listener raising is logged, not propagated."""
+        def broken(event) -> None:
+            raise RuntimeError("display gone")
+
+        tracker = ProgressTracker(total=1, listeners=[broken], interval=0)
+        tracker.record(True, True, 1.0)
+        assert tracker.finish().completed == 1
+
+    def test_concurrent_updates(self) -> None:
+        """Test counts stay exact when many threads record at once."""
+        tracker = ProgressTracker(total=8000, interval=0)
+
+        def work() -> None:
+            for i in range(1000):
+                tracker.record(i % 2 == 0, True, 10.0)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        event = tracker.snapshot()
+        assert event.completed == 8000
+        assert event.accuracy == 0.5
+        assert tracker.histogram.total == 8000
+
+
+class TestListeners:
+    """Tests for the display and event writer."""
+
+    def test_line_display_not_a_terminal(self) -> None:
+        """Test piped output gets throttled full lines rather than redraws."""
+        stream = io.StringIO()
+        tracker = ProgressTracker(
+            total=3, label="baseline", listeners=[LineDisplay(stream, log_interval=60)], interval=0
+        )
+        for _ in range(3):
+            tracker.record(True, True, 120.0)
+        tracker.finish()
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        assert "\r" not in stream.getvalue()
+        assert lines[-1].startswith("  baseline [3/3] acc 100.0%")
+        assert "ETA 0:00:00" in lines[-1]
+
+    def test_line_display_ends_line_when_stopped_early(self) -> None:
+        """Test an unfinished run still gets its newline, so later output starts a fresh line."""
+        stream = io.StringIO()
+        stream.isatty = lambda: True
+        tracker = ProgressTracker(
+            total=5, label="baseline", listeners=[LineDisplay(stream)], interval=0
+        )
+        for _ in range(2):
+            tracker.record(True, True, 120.0)
+        assert not stream.getvalue().endswith("\n")
+
+        tracker.finish()
+
+        assert stream.getvalue().endswith("\n")
+        assert stream.getvalue().count("\n") == 1
+
+    def test_jsonl_events(self, tmp_path) -> None:
+        """Test events are appended as JSON lines."""
+        path = tmp_path / "events" / "progress.jsonl"
+        tracker = ProgressTracker(total=2, listeners=[JsonlEventWriter(str(path))], interval=60)
+        tracker.record(True, True, 50.0)
+        tracker.record(False, False, 0.0)
+        tracker.finish()
+
+        events = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["completed"] for e in events] == [1, 2]
+        assert events[-1]["error_rate"] == 0.5 and "time" in events[-1]
+
+    def test_format_duration(self) -> None:
+        """Test durations format as H:MM:SS."""
+        assert format_duration(3725.9) == "1:02:05"
+        assert format_duration(None) == "?"
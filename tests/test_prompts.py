@@ -42,6 +42,19 @@ class TestImprovedPromptGenerator:
         """Set up test fixtures."""
         self.generator = ImprovedPromptGenerator()
 
+    def test_improved_generation_budget(self) -> None:
+        """Test improved prompts cap output length and stop at a blank line."""
+        options = self.generator.generation_options()
+
+        assert options["num_predict"] <= 32
+        assert "\n\n" in options["stop"]
+
+    def test_generation_options_are_copies(self) -> None:
+        """Test callers cannot mutate the class-level defaults."""
+        self.generator.generation_options()["stop"].append("x")
+
+        assert ImprovedPromptGenerator.GENERATION_OPTIONS["stop"] == ["\n\n"]
+
     def test_improved_prompt_has_format_hint(self) -> None:
         """Test improved prompt includes format hint."""
         test_case = {
@@ -49,6 +49,13 @@ class TestChainOfThoughtPromptGenerator:
         """Set up test fixtures."""
         self.generator = ChainOfThoughtPromptGenerator()
 
+    def test_cot_has_larger_budget(self) -> None:
+        """Test CoT allows more output tokens than the one-word techniques."""
+        cot_budget = self.generator.generation_options()["num_predict"]
+
+        assert cot_budget > RoleBasedPromptGenerator().generation_options()["num_predict"]
+        assert cot_budget > FewShotPromptGenerator().generation_options()["num_predict"]
+
     def test_cot_has_step_instructions(self) -> None:
         """Test CoT prompt has step-by-step instructions."""
         test_case = {
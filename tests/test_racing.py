@@ -0,0 +1,154 @@
+"""Tests for sequential racing of techniques."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.experiment_runner import ExperimentRunner
+from src.ollama_client import APIResponse
+from src.racing import Race, beta_interval, hoeffding_interval
+from src.session_scheduler import SessionScheduler
+
+
+class TestIntervals:
+    """Tests for the confidence bounds."""
+
+    def test_hoeffding_shrinks_with_samples(self) -> None:
+        """Test the interval contains the mean and narrows as n grows."""
+        low, high = hoeffding_interval(60, 100, 0.05)
+        wide_low, wide_high = hoeffding_interval(6, 10, 0.05)
+        assert low < 0.6 < high
+        assert high - low < wide_high - wide_low
+        assert hoeffding_interval(0, 0, 0.05) == (0.0, 1.0)
+
+    def test_beta_tighter_than_hoeffding(self) -> None:
+        """Test the Bayesian interval is narrower at the same level."""
+        b_low, b_high = beta_interval(60, 100, 0.05)
+        h_low, h_high = hoeffding_interval(60, 100, 0.05)
+        assert b_low < 0.6 < b_high
+        assert b_high - b_low < h_high - h_low
+
+
+class TestRace:
+    """Tests for the Race elimination rules."""
+
+    def _feed(self, race: Race, accuracies: dict[str, float], rounds: int) -> None:
+        """Score ``rounds`` answers per technique with the given hit rates."""
+        rng = np.random.default_rng(1)
+        for _ in range(rounds):
+            for name, p in accuracies.items():
+                if not race.is_retired(name):
+                    race.update(name, rng.random() < p)
+
+    def test_clearly_worse_technique_retired(self) -> None:
+        """Test a technique far below the leader is retired with a reason."""
+        race = Race(["good", "bad"], min_calls=10)
+        self._feed(race, {"good": 0.95, "bad": 0.2}, 200)
+
+        bad = race.entries["bad"]
+        assert bad.retired and "out of contention" in bad.reason
+        assert bad.retired_after < 400
+        assert not race.is_retired("good")
+        assert race.leader() == "good"
+
+    def test_close_techniques_not_retired(self) -> None:
+        """Test techniques with similar accuracy both keep running."""
+        race = Race(["a", "b"], min_calls=10)
+        self._feed(race, {"a": 0.7, "b": 0.68}, 100)
+        assert not race.is_retired("a") and not race.is_retired("b")
+
+    def test_min_calls_and_precision(self) -> None:
+        """Test nothing retires before min_calls and tight intervals settle."""
+        race = Race(["a"], method="beta", min_calls=50, precision=0.1)
+        for _ in range(49):
+            race.update("a", True)
+        assert not race.is_retired("a")
+        race.update("a", True)
+        assert race.is_retired("a") and race.entries["a"].reason.startswith("settled")
+
+    def test_unknown_method(self) -> None:
+        """Test an unknown bound method is rejected."""
+        with pytest.raises(ValueError):
+            Race(["a"], method="bootstrap")
+
+
+class BiasedClient:
+    """Client answering correctly only for prompts tagged ``[good]``."""
+
+    def __init__(self) -> None:
+        self.tags: list[str] = []
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        tag = prompt[1:prompt.index("]")]
+        self.tags.append(tag)
+        answer = prompt.split("What is ")[1].split(" +")[0] if tag == "good" else "wrong"
+        return APIResponse(text=answer, latency_ms=1.0, success=True)
+
+
+class RetryingBiasedClient(BiasedClient):
+    """Biased client whose first ``[bad]`` call fails once, so it waits for a retry."""
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        if prompt.startswith("[bad]") and "bad" not in self.tags:
+            self.tags.append("bad")
+            return APIResponse(text="", latency_ms=1.0, success=False, error="HTTP 503")
+        return super().query(prompt, **kwargs)
+
+
+def _cases(count: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": range(1, count + 1),
+        "category": ["math"] * count,
+        "difficulty": [1] * count,
+        "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+        "expected_answer": [str(i) for i in range(1, count + 1)],
+        "answer_type": ["numeric"] * count,
+    })
+
+
+_GENERATORS = {
+    tag: (lambda case, tag=tag: f"[{tag}] Q: {case['question']}") for tag in ("good", "bad")
+}
+
+
+class TestRacingSession:
+    """Tests for racing inside a session."""
+
+    def test_session_skips_retired_technique(self, tmp_path) -> None:
+        """Test a retired technique stops getting calls and the report is saved."""
+        count = 60
+        cases = _cases(count)
+        client = BiasedClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=1), client=client, results_dir=str(tmp_path),
+            progress_listeners=[],
+        )
+        race = Race(["good", "bad"], min_calls=5)
+        results = SessionScheduler(runner, "round_robin", race).run(_GENERATORS, cases)
+
+        assert len(results["good"]) == count
+        assert len(results["bad"]) == client.tags.count("bad") < count
+        report = json.loads((tmp_path / "stats" / "race_report.json").read_text())
+        assert report["techniques"]["bad"]["retired"]
+        assert report["calls_skipped"] == count - len(results["bad"])
+        assert runner.progress.total == 2 * count - report["calls_skipped"]
+
+    def test_deferred_retry_of_retired_technique_is_skipped(self, tmp_path) -> None:
+        """Test a retry that comes due after its technique was retired is not sent."""
+        count = 40
+        client = RetryingBiasedClient()
+        config = Config(runs_per_case=1, max_retries=3, retry_delay=0.4, max_backoff=0.4)
+        runner = ExperimentRunner(
+            config, client=client, results_dir=str(tmp_path), progress_listeners=[]
+        )
+        race = Race(["good", "bad"], min_calls=5)
+        results = SessionScheduler(runner, "round_robin", race).run(_GENERATORS, _cases(count))
+
+        assert race.is_retired("bad")
+        assert 1 not in set(results["bad"]["id"])
+        assert client.tags.count("bad") == len(results["bad"]) + 1
+        report = json.loads((tmp_path / "stats" / "race_report.json").read_text())
+        assert report["calls_skipped"] == count - len(results["bad"])
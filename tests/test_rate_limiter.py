@@ -0,0 +1,131 @@
+"""Tests for the token-bucket rate limiter."""
+
+import asyncio
+import math
+import time
+
+from src.config import Config
+from src.rate_limiter import TokenBucketLimiter, parse_retry_after
+
+
+class TestParseRetryAfter:
+    """Tests for Retry-After header parsing."""
+
+    def test_seconds(self) -> None:
+        """Test a delay given in seconds."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(" 1.5 ") == 1.5
+
+    def test_http_date_in_the_past(self) -> None:
+        """Test an HTTP date that has already passed means no wait."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_malformed(self) -> None:
+        """Test missing and unparseable headers yield None."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
+
+
+class TestTokenBucketLimiter:
+    """Tests for TokenBucketLimiter class."""
+
+    def test_from_config(self) -> None:
+        """Test the limiter reads request_delay and the backoff fields."""
+        config = Config(
+            request_delay=0.5, rate_limit_backoff=3.0, max_backoff=9.0, rate_limit_burst=4
+        )
+        limiter = TokenBucketLimiter.from_config(config)
+
+        assert limiter.rate == 2.0
+        assert limiter.burst == 4
+        assert limiter.initial_backoff == 3.0
+        assert limiter.max_backoff == 9.0
+        assert math.isinf(TokenBucketLimiter.from_config(Config()).rate)
+
+    def test_burst_then_pacing(self) -> None:
+        """Test calls within the burst start at once and later ones are paced."""
+        limiter = TokenBucketLimiter(rate=20.0, burst=2)
+
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_unlimited_rate_never_waits(self) -> None:
+        """Test an infinite rate disables pacing."""
+        limiter = TokenBucketLimiter(rate=math.inf)
+        assert sum(limiter.acquire() for _ in range(50)) == 0.0
+
+    def test_penalize_pauses_and_slows_down(self) -> None:
+        """Test a throttling response pauses callers and halves the rate."""
+        limiter = TokenBucketLimiter(rate=100.0, burst=5, backoff=0.05, max_backoff=1.0)
+
+        pause = limiter.penalize()
+        start = time.monotonic()
+        limiter.acquire()
+
+        assert pause == 0.05
+        assert time.monotonic() - start >= 0.04
+        assert limiter.rate == 50.0
+        assert limiter.throttle_events == 1
+
+    def test_backoff_doubles_up_to_max(self) -> None:
+        """Test consecutive throttles grow the pause up to max_backoff."""
+        limiter = TokenBucketLimiter(rate=math.inf, backoff=0.01, max_backoff=0.03)
+
+        pauses = [limiter.penalize() for _ in range(4)]
+
+        assert pauses == [0.01, 0.02, 0.03, 0.03]
+
+    def test_retry_after_overrides_backoff(self) -> None:
+        """Test the server's Retry-After is used instead of the backoff."""
+        limiter = TokenBucketLimiter(rate=10.0, backoff=5.0)
+        assert limiter.penalize(retry_after=0.0) == 0.0
+
+    def test_rate_recovers_gradually(self) -> None:
+        """Test successes restore the base rate step by step."""
+        limiter = TokenBucketLimiter(rate=10.0, backoff=0.0)
+        limiter.penalize()
+        limiter.penalize()
+        assert limiter.rate == 2.5
+
+        limiter.reward()
+        assert limiter.rate == 3.5
+        for _ in range(20):
+            limiter.reward()
+        assert limiter.rate == 10.0
+
+    def test_throttle_paces_an_unlimited_rate_until_recovered(self) -> None:
+        """Test without pacing a throttle halves the observed rate, then recovers to unpaced."""
+        limiter = TokenBucketLimiter(rate=math.inf, backoff=0.0)
+        for _ in range(5):
+            limiter.acquire()
+            time.sleep(0.02)
+        limiter.penalize()
+        throttled = limiter.rate
+        assert 10.0 < throttled < 30.0
+
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start >= 1.5 / throttled
+
+        for _ in range(4):
+            limiter.reward()
+        assert not math.isinf(limiter.rate)
+        for _ in range(2):
+            limiter.reward()
+        assert math.isinf(limiter.rate)
+
+    def test_aacquire_paces_coroutines(self) -> None:
+        """Test the async path shares the same bucket."""
+        limiter = TokenBucketLimiter(rate=50.0, burst=1)
+
+        async def run_all() -> float:
+            start = time.monotonic()
+            await asyncio.gather(*(limiter.aacquire() for _ in range(3)))
+            return time.monotonic() - start
+
+        assert asyncio.run(run_all()) >= 0.03
@@ -0,0 +1,107 @@
+"""Tests for the request coalescer module."""
+
+import asyncio
+import threading
+import time
+
+from src.ollama_client import APIResponse
+from src.request_coalescer import CoalescingClient, is_deterministic
+
+GREEDY = {"temperature": 0, "seed": 42}
+
+
+class SlowClient:
+    """Client whose calls take long enough to overlap."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return APIResponse(text=f"answer to {prompt}", latency_ms=100.0, success=True)
+
+    async def aquery(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return APIResponse(text=f"answer to {prompt}", latency_ms=50.0, success=True)
+
+
+def _query_concurrently(client: CoalescingClient, options: dict | None) -> list[APIResponse]:
+    responses: list[APIResponse | None] = [None, None]
+
+    def call(run: int) -> None:
+        responses[run - 1] = client.query("same", options=options, run=run)
+
+    threads = [threading.Thread(target=call, args=(run,)) for run in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses
+
+
+class TestIsDeterministic:
+    """Tests for is_deterministic function."""
+
+    def test_greedy_options(self) -> None:
+        """Test temperature 0 and top_k 1 count as deterministic."""
+        assert is_deterministic({"temperature": 0})
+        assert is_deterministic({"top_k": 1, "temperature": 0.8})
+
+    def test_sampling_options(self) -> None:
+        """Test default or positive temperature is not deterministic."""
+        assert not is_deterministic(None)
+        assert not is_deterministic({"temperature": 0.7, "seed": 1})
+
+
+class TestCoalescingClient:
+    """Tests for CoalescingClient class."""
+
+    def test_identical_deterministic_requests_share_one_call(self) -> None:
+        """Test concurrent identical greedy requests make one upstream call."""
+        inner = SlowClient()
+        client = CoalescingClient(inner, fan_out=True)
+
+        responses = _query_concurrently(client, GREEDY)
+
+        assert inner.calls == 1
+        assert [r.text for r in responses] == ["answer to same"] * 2
+        assert sorted(r.coalesced for r in responses) == [False, True]
+        assert client.stats.coalesced == 1
+
+    def test_sampling_requests_are_not_shared(self) -> None:
+        """Test non-deterministic requests each reach the model."""
+        inner = SlowClient()
+        _query_concurrently(CoalescingClient(inner, fan_out=True), {"temperature": 0.7})
+
+        assert inner.calls == 2
+
+    def test_fan_out_is_opt_in(self) -> None:
+        """Test nothing is shared unless fan_out is enabled."""
+        inner = SlowClient()
+        _query_concurrently(CoalescingClient(inner), GREEDY)
+
+        assert inner.calls == 2
+
+    def test_async_requests_share_one_call(self) -> None:
+        """Test identical awaited requests on one loop make one upstream call."""
+        inner = SlowClient()
+        client = CoalescingClient(inner, fan_out=True)
+
+        async def run_both() -> list:
+            return await asyncio.gather(
+                client.aquery("same", options=GREEDY, run=1),
+                client.aquery("same", options=GREEDY, run=2),
+            )
+
+        responses = asyncio.run(run_both())
+
+        assert inner.calls == 1
+        assert responses[1].coalesced
@@ -0,0 +1,148 @@
+"""Tests for the response cache module."""
+
+import asyncio
+import json
+from dataclasses import asdict
+
+import pytest
+
+from src.ollama_client import APIResponse
+from src.response_cache import CachedLLMClient, ResponseCache, cache_key
+
+
+class CountingClient:
+    """Client that records how often it is called."""
+
+    model = "test-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def model_digest(self) -> str:
+        return "sha256:abc"
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        self.calls += 1
+        return APIResponse(text=f"{prompt}/{run}", latency_ms=250.0, success=True, eval_count=3)
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+class TestCacheKey:
+    """Tests for cache_key function."""
+
+    def test_key_is_stable_for_option_order(self) -> None:
+        """Test option ordering does not change the key."""
+        first = cache_key("m", "p", {"seed": 1, "temperature": 0}, 1)
+        second = cache_key("m", "p", {"temperature": 0, "seed": 1}, 1)
+
+        assert first == second
+
+    def test_key_depends_on_run(self) -> None:
+        """Test different runs of one prompt are cached separately."""
+        assert cache_key("m", "p", None, 1) != cache_key("m", "p", None, 2)
+
+
+    def test_key_depends_on_early_stop(self) -> None:
+        """Test a request that may stop early has its own key."""
+        assert cache_key("m", "p", None, 1, early_stop=True) != cache_key("m", "p", None, 1)
+
+
+class TestResponseCache:
+    """Tests for ResponseCache and CachedLLMClient."""
+
+    def test_second_query_is_a_hit(self, cache: ResponseCache) -> None:
+        """Test a repeated request is served without calling the model."""
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        first = client.query("hello", run=1)
+        second = client.query("hello", run=1)
+
+        assert inner.calls == 1
+        assert second.text == first.text
+        assert second.cached and not first.cached
+        assert second.latency_ms == 250.0
+        assert second.eval_count == 3
+        assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    def test_early_stopped_answer_not_replayed_in_full(self, cache: ResponseCache) -> None:
+        """Test a response cut short by early stop is not served without a stop condition."""
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        client.query("hello", stop_when=lambda text: True)
+        full = client.query("hello")
+        client.query("hello", stop_when=lambda text: True)
+
+        assert inner.calls == 2
+        assert not full.cached
+
+    def test_legacy_early_stopped_entry_is_a_miss(self, cache: ResponseCache) -> None:
+        """Test an answer cut short but stored under a plain key is fetched again."""
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+        key = cache_key(client.model_id, "hello", None, 1)
+        cache.put(key, "m", APIResponse(text="4", latency_ms=1.0, success=True, early_stopped=True))
+
+        response = client.query("hello")
+
+        assert inner.calls == 1
+        assert not response.early_stopped
+
+    def test_failures_are_not_cached(self, cache: ResponseCache) -> None:
+        """Test failed responses are retried on the next request."""
+        cache.put("k", "m", APIResponse(text="", latency_ms=0.0, success=False))
+
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path) -> None:
+        """Test the least recently used entry is evicted past the size cap."""
+        response = APIResponse(text="x" * 100, latency_ms=1.0, success=True)
+        entry_size = len(json.dumps(asdict(response)))
+        cache = ResponseCache(str(tmp_path / "c.sqlite"), max_bytes=entry_size * 5 // 2)
+        cache.put("a", "m", response)
+        cache.put("b", "m", response)
+        cache.get("a")
+        cache.put("c", "m", response)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats.evictions == 1
+        cache.close()
+
+    def test_replay_mode_never_calls_model(self, tmp_path) -> None:
+        """Test replay mode serves recorded responses and fails on misses."""
+        path = str(tmp_path / "c.sqlite")
+        recorder = ResponseCache(path)
+        CachedLLMClient(CountingClient(), recorder).query("known")
+        recorder.close()
+
+        inner = CountingClient()
+        replay = CachedLLMClient(inner, ResponseCache(path, read_only=True))
+
+        assert replay.query("known").success
+        assert not replay.query("unknown").success
+        assert inner.calls == 0
+
+    def test_aquery_uses_sync_client_in_thread(self, cache: ResponseCache) -> None:
+        """Test the async path works over a client without aquery."""
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        asyncio.run(client.aquery("hi"))
+        response = asyncio.run(client.aquery("hi"))
+
+        assert response.cached
+        assert inner.calls == 1
+
+    def test_delegates_unknown_attributes(self, cache: ResponseCache) -> None:
+        """Test the wrapper exposes the wrapped client's attributes."""
+        assert CachedLLMClient(CountingClient(), cache).model == "test-model"
@@ -0,0 +1,69 @@
+"""Tests for the deferred retry scheduler."""
+
+import random
+import time
+
+from src.ollama_client import APIResponse
+from src.retry_scheduler import RetryScheduler, backoff_delay
+
+FAILED = APIResponse(text="", latency_ms=0.0, success=False, error="boom")
+OK = APIResponse(text="1", latency_ms=1.0, success=True)
+
+
+class TestBackoffDelay:
+    """Tests for the jittered backoff function."""
+
+    def test_grows_exponentially_with_jitter(self) -> None:
+        """Test each step lies between half and all of base * 2**(attempt-1)."""
+        rng = random.Random(0)
+        for attempt in range(1, 6):
+            ceiling = 2.0 * 2 ** (attempt - 1)
+            delay = backoff_delay(attempt, 2.0, 1000.0, rng=rng)
+            assert ceiling / 2 <= delay <= ceiling
+
+    def test_capped(self) -> None:
+        """Test the delay never exceeds the cap."""
+        assert backoff_delay(20, 2.0, 30.0) <= 30.0
+
+    def test_honours_retry_after(self) -> None:
+        """Test Retry-After lengthens the delay but stays under the cap."""
+        assert backoff_delay(1, 0.1, 60.0, retry_after=5.0) == 5.0
+        assert backoff_delay(1, 0.1, 2.0, retry_after=5.0) == 2.0
+
+
+class TestRetryScheduler:
+    """Tests for RetryScheduler class."""
+
+    def test_should_retry_until_max_attempts(self) -> None:
+        """Test failures are retried only while attempts remain."""
+        scheduler = RetryScheduler(max_attempts=2, base_delay=0.0, max_delay=0.0)
+
+        scheduler.start(0)
+        assert scheduler.should_retry(0, FAILED)
+        assert not scheduler.should_retry(0, OK)
+        scheduler.start(0)
+        assert not scheduler.should_retry(0, FAILED)
+
+    def test_deferred_items_become_ready_in_order(self) -> None:
+        """Test items leave the queue once their backoff has elapsed."""
+        scheduler = RetryScheduler(max_attempts=3, base_delay=0.0, max_delay=1.0)
+        scheduler.start(1)
+        scheduler.start(2)
+        scheduler.defer(2, retry_after=0.03)
+        scheduler.defer(1)
+
+        assert len(scheduler) == 2
+        assert scheduler.pop_ready() == 1
+        assert scheduler.pop_ready() is None
+        time.sleep(scheduler.time_until_next())
+        assert scheduler.pop_ready() == 2
+        assert scheduler.time_until_next() is None
+
+    def test_summary_accumulates_backoff(self) -> None:
+        """Test the summary reports attempts and total backoff."""
+        scheduler = RetryScheduler(max_attempts=5, base_delay=0.0, max_delay=1.0)
+        for _ in range(3):
+            scheduler.start(7)
+            scheduler.backoff(7, retry_after=0.25)
+
+        assert scheduler.summary(7) == {"attempts": 3, "backoff_s": 0.75}
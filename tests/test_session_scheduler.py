@@ -0,0 +1,199 @@
+"""Tests for the session-level work scheduler."""
+
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from src.adaptive_concurrency import AdaptiveConcurrencyClient, AIMDLimiter
+from src.checkpoint import RunInterrupted
+from src.client_utils import current_technique
+from src.config import Config
+from src.experiment_runner import ExperimentRunner, WorkItem
+from src.hedging import HedgingClient
+from src.ollama_client import APIResponse
+from src.session_scheduler import ORDERINGS, SessionScheduler, register_ordering
+
+
+def _make_cases(categories: list[str]) -> pd.DataFrame:
+    """Build cases ``What is N + 0?`` with the given categories."""
+    count = len(categories)
+    return pd.DataFrame(
+        {
+            "id": list(range(1, count + 1)),
+            "category": categories,
+            "difficulty": [1] * count,
+            "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+            "expected_answer": [str(i) for i in range(1, count + 1)],
+            "answer_type": ["numeric"] * count,
+        }
+    )
+
+
+def _generator(tag: str):
+    """Prompt generator whose prompts are tagged with the technique."""
+    return lambda case: f"[{tag}] Q: {case['question']}"
+
+
+class RecordingClient:
+    """Client answering correctly and recording the technique tag of each call."""
+
+    def __init__(self, stop_after: int | None = None) -> None:
+        self.tags: list[str] = []
+        self.stop_after = stop_after
+        self.runner: ExperimentRunner | None = None
+        self._lock = threading.Lock()
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        with self._lock:
+            self.tags.append(prompt[1:prompt.index("]")])
+            if self.stop_after is not None and len(self.tags) == self.stop_after:
+                self.runner.request_stop()
+        answer = prompt.split("What is ")[1].split(" +")[0]
+        return APIResponse(text=answer, latency_ms=1.0, success=True)
+
+
+def _items(categories: list[str]) -> list[WorkItem]:
+    return [WorkItem({"category": c}, "", 1, {}, None) for c in categories]
+
+
+class TestOrderings:
+    """Tests for the registered orderings."""
+
+    def test_round_robin_interleaves_techniques(self) -> None:
+        """Test one call of each technique is taken in turn, uneven lengths included."""
+        work = {"a": _items(["x"] * 3), "b": _items(["x"])}
+        assert ORDERINGS["round_robin"](work) == [("a", 0), ("b", 0), ("a", 1), ("a", 2)]
+
+    def test_sequential(self) -> None:
+        """Test the sequential order runs techniques one after another."""
+        work = {"a": _items(["x"] * 2), "b": _items(["x"])}
+        assert ORDERINGS["sequential"](work) == [("a", 0), ("a", 1), ("b", 0)]
+
+    def test_stratified_balances_categories(self) -> None:
+        """Test every prefix spreads calls over techniques and categories."""
+        categories = ["math"] * 4 + ["logic"] * 4
+        order = ORDERINGS["stratified"]({"a": _items(categories), "b": _items(categories)})
+
+        assert sorted(order) == [(t, i) for t in "ab" for i in range(8)]
+        first = order[:4]
+        assert {t for t, _ in first} == {"a", "b"}
+        assert {categories[i] for _, i in first} == {"math", "logic"}
+
+    def test_custom_ordering_is_pluggable(self, tmp_path) -> None:
+        """Test a registered ordering can be chosen by name."""
+        @register_ordering("reversed_test")
+        def reversed_order(work):
+            return list(reversed(ORDERINGS["sequential"](work)))
+
+        try:
+            runner = ExperimentRunner(
+                Config(runs_per_case=1), client=RecordingClient(), results_dir=str(tmp_path),
+                progress_listeners=[],
+            )
+            _, order = SessionScheduler(runner, "reversed_test").plan(
+                {"a": _generator("a"), "b": _generator("b")}, _make_cases(["x"])
+            )
+            assert order == [("b", 0), ("a", 0)]
+        finally:
+            del ORDERINGS["reversed_test"]
+
+    def test_unknown_ordering(self, tmp_path) -> None:
+        """Test an unregistered ordering name is rejected."""
+        runner = ExperimentRunner(
+            Config(), client=RecordingClient(), results_dir=str(tmp_path), progress_listeners=[]
+        )
+        with pytest.raises(ValueError, match="Unknown ordering"):
+            SessionScheduler(runner, "random")
+
+
+class TestSessionScheduler:
+    """Tests for SessionScheduler.run."""
+
+    @pytest.fixture
+    def generators(self) -> dict:
+        return {tag: _generator(tag) for tag in ("a", "b", "c")}
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_runs_all_techniques_from_one_queue(
+        self, generators, tmp_path, max_workers: int
+    ) -> None:
+        """Test calls are interleaved and each technique's rows come back in order."""
+        client = RecordingClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=2), client=client, results_dir=str(tmp_path),
+            max_workers=max_workers, progress_listeners=[],
+        )
+        results = SessionScheduler(runner).run(generators, _make_cases(["m", "l", "m"]))
+
+        if max_workers == 1:
+            assert client.tags[:3] == ["a", "b", "c"]
+        for tag in generators:
+            df = results[tag]
+            assert list(zip(df["id"], df["run"])) == [(i, r) for i in (1, 2, 3) for r in (1, 2)]
+            assert df["correct"].all()
+            assert (tmp_path / "raw" / f"{tag}_results.csv").exists()
+        stats = json.loads((tmp_path / "stats" / "comparison_stats.json").read_text())
+        assert set(stats["by_technique"]) == set(generators)
+
+    def test_clients_see_each_calls_technique(self, generators, tmp_path) -> None:
+        """Test per-technique client state is kept apart while techniques interleave."""
+        class TaggedClient(RecordingClient):
+            def query(self, prompt: str, **kwargs) -> APIResponse:
+                assert current_technique() == prompt[1:prompt.index("]")]
+                return super().query(prompt, **kwargs)
+
+        limiter = AIMDLimiter(max_limit=3, min_samples=2)
+        hedger = HedgingClient(AdaptiveConcurrencyClient(TaggedClient(), limiter), Config())
+        runner = ExperimentRunner(
+            Config(runs_per_case=2), client=hedger, results_dir=str(tmp_path),
+            max_workers=3, progress_listeners=[],
+        )
+        results = SessionScheduler(runner).run(generators, _make_cases(["m", "l", "m"]))
+
+        assert all(df["success"].all() for df in results.values())
+        assert {name: stats.calls for name, stats in hedger.stats.items()} == {
+            "default": 0, "a": 6, "b": 6, "c": 6,
+        }
+        assert set(limiter.baselines_ms) == {"a", "b", "c"}
+
+    def test_run_all_techniques_uses_session(self, generators, tmp_path) -> None:
+        """Test the runner's run_all_techniques goes through the configured ordering."""
+        data_path = tmp_path / "cases.csv"
+        _make_cases(["m", "l"]).to_csv(data_path, index=False)
+        client = RecordingClient()
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, session_ordering="sequential"), client=client,
+            data_path=str(data_path), results_dir=str(tmp_path), progress_listeners=[],
+        )
+        results = runner.run_all_techniques(generators)
+
+        assert client.tags == ["a", "a", "b", "b", "c", "c"]
+        assert all(len(df) == 2 for df in results.values())
+
+    def test_stop_saves_representative_partial_results(self, generators, tmp_path) -> None:
+        """Test a stopped session saves partial rows of every technique, then resumes."""
+        client = RecordingClient(stop_after=7)
+        runner = ExperimentRunner(
+            Config(runs_per_case=2), client=client, results_dir=str(tmp_path),
+            progress_listeners=[],
+        )
+        client.runner = runner
+        scheduler = SessionScheduler(runner, "stratified")
+        cases = _make_cases(["m", "m", "l", "l"])
+        with pytest.raises(RunInterrupted, match="partial"):
+            scheduler.run(generators, cases)
+
+        assert set(scheduler.results) == {"a", "b", "c"}
+        assert sum(len(df) for df in scheduler.results.values()) == 7
+        assert all(len(df) >= 2 for df in scheduler.results.values())
+
+        fresh = RecordingClient()
+        resumed = ExperimentRunner(
+            Config(runs_per_case=2), client=fresh, results_dir=str(tmp_path), progress_listeners=[],
+        )
+        results = SessionScheduler(resumed, "stratified").run(generators, cases, resume=True)
+
+        assert len(fresh.tags) == 24 - 7
+        assert all(len(df) == 8 for df in results.values())
@@ -0,0 +1,132 @@
+"""Tests for stratified ordering and time-budgeted runs."""
+
+import time
+
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.experiment_runner import ExperimentRunner, WorkItem
+from src.metrics import MetricsCalculator
+from src.ollama_client import APIResponse
+from src.stratification import stratified_indices, stratum_of
+
+
+def _cases() -> pd.DataFrame:
+    """Twelve cases: math easy/hard and logic easy, listed stratum by stratum."""
+    strata = [("math", 1)] * 6 + [("math", 3)] * 3 + [("logic", 1)] * 3
+    return pd.DataFrame({
+        "id": range(1, 13),
+        "category": [c for c, _ in strata],
+        "difficulty": [d for _, d in strata],
+        "question": [f"What is {i} + 0?" for i in range(1, 13)],
+        "expected_answer": [str(i) for i in range(1, 13)],
+        "answer_type": ["numeric"] * 12,
+    })
+
+
+class TestStratifiedIndices:
+    """Tests for stratified_indices."""
+
+    def test_interleaves_strata_and_keeps_runs_together(self) -> None:
+        """Test each case's runs stay adjacent while strata alternate."""
+        cases = _cases().to_dict("records")
+        work = [WorkItem(case, "", run, {}, None) for case in cases for run in (1, 2)]
+        order = stratified_indices(work)
+
+        assert sorted(order) == list(range(24))
+        ids = [work[i].case["id"] for i in order]
+        assert ids[:6] == [1, 1, 7, 7, 10, 10]
+        first_three = {stratum_of(work[i].case) for i in order[:6]}
+        assert first_three == {"math/1", "math/3", "logic/1"}
+
+    def test_subset(self) -> None:
+        """Test only the given indices are ordered."""
+        work = [WorkItem(case, "", 1, {}, None) for case in _cases().to_dict("records")]
+        assert stratified_indices(work, [0, 1, 11]) == [0, 11, 1]
+
+
+class TestStratifiedMetrics:
+    """Tests for coverage and the post-stratified estimate."""
+
+    def test_estimate_reweights_by_population_share(self) -> None:
+        """Test an over-sampled stratum does not dominate the estimate."""
+        cases = _cases()
+        # All 6 easy math cases right, 1 of 3 hard math cases (wrong), 1 logic case right
+        df = pd.DataFrame({"id": [1, 2, 3, 4, 5, 6, 7, 10], "correct": [1] * 6 + [0, 1]})
+        calculator = MetricsCalculator()
+        estimate = calculator.calculate_stratified_metrics(df, cases)
+
+        assert estimate["accuracy"] == pytest.approx(0.5 * 1 + 0.25 * 0 + 0.25 * 1)
+        assert estimate["strata_covered"] == estimate["strata_total"] == 3
+        coverage = calculator.stratum_coverage(df, cases)
+        assert coverage["math/3"] == {
+            "cases": 3, "finished_cases": 1, "coverage": pytest.approx(1 / 3)
+        }
+
+    def test_missing_stratum(self) -> None:
+        """Test uncovered strata are reported and left out of the estimate."""
+        df = pd.DataFrame({"id": [1, 2], "correct": [1, 0]})
+        estimate = MetricsCalculator().calculate_stratified_metrics(df, _cases())
+        assert estimate["accuracy"] == pytest.approx(0.5)
+        assert estimate["population_share_covered"] == pytest.approx(0.5)
+        assert estimate["std_error"] > 0
+
+
+class SlowClient:
+    """Client answering correctly after a fixed delay."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    def query(self, prompt: str, **kwargs) -> APIResponse:
+        self.calls += 1
+        time.sleep(self.delay)
+        answer = prompt.split("What is ")[1].split(" +")[0]
+        return APIResponse(text=answer, latency_ms=self.delay * 1000, success=True)
+
+
+class TestTimeBudget:
+    """Tests for runs bounded by config.time_budget."""
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_budget_stops_new_calls(self, tmp_path, max_workers: int) -> None:
+        """Test a budgeted run ends on time with rows spread over the strata."""
+        client = SlowClient(delay=0.05)
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, time_budget=0.3), client=client, results_dir=str(tmp_path),
+            max_workers=max_workers, progress_listeners=[],
+        )
+        start = time.monotonic()
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", _cases())
+        elapsed = time.monotonic() - start
+
+        assert runner.budget_exhausted
+        assert 0 < len(df) < 12 and len(df) == client.calls
+        assert elapsed < 0.3 + 0.15
+        strata = set(zip(df["category"], df["difficulty"]))
+        assert strata == {("math", 1), ("math", 3), ("logic", 1)}
+
+    def test_budget_spent_before_first_call(self, tmp_path) -> None:
+        """Test a budget too short for any call saves an empty result."""
+        client = SlowClient(delay=0.0)
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, time_budget=1e-6), client=client,
+            results_dir=str(tmp_path), progress_listeners=[],
+        )
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", _cases())
+
+        assert runner.budget_exhausted
+        assert df.empty and client.calls == 0
+        assert (tmp_path / "raw" / "fake_results.csv").exists()
+
+    def test_ample_budget_runs_everything(self, tmp_path) -> None:
+        """Test a budget that is not reached leaves a complete run."""
+        runner = ExperimentRunner(
+            Config(runs_per_case=1, time_budget=60), client=SlowClient(delay=0.0),
+            results_dir=str(tmp_path), progress_listeners=[],
+        )
+        df = runner.run_technique("fake", lambda case: f"Q: {case['question']}", _cases())
+        assert not runner.budget_exhausted
+        assert len(df) == 12
@@ -0,0 +1,65 @@
+"""Tests for multi-model sweeps."""
+
+import json
+
+import pandas as pd
+
+from src.sweep import _save_summary, load_report, model_slug, summarize_model
+
+
+def _rows(latencies: list[float], loads_ms: list[float]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "latency_ms": latencies,
+        "success": [True] * len(latencies),
+        "load_duration": [ms * 1e6 for ms in loads_ms],
+    })
+
+
+class TestLoadReport:
+    """Tests for load_report."""
+
+    def test_reloads_are_counted_and_removed_from_latency(self) -> None:
+        """Test a call that reloaded the model does not skew the median without load."""
+        df = _rows([1000.0, 1100.0, 9000.0], [5.0, 5.0, 8000.0])
+        report = load_report(df)
+
+        assert report["reloads"] == 1
+        assert report["reload_ms"] == 8000.0
+        assert report["median_latency_ms"] == 1100.0
+        assert report["median_latency_excl_load_ms"] == 1000.0
+
+    def test_rows_without_server_timings(self) -> None:
+        """Test results from clients without load_duration report no reloads."""
+        df = pd.DataFrame({"latency_ms": [10.0, 30.0], "success": [True, False]})
+        report = load_report(df)
+
+        assert report["reloads"] == 0
+        assert report["median_latency_ms"] == report["median_latency_excl_load_ms"] == 10.0
+
+
+class TestSweepSummary:
+    """Tests for the per-model summary files."""
+
+    def test_model_slug(self) -> None:
+        """Test model tags become safe directory names."""
+        assert model_slug("llama3.2:1b") == "llama3.2_1b"
+        assert model_slug("library/mistral:7b") == "library_mistral_7b"
+
+    def test_summary_and_comparison(self, tmp_path) -> None:
+        """Test the summary keeps load time apart and the CSV has one row per model x technique."""
+        partition = tmp_path / "llama3.2_1b"
+        partition.mkdir()
+        _rows([1000.0, 1200.0], [5.0, 5.0]).to_csv(partition / "cot_results.csv", index=False)
+        (partition / "session_stats.json").write_text(json.dumps({
+            "warmup": {"latency_ms": 4000.0, "load_duration_ms": 3500.0},
+        }))
+        stats = {"cot": {"overall": {"accuracy": 0.5, "count": 2}}}
+        summary = {"llama3.2:1b": summarize_model("llama3.2:1b", stats, partition, wall_s=10.0)}
+        _save_summary(tmp_path, summary)
+
+        entry = json.loads((tmp_path / "sweep_summary.json").read_text())["llama3.2:1b"]
+        assert entry["model_load_ms"] == 3500.0
+        assert entry["techniques"]["cot"]["median_latency_excl_load_ms"] == 1095.0
+        comparison = pd.read_csv(tmp_path / "sweep_comparison.csv")
+        rows = comparison[["model", "technique", "accuracy"]].values.tolist()
+        assert rows == [["llama3.2:1b", "cot", 0.5]]
@@ -0,0 +1,35 @@
+"""Tests for the time budget module."""
+
+import time
+
+from src.time_budget import TimeBudget
+
+
+class TestTimeBudget:
+    """Tests for TimeBudget class."""
+
+    def test_no_budget_never_runs_out(self) -> None:
+        """Test an unset budget lets every call start."""
+        budget = TimeBudget()
+
+        assert not budget.start(None) and not budget.running
+        assert not budget.out_of_time(10_000_000.0) and not budget.exhausted
+
+    def test_calls_stop_once_p95_no_longer_fits(self) -> None:
+        """Test a call only starts while its p95 latency still fits, and the budget stays spent."""
+        budget = TimeBudget()
+
+        assert budget.start(0.2) and budget.running
+        assert not budget.out_of_time(50.0)
+        assert budget.out_of_time(500.0) and budget.exhausted
+        assert budget.out_of_time(0.0)
+
+    def test_restart_clears_exhaustion(self) -> None:
+        """Test starting a new run resets the exhausted flag."""
+        budget = TimeBudget()
+        budget.start(0.01)
+        time.sleep(0.02)
+        assert budget.out_of_time(None)
+
+        budget.start(60.0)
+        assert not budget.exhausted and not budget.out_of_time(None)
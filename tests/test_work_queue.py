@@ -0,0 +1,204 @@
+"""Tests for the shared work queue and its workers."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.config import Config
+from src.ollama_client import APIResponse
+from src.queue_worker import QueueWorker
+from src.work_queue import WorkQueue
+
+
+def _cases(count: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": range(1, count + 1),
+        "category": ["math"] * count,
+        "difficulty": [1] * count,
+        "question": [f"What is {i} + 0?" for i in range(1, count + 1)],
+        "expected_answer": [str(i) for i in range(1, count + 1)],
+        "answer_type": ["numeric"] * count,
+    })
+
+
+class AnsweringClient:
+    """Client answering the synthetic questions, failing the first ``failures`` calls."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0) -> None:
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def query(
+        self, prompt: str, *, options: dict | None = None, run: int = 1, **kwargs
+    ) -> APIResponse:
+        with self._lock:
+            self.calls += 1
+            failed = self.calls <= self.failures
+        time.sleep(self.delay)
+        if failed:
+            return APIResponse(
+                text="", latency_ms=1.0, success=False, error="HTTP 503", retry_after=0.0
+            )
+        answer = prompt.rsplit("What is ", 1)[1].split(" +")[0]
+        return APIResponse(text=answer, latency_ms=1.0, success=True)
+
+
+@pytest.fixture
+def queue(tmp_path) -> WorkQueue:
+    queue = WorkQueue(tmp_path / "queue.db", lease_s=60.0)
+    queue.enqueue(["m1"], ["baseline", "few_shot"], _cases(), runs=2)
+    return queue
+
+
+class TestWorkQueue:
+    """Tests for WorkQueue class."""
+
+    def test_enqueue_is_idempotent_and_interleaves_techniques(self, queue: WorkQueue) -> None:
+        """Test re-enqueueing adds nothing and techniques alternate in lease order."""
+        assert queue.enqueue(["m1"], ["baseline", "few_shot"], _cases(), runs=2) == 0
+        assert queue.counts("m1")["pending"] == 12
+
+        leases = queue.lease("w", "m1", limit=4)
+        assert [lease.technique for lease in leases] == ["baseline", "few_shot"] * 2
+        assert [(lease.case["id"], lease.run) for lease in leases[::2]] == [(1, 1), (1, 2)]
+
+    def test_leases_are_exclusive(self, queue: WorkQueue) -> None:
+        """Test two workers never hold the same item."""
+        first = queue.lease("a", "m1", limit=5)
+        second = queue.lease("b", "m1", limit=10)
+
+        assert len(first) == 5 and len(second) == 7
+        assert not {lease.item_id for lease in first} & {lease.item_id for lease in second}
+        assert queue.lease("c", "m1") == []
+        assert queue.lease("a", "other-model") == []
+
+    def test_expired_lease_is_taken_over_and_committed_once(self, tmp_path) -> None:
+        """Test a lapsed lease is re-leased and only the current holder can commit."""
+        queue = WorkQueue(tmp_path / "queue.db", lease_s=0.05)
+        queue.enqueue(["m1"], ["baseline"], _cases(1), runs=1)
+        stale = queue.lease("slow", "m1")[0]
+        time.sleep(0.1)
+        assert queue.counts("m1")["expired"] == 1
+
+        fresh = queue.lease("fast", "m1")[0]
+        assert fresh.item_id == stale.item_id and fresh.attempts == 2
+        assert queue.complete(fresh, {"id": 1, "run": 1, "correct": 1}, "fast")
+        assert not queue.complete(stale, {"id": 1, "run": 1, "correct": 0}, "slow")
+        assert not queue.complete(fresh, {"id": 1, "run": 1, "correct": 1}, "fast")
+
+        results = queue.results("m1", "baseline")
+        assert len(results) == 1 and results["correct"].tolist() == [1]
+        assert queue.remaining("m1") == 0
+
+    def test_item_that_keeps_losing_its_lease_is_failed(self, tmp_path) -> None:
+        """Test an item whose workers keep dying is failed once its leases are used up."""
+        queue = WorkQueue(tmp_path / "queue.db", lease_s=0.01, max_attempts=2)
+        queue.enqueue(["m1"], ["baseline"], _cases(2), runs=1)
+        for _ in range(2):
+            assert [lease.case["id"] for lease in queue.lease("doomed", "m1")] == [1]
+            time.sleep(0.02)
+
+        assert [lease.case["id"] for lease in queue.lease("w", "m1")] == [2]
+        assert queue.counts("m1")["failed"] == 1
+        row = queue.results("m1", "baseline").iloc[0]
+        assert row["id"] == 1 and not row["success"] and row["attempts"] == 2
+
+    def test_release_delays_the_item(self, queue: WorkQueue) -> None:
+        """Test a released item is not leased again before its delay."""
+        lease = queue.lease("w", "m1")[0]
+        assert queue.release(lease, delay=60.0)
+
+        ids = {other.item_id for other in queue.lease("w", "m1", limit=20)}
+        assert lease.item_id not in ids and len(ids) == 11
+
+    def test_max_attempts_from_its_own_setting(self, tmp_path) -> None:
+        """Test queue attempts come from queue_max_attempts, not the client's max_retries."""
+        config = Config(queue_path=str(tmp_path / "queue.db"), queue_max_attempts=2, max_retries=7)
+        assert WorkQueue.from_config(config).max_attempts == 2
+
+    def test_results_keep_file_order(self, tmp_path) -> None:
+        """Test rows come back in the order the cases were enqueued, not sorted by id."""
+        queue = WorkQueue(tmp_path / "queue.db")
+        queue.enqueue(["m1"], ["baseline"], _cases(3).iloc[::-1], runs=1)
+        QueueWorker(queue, Config(model_name="m1"), AnsweringClient(), poll_s=0.01).run()
+
+        assert queue.results("m1", "baseline")["id"].tolist() == [3, 2, 1]
+
+    def test_unknown_journal_mode_rejected(self, tmp_path) -> None:
+        """Test a typo in the journal mode fails loudly."""
+        with pytest.raises(ValueError):
+            WorkQueue(tmp_path / "queue.db", journal_mode="wall")
+
+
+class TestQueueWorker:
+    """Tests for QueueWorker class."""
+
+    def test_workers_share_the_queue_and_commit_each_item_once(
+        self, queue: WorkQueue, tmp_path
+    ) -> None:
+        """Test concurrent workers drain the queue with one committed row per item."""
+        config = Config(model_name="m1")
+        workers = [
+            QueueWorker(
+                WorkQueue(queue.path), config, AnsweringClient(delay=0.01), f"w{i}", threads=2,
+                poll_s=0.01,
+            )
+            for i in range(3)
+        ]
+        threads = [threading.Thread(target=worker.run) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(worker.committed for worker in workers) == 12
+        assert queue.remaining("m1") == 0
+        for technique in ("baseline", "few_shot"):
+            df = queue.results("m1", technique)
+            assert list(zip(df["id"], df["run"])) == [(i, r) for i in (1, 2, 3) for r in (1, 2)]
+            assert df["correct"].all()
+        paths = queue.export(tmp_path / "export")
+        assert [path.relative_to(tmp_path / "export").as_posix() for path in paths] == [
+            "m1/baseline_results.csv", "m1/few_shot_results.csv"
+        ]
+
+    def test_failed_calls_are_requeued_then_committed(self, tmp_path) -> None:
+        """Test a failing call is retried through the queue and its last failure recorded."""
+        queue = WorkQueue(tmp_path / "queue.db")
+        queue.enqueue(["m1"], ["baseline"], _cases(1), runs=1)
+        config = Config(
+            model_name="m1", queue_max_attempts=2, retry_delay=0.0, max_backoff=0.0
+        )
+        worker = QueueWorker(queue, config, AnsweringClient(failures=5), poll_s=0.01)
+        report = worker.run()
+
+        assert report["retried"] == 1 and report["committed"] == 1
+        row = queue.results("m1", "baseline").iloc[0]
+        assert not row["success"] and row["attempts"] == 2
+
+    def test_item_that_raises_is_failed_and_the_queue_drains(self, tmp_path) -> None:
+        """Test an item the worker cannot run is retried, then failed instead of looping."""
+        queue = WorkQueue(tmp_path / "queue.db")
+        queue.enqueue(["m1"], ["no_such_technique", "baseline"], _cases(1), runs=1)
+        config = Config(
+            model_name="m1", queue_max_attempts=2, retry_delay=0.0, max_backoff=0.0
+        )
+        report = QueueWorker(queue, config, AnsweringClient(), poll_s=0.01).run()
+
+        assert report["committed"] == 1 and report["retried"] == 1 and report["failed"] == 1
+        assert queue.remaining("m1") == 0
+        row = queue.results("m1", "no_such_technique").iloc[0]
+        assert not row["success"] and "Unknown technique" in row["error"]
+
+    def test_stop_leaves_items_for_other_workers(self, queue: WorkQueue) -> None:
+        """Test a stopped worker starts no new call."""
+        stop = threading.Event()
+        stop.set()
+        worker = QueueWorker(queue, Config(model_name="m1"), AnsweringClient())
+        report = worker.run(stop)
+
+        assert report["committed"] == 0 and queue.remaining("m1") == 12